@@ -1,19 +1,21 @@
 from app.agents.mcp_client import MCPClient
+from app.services.assistant_sync import AssistantSync
 from datetime import datetime, timedelta
 
 class AssistantAgent:
     def __init__(self):
         self.mcp_client = MCPClient()
+        # Local Gmail/Calendar cache, kept fresh by the background scheduler
+        self.sync = AssistantSync(self.mcp_client)
 
     def list_upcoming_events(self, days: int = 7):
         """
-        Asks Calendar MCP for upcoming events.
+        Returns upcoming events from the local Calendar cache.
         """
         try:
-            return self.mcp_client.call(
-                tool_name="list_upcoming_events",
-                arguments={"days": days}
-            )
+            if not self.sync.has_synced("calendar"):
+                self.sync.sync_events()
+            return self.sync.upcoming_events(days)
         except Exception as e:
             return f"Error checking calendar: {str(e)}"
 
@@ -22,7 +24,7 @@ class AssistantAgent:
         Uses Calendar MCP to auto-block time for interview prep.
         """
         try:
-            return self.mcp_client.call(
+            result = self.mcp_client.call(
                 tool_name="create_training_schedule",
                 arguments={
                     "job_title": job_title, 
@@ -30,17 +32,19 @@ class AssistantAgent:
                     "interview_date": interview_date
                 }
             )
+            # Pull the new sessions into the cache right away
+            self.sync.sync_events()
+            return result
         except Exception as e:
             return f"Error scheduling prep: {str(e)}"
 
-    def check_emails(self, query: str = "subject:interview"):
+    def check_emails(self, query: str = "subject:interview", limit: int = 50):
         """
-        Uses Gmail MCP to find interview invites.
+        Finds interview invites in the local Gmail cache.
         """
         try:
-            return self.mcp_client.call(
-                tool_name="list_messages",
-                arguments={"query": query, "max_results": 5}
-            )
+            if not self.sync.has_synced("gmail"):
+                self.sync.sync_emails()
+            return self.sync.search_emails(query, limit)
         except Exception as e:
-            return f"Error checking Gmail: {str(e)}"
\ No newline at end of file
+            return f"Error checking Gmail: {str(e)}"
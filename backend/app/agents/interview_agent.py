@@ -0,0 +1,50 @@
+from app.services.huggingface_client import HuggingFaceClient
+from app.services.chat_context import ChatContextManager
+from app.db.session import SessionLocal
+from app.db.models import ChatSession
+
+INTERVIEWER_PROMPT = """
+You are an experienced interviewer running a mock interview: {title}.
+Ask one question at a time, follow up on the candidate's answers, and give
+short, specific feedback when asked or when an answer is weak.
+"""
+
+class InterviewAgent:
+    def __init__(self):
+        self.hf_client = HuggingFaceClient()
+        self.context = ChatContextManager(self.hf_client)
+
+    def start_session(self, db, user_id: int, title: str):
+        session = ChatSession(user_id=user_id, title=title)
+        db.add(session)
+        db.commit()
+        db.refresh(session)
+        return session
+
+    def reply(self, db, session: ChatSession, content: str):
+        """
+        Stores the user's message and answers it. The prompt holds the
+        session summary plus recent turns, never the full history.
+        """
+        self.context.add_message(db, session, "user", content)
+        model = self.hf_client.gateway.route("chat")
+        messages = self.context.build(db, session, INTERVIEWER_PROMPT.format(title=session.title), model)
+
+        answer = self.hf_client.chat_completion(messages, model=model)
+        self.context.add_message(db, session, "assistant", answer)
+        return answer
+
+    def fold_history(self, session_id: int):
+        """
+        Summarizes older turns; runs after the response has been sent.
+        """
+        db = SessionLocal()
+        try:
+            session = db.query(ChatSession).filter(ChatSession.id == session_id).first()
+            if session:
+                self.context.fold(db, session)
+        except Exception as e:
+            db.rollback()
+            print(f"❌ Error summarizing chat session {session_id}: {e}")
+        finally:
+            db.close()
@@ -1,24 +1,48 @@
 from app.services.job_fetcher import JobFetcher
 from app.services.huggingface_client import HuggingFaceClient
-from app.services.weaviate_client import WeaviateClient
+from app.services.weaviate_client import get_weaviate_client
+from app.services.match_feed import MatchFeed
+from app.services.dedup import get_job_deduplicator
+from app.services.job_lifecycle import JobLifecycle
+from app.core.admission import get_admission_controller, BULK
 
 class JobAgent:
     def __init__(self):
         self.fetcher = JobFetcher()
         self.hf_client = HuggingFaceClient()
-        self.weaviate_client = WeaviateClient()
+        self.weaviate_client = get_weaviate_client()
+        self.match_feed = MatchFeed()
+        self.deduplicator = get_job_deduplicator()
+        self.lifecycle = JobLifecycle(self.weaviate_client, self.match_feed)
+        self.admission = get_admission_controller()
 
     def fetch_and_store_jobs(self, query: str, location: str = ""):
         """
         Fetches jobs from APIs or scraping, generates embeddings, and stores in Weaviate
         """
-        jobs = self.fetcher.fetch_jobs_from_api(query, location)
+        # Background work: only global limits apply, and it queues behind interactive requests
+        with self.admission.admit("browser", priority=BULK, blocking=True):
+            jobs = self.fetcher.fetch_jobs_from_api(query, location)
+        stored = []
         for job in jobs:
-            embedding = self.hf_client.get_embedding(job["description"])
-            self.weaviate_client.add_job(
-                job_title=job["title"],
-                company=job["company"],
-                description=job["description"],
-                embedding=embedding
-            )
+            # Same role from another board: keep the canonical copy, skip embedding
+            canonical_id, signature = self.deduplicator.find_duplicate(job["title"], job["company"], job["description"])
+            if canonical_id:
+                self.lifecycle.record_duplicates([canonical_id])
+                job["duplicate_of"] = canonical_id
+                continue
+
+            with self.admission.admit("embedding", priority=BULK, blocking=True):
+                embedding = self.hf_client.get_embedding(job["description"])
+                job_id = self.weaviate_client.add_job(
+                    job_title=job["title"],
+                    company=job["company"],
+                    description=job["description"],
+                    embedding=embedding
+                )
+            self.deduplicator.register(job_id, signature)
+            stored.append({"id": job_id, "title": job["title"], "company": job["company"], "embedding": embedding})
+
+        # Push the new jobs into every matching user's feed in one batch
+        self.match_feed.ingest_jobs(stored)
         return jobs
@@ -1,8 +1,10 @@
 from app.services.matcher import Matcher
+from app.services.resume_store import ResumeStore
 
 class MatcherAgent:
     def __init__(self):
         self.matcher = Matcher()
+        self.resume_store = ResumeStore(self.matcher.weaviate_client)
 
     def get_best_matches(self, resume_text: str, top_k: int = 10):
         """
@@ -10,3 +12,13 @@ class MatcherAgent:
         """
         matched_jobs = self.matcher.match_jobs_to_resume(resume_text, top_k)
         return matched_jobs
+
+    def get_best_matches_for_profile(self, profile, top_k: int = 10):
+        """
+        Same as get_best_matches, but reuses the stored resume vector
+        so no embedding is computed.
+        """
+        embedding = self.resume_store.get_embedding(profile)
+        if not embedding:
+            return self.get_best_matches(profile.raw_text, top_k)
+        return self.matcher.match_jobs_to_embedding(embedding, top_k)
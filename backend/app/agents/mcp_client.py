@@ -1,5 +1,17 @@
 import os
 from mcp import Client
+from app.core.config import settings
+from app.services.page_cache import get_page_cache, normalize_query, normalize_url
+
+# Browser tools whose results are cached: argument to key on, how to normalize it, TTL
+CACHED_TOOLS = {
+    "find_job_openings": ("keyword", normalize_query, settings.SCRAPE_CACHE_SEARCH_TTL_SECONDS),
+    "open_url": ("url", normalize_url, settings.SCRAPE_CACHE_PAGE_TTL_SECONDS),
+}
+
+
+class ScrapeError(RuntimeError):
+    pass
 
 class MCPClient:
     def __init__(self):
@@ -34,10 +46,47 @@ class MCPClient:
         url = self.tool_map.get(tool_name)
         if not url:
             raise ValueError(f"No MCP server configured for tool: {tool_name}")
-            
+
+        if settings.SCRAPE_CACHE_ENABLED and tool_name in CACHED_TOOLS:
+            return self._cached_call(tool_name, arguments)
+        return self._call_server(url, tool_name, arguments)
+
+    def _call_server(self, url: str, tool_name: str, arguments: dict):
         print(f"📡 Connecting to MCP at {url} for tool {tool_name}...")
         
         # Create a temporary client for this specific call
         # (In production, you might want to keep persistent connections)
         with Client(url) as client:
-            return client.call(tool_name, arguments=arguments)
\ No newline at end of file
+            return client.call(tool_name, arguments=arguments)
+
+    def _cached_call(self, tool_name: str, arguments: dict):
+        """
+        Serves browser results from the page cache, so repeat searches and
+        page visits don't launch a new headless browser. Error responses
+        are passed through but never cached.
+        """
+        field, normalize, ttl = CACHED_TOOLS[tool_name]
+
+        def fetch():
+            response = self._call_server(self.tool_map[tool_name], tool_name, arguments)
+            is_error = response.get("isError") if isinstance(response, dict) else getattr(response, "isError", False)
+            if is_error:
+                raise ScrapeError(self.extract_text(response))
+            return self.extract_text(response)
+
+        try:
+            text = get_page_cache().get_or_fetch(tool_name, normalize(arguments.get(field, "")), fetch, ttl)
+        except ScrapeError as e:
+            return {"content": [{"type": "text", "text": str(e)}], "isError": True}
+        return {"content": [{"type": "text", "text": text}]}
+
+    @staticmethod
+    def extract_text(response):
+        """
+        Pulls the text payload out of an MCP tool response.
+        """
+        if hasattr(response, 'content') and response.content:
+            return response.content[0].text
+        if isinstance(response, dict) and 'content' in response:
+            return response['content'][0]['text']
+        return str(response)
@@ -1,8 +1,11 @@
 from app.services.resume_parser import ResumeParser
+from app.services.resume_store import ResumeStore
+from app.services.weaviate_client import get_weaviate_client
 
 class ResumeAgent:
-    def __init__(self):
+    def __init__(self, store: ResumeStore = None):
         self.parser = ResumeParser()
+        self.store = store or ResumeStore(get_weaviate_client())
 
     def process_resume(self, resume_text: str):
         """
@@ -11,3 +14,13 @@ class ResumeAgent:
         """
         parsed_data = self.parser.parse_resume(resume_text)
         return parsed_data
+
+    def process_and_store_resume(self, db, user_id: int, filename: str, resume_text: str):
+        """
+        Parses and embeds the resume once, then saves it as a profile
+        so later matches can refer to it by id.
+        """
+        parsed_data = self.parser.parse_resume(resume_text)
+        embedding = self.parser.hf_client.get_embedding(resume_text)
+        profile = self.store.save(db, user_id, filename, resume_text, parsed_data, embedding)
+        return profile, parsed_data
@@ -1,18 +1,19 @@
 from fastapi import APIRouter, Body
+from fastapi.concurrency import run_in_threadpool
 from app.agents.assistant_agent import AssistantAgent
 
 router = APIRouter()
 agent = AssistantAgent()
 
+# Cache reads and cold-cache syncs block, so these run in the threadpool as plain defs
 @router.get("/calendar/events")
-async def get_events(days: int = 7):
+def get_events(days: int = 7):
+    # Served from the local cache, which the background scheduler keeps current
     response = agent.list_upcoming_events(days)
-    # MCP returns objects, we might need to parse them depending on your MCPClient implementation
-    # For now, returning the raw response is fine for debugging
     return {"events": response}
 
 @router.post("/calendar/schedule-prep")
-async def schedule_prep(
+def schedule_prep(
     job_title: str = Body(...),
     company: str = Body(...),
     date: str = Body(..., description="ISO format: 2023-12-25T14:00:00")
@@ -21,6 +22,14 @@ async def schedule_prep(
     return {"result": result}
 
 @router.get("/gmail/check")
-async def check_gmail(query: str = "subject:interview"):
-    emails = agent.check_emails(query)
-    return {"emails": emails}
\ No newline at end of file
+def check_gmail(query: str = "subject:interview", limit: int = 50):
+    emails = agent.check_emails(query, limit)
+    return {"emails": emails}
+
+@router.post("/sync")
+async def sync_now():
+    """
+    Forces an immediate Gmail + Calendar refresh of the local cache.
+    """
+    await run_in_threadpool(agent.sync.sync_all)
+    return {"message": "Sync complete"}
\ No newline at end of file
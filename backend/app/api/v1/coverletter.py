@@ -1,10 +1,31 @@
-from fastapi import APIRouter, Body
+from typing import Optional
+from fastapi import APIRouter, Body, Depends, HTTPException
+from sqlalchemy.orm import Session
 from app.agents.coverletter_agent import CoverLetterAgent
+from app.core.admission import get_admission_controller, get_client_key
+from app.core.utils import get_current_user_optional, get_resume_profile
+from app.db.session import get_db
+from app.db.models import User
 
 router = APIRouter()
 cover_agent = CoverLetterAgent()
+admission = get_admission_controller()
 
 @router.post("/generate")
-async def generate_cover_letter(resume_text: str = Body(...), job_description: str = Body(...)):
-    letter = cover_agent.create_cover_letter(resume_text, job_description)
+def generate_cover_letter(
+    job_description: str = Body(...),
+    resume_text: Optional[str] = Body(None),
+    resume_id: Optional[int] = Body(None, description="Stored resume to write the letter from"),
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user_optional),
+    client_key: str = Depends(get_client_key)
+):
+    if resume_id is not None:
+        resume_text = get_resume_profile(resume_id, user, db).raw_text
+    if not resume_text:
+        raise HTTPException(status_code=400, detail="Must provide 'resume_text' or 'resume_id'")
+
+    # Sync route (runs in the threadpool) so waiting for an LLM slot never blocks the event loop
+    with admission.admit("llm", client_key):
+        letter = cover_agent.create_cover_letter(resume_text, job_description)
     return {"cover_letter": letter}
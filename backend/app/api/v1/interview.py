@@ -0,0 +1,63 @@
+from typing import List
+from fastapi import APIRouter, BackgroundTasks, Body, Depends, HTTPException
+from sqlalchemy.orm import Session
+from app.agents.interview_agent import InterviewAgent
+from app.core.admission import get_admission_controller, get_client_key
+from app.core.utils import get_current_user
+from app.db.session import get_db
+from app.db.models import User, ChatSession
+from app.db.schemas import ChatSessionCreate, ChatSessionResponse
+
+router = APIRouter()
+interview_agent = InterviewAgent()
+admission = get_admission_controller()
+
+def _get_session(session_id: int, user: User, db: Session) -> ChatSession:
+    session = (
+        db.query(ChatSession)
+        .filter(ChatSession.id == session_id, ChatSession.user_id == user.id)
+        .first()
+    )
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"Chat session {session_id} not found")
+    return session
+
+@router.post("/sessions", response_model=ChatSessionResponse)
+def create_session(
+    payload: ChatSessionCreate,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user)
+):
+    """
+    Starts a mock interview. The title describes the role being practised,
+    e.g. "Backend Engineer at Acme".
+    """
+    return interview_agent.start_session(db, user.id, payload.title)
+
+@router.get("/sessions", response_model=List[ChatSessionResponse])
+def list_sessions(db: Session = Depends(get_db), user: User = Depends(get_current_user)):
+    return db.query(ChatSession).filter(ChatSession.user_id == user.id).order_by(ChatSession.id.desc()).all()
+
+@router.get("/sessions/{session_id}", response_model=ChatSessionResponse)
+def get_session(session_id: int, db: Session = Depends(get_db), user: User = Depends(get_current_user)):
+    return _get_session(session_id, user, db)
+
+@router.post("/sessions/{session_id}/messages")
+def send_message(
+    session_id: int,
+    background_tasks: BackgroundTasks,
+    content: str = Body(..., embed=True),
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+    client_key: str = Depends(get_client_key)
+):
+    """
+    Sends the candidate's answer and returns the interviewer's reply.
+    Older turns are summarized after the response, so each turn costs
+    about the same however long the session runs.
+    """
+    session = _get_session(session_id, user, db)
+    with admission.admit("llm", client_key):
+        answer = interview_agent.reply(db, session, content)
+    background_tasks.add_task(interview_agent.fold_history, session.id)
+    return {"session_id": session.id, "reply": answer}
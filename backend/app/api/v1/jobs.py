@@ -1,12 +1,24 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
 from pydantic import BaseModel
 from typing import List, Optional
-from app.services.weaviate_client import WeaviateClient
+from sqlalchemy.orm import Session
+from app.services.weaviate_client import get_weaviate_client
 from app.services.huggingface_client import HuggingFaceClient
+from app.services.match_feed import MatchFeed
+from app.services.dedup import get_job_deduplicator
+from app.services.job_lifecycle import JobLifecycle
+from app.core.utils import get_admin_user, get_current_user_optional, get_resume_profile
+from app.core.admission import get_admission_controller, get_client_key
+from app.db.session import get_db
+from app.db.models import User
 
 router = APIRouter()
-weaviate_client = WeaviateClient()
+weaviate_client = get_weaviate_client()
 hf_client = HuggingFaceClient()
+match_feed = MatchFeed()
+deduplicator = get_job_deduplicator()
+admission = get_admission_controller()
+lifecycle = JobLifecycle(weaviate_client, match_feed)
 
 # Request models
 class JobInput(BaseModel):
@@ -19,41 +31,66 @@ class JobInput(BaseModel):
 class SearchInput(BaseModel):
     embedding: Optional[List[float]] = None
     query_text: Optional[str] = None # Allow text search
+    resume_id: Optional[int] = None # Search with a stored resume's vector
     top_k: int = 10
+    collapse_duplicates: bool = False # Drop near-identical postings from results
 
 # Routes
 @router.post("/add-job")
-def add_job(job: JobInput):
+def add_job(job: JobInput, background_tasks: BackgroundTasks, client_key: str = Depends(get_client_key)):
     """
     Adds a job to Weaviate. 
     If embedding is missing, generates it using HuggingFace model.
+    Matching users' feeds are updated after the response is sent.
     """
     try:
-        # 🧠 INTELLIGENCE: Auto-generate vector if missing
-        if not job.embedding:
-            print(f"⚡ Generating embedding for job: {job.title}")
-            job.embedding = hf_client.get_embedding(job.description)
-            
-        weaviate_client.add_job(
-            job_title=job.title, 
-            company=job.company, 
-            description=job.description, 
-            embedding=job.embedding
+        # 🧬 Near-duplicate of a stored posting: collapse into the canonical one
+        canonical_id, signature = deduplicator.find_duplicate(job.title, job.company, job.description)
+        if canonical_id:
+            lifecycle.record_duplicates([canonical_id])
+            return {"status": "duplicate", "job_id": canonical_id, "message": f"Job '{job.title}' matches an existing posting."}
+
+        with admission.admit("embedding", client_key):
+            # 🧠 INTELLIGENCE: Auto-generate vector if missing
+            if not job.embedding:
+                print(f"⚡ Generating embedding for job: {job.title}")
+                job.embedding = hf_client.get_embedding(job.description)
+
+            job_id = weaviate_client.add_job(
+                job_title=job.title,
+                company=job.company,
+                description=job.description,
+                embedding=job.embedding
+            )
+        deduplicator.register(job_id, signature)
+        background_tasks.add_task(
+            match_feed.ingest_jobs,
+            [{"id": job_id, "title": job.title, "company": job.company, "embedding": job.embedding}]
         )
-        return {"status": "success", "message": f"Job '{job.title}' added and vectorized."}
+        return {"status": "success", "job_id": job_id, "message": f"Job '{job.title}' added and vectorized."}
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"❌ Error adding job: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/search-jobs")
-def search_jobs(search: SearchInput):
+def search_jobs(
+    search: SearchInput,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user_optional)
+):
     """
     Searches for similar jobs.
-    Allows searching by raw text (we convert to vector) OR direct vector.
+    Allows searching by raw text (we convert to vector), direct vector,
+    or a stored resume (its saved vector is reused).
     """
     try:
-        # 🧠 INTELLIGENCE: Convert text query to vector
         vector = search.embedding
+        if not vector and search.resume_id is not None:
+            vector = get_resume_profile(search.resume_id, user, db).embedding
+
+        # 🧠 INTELLIGENCE: Convert text query to vector
         if not vector and search.query_text:
             print(f"🔍 Vectorizing query: '{search.query_text}'")
             vector = hf_client.get_embedding(search.query_text)
@@ -61,8 +98,39 @@ def search_jobs(search: SearchInput):
         if not vector:
             raise HTTPException(status_code=400, detail="Must provide 'embedding' or 'query_text'")
             
-        results = weaviate_client.query_similar_jobs(vector, search.top_k)
+        results = weaviate_client.query_similar_jobs(vector, search.top_k, search.collapse_duplicates)
         return {"results": results}
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"❌ Error searching jobs: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/corpus-stats")
+def corpus_stats():
+    """
+    Size and age of the job corpus: posting count, oldest/newest postings,
+    how many are past their TTL, estimated index memory and the last sweep.
+    """
+    try:
+        return lifecycle.stats()
+    except Exception as e:
+        print(f"❌ Error reading corpus stats: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/maintenance/sweep")
+def sweep_expired_jobs(background_tasks: BackgroundTasks, user: User = Depends(get_admin_user)):
+    """
+    Deletes expired postings now instead of waiting for the scheduled sweep.
+    """
+    background_tasks.add_task(lifecycle.sweep)
+    return {"status": "scheduled", "ttl_days": lifecycle.ttl_days}
+
+@router.post("/maintenance/compact")
+def compact_job_index(background_tasks: BackgroundTasks, user: User = Depends(get_admin_user)):
+    """
+    Rebuilds the Job vector index to reclaim space left by deleted postings.
+    Searches keep using the old index until the new one is switched in.
+    """
+    background_tasks.add_task(lifecycle.compact)
+    return {"status": "scheduled", "deleted_since_compaction": lifecycle.deleted_since_compaction}
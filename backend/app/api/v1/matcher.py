@@ -1,10 +1,44 @@
-from fastapi import APIRouter, Body
+from typing import Optional
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
 from app.agents.matcher_agent import MatcherAgent
+from app.services.match_feed import MatchFeed
+from app.core.utils import get_current_user, get_current_user_optional, get_resume_profile
+from app.db.session import get_db
+from app.db.models import User
+from app.db.schemas import MatchFeedResponse
 
 router = APIRouter()
 matcher_agent = MatcherAgent()
+match_feed = MatchFeed()
 
 @router.post("/match")
-async def match_jobs(resume_text: str = Body(...), top_k: int = 10):
-    matches = matcher_agent.get_best_matches(resume_text, top_k)
+async def match_jobs(
+    resume_text: Optional[str] = Body(None),
+    resume_id: Optional[int] = Body(None, description="Stored resume to match without re-embedding"),
+    top_k: int = 10,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user_optional)
+):
+    if resume_id is not None:
+        profile = get_resume_profile(resume_id, user, db)
+        matches = matcher_agent.get_best_matches_for_profile(profile, top_k)
+    elif resume_text:
+        matches = matcher_agent.get_best_matches(resume_text, top_k)
+    else:
+        raise HTTPException(status_code=400, detail="Must provide 'resume_text' or 'resume_id'")
     return {"top_matches": matches}
+
+@router.get("/feed", response_model=MatchFeedResponse)
+def get_match_feed(
+    cursor: Optional[int] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user)
+):
+    """
+    Precomputed matches for the user's stored resumes, newest first.
+    Filled in as jobs are ingested, so no vector search runs here.
+    """
+    items, next_cursor = match_feed.get_feed(db, user.id, cursor, limit)
+    return {"matches": items, "next_cursor": next_cursor}
@@ -0,0 +1,29 @@
+from fastapi import APIRouter
+from app.services.llm_gateway import get_llm_gateway
+from app.services.page_cache import get_page_cache
+from app.core.admission import get_admission_controller
+
+router = APIRouter()
+
+@router.get("/llm")
+def llm_metrics():
+    """
+    Per-model call counts, retries, hedges, token usage, latency
+    percentiles and circuit state from the LLM gateway.
+    """
+    return get_llm_gateway().metrics()
+
+@router.get("/page-cache")
+def page_cache_metrics():
+    """
+    Hit, stale-hit and miss counts plus on-disk size of the browser page cache.
+    """
+    return get_page_cache().metrics()
+
+@router.get("/admission")
+def admission_metrics():
+    """
+    Queue depth (by priority), slot usage, wait/service times and rejection
+    counts for each resource class under admission control.
+    """
+    return get_admission_controller().metrics()
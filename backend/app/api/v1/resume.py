@@ -1,12 +1,119 @@
-from fastapi import APIRouter, UploadFile, File
+from typing import List
+from fastapi import APIRouter, BackgroundTasks, UploadFile, File, HTTPException, Depends
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
 from app.agents.resume_agent import ResumeAgent
+from app.services.document_ingest import DocumentIngestor
+from app.services.match_feed import MatchFeed
+from app.core.admission import get_admission_controller, get_client_key, AdmissionRejected, INTERACTIVE, BULK
+from app.core.utils import get_current_user, get_current_user_optional, get_resume_profile
+from app.db.session import get_db
+from app.db.models import User
+from app.db.schemas import ResumeProfileResponse
 
 router = APIRouter()
 resume_agent = ResumeAgent()
+ingestor = DocumentIngestor()
+match_feed = MatchFeed()
+admission = get_admission_controller()
+
+def _process(document: dict, user, db: Session, client_key: str, priority: int = INTERACTIVE, cost: float = 1.0):
+    """
+    Parses an ingested document; signed-in users also get it stored as a
+    profile so it can be matched later by resume_id.
+    """
+    with admission.admit("llm", client_key, priority=priority, cost=cost):
+        if user is None:
+            return None, resume_agent.process_resume(document["text"])
+        profile, parsed = resume_agent.process_and_store_resume(
+            db, user.id, document["filename"], document["text"]
+        )
+        return profile.id, parsed
+
+def _backfill_feed(background_tasks: BackgroundTasks, resume_id: int):
+    # Existing jobs only reach the feed through ingestion, so score them once now
+    if resume_id is not None:
+        background_tasks.add_task(match_feed.backfill_resume, resume_id, resume_agent.store.weaviate_client)
 
 @router.post("/upload")
-async def upload_resume(file: UploadFile = File(...)):
-    content = await file.read()
-    text = content.decode("utf-8", errors="ignore")
-    parsed_resume = resume_agent.process_resume(text)
-    return {"message": "Resume processed", "data": parsed_resume}
+async def upload_resume(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user_optional),
+    client_key: str = Depends(get_client_key)
+):
+    document = await ingestor.ingest(file)
+    if "error" in document:
+        status_code = 413 if document["error_type"] == "DocumentTooLargeError" else 400
+        raise HTTPException(status_code=status_code, detail=document["error"])
+
+    # LLM parsing is blocking, keep it off the event loop
+    resume_id, parsed_resume = await run_in_threadpool(_process, document, user, db, client_key)
+    _backfill_feed(background_tasks, resume_id)
+    return {"message": "Resume processed", "resume_id": resume_id, "data": parsed_resume}
+
+@router.post("/upload-batch")
+async def upload_resumes(
+    background_tasks: BackgroundTasks,
+    files: List[UploadFile] = File(...),
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user_optional),
+    client_key: str = Depends(get_client_key)
+):
+    """
+    Accepts many resumes in one request (PDF, DOCX or plain text).
+    Failures are reported per file so one bad upload doesn't sink the batch.
+    Batch files queue behind interactive uploads for LLM capacity.
+    """
+    try:
+        documents = await ingestor.ingest_many(files)
+    except ValueError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+    # Only files that extracted will reach the LLM. Up to one burst of them is
+    # charged up front; the rest are charged one by one and reported as rate
+    # limited once the budget runs out. Prepaid tokens left unused are refunded.
+    extracted = sum(1 for document in documents if "error" not in document)
+    prepaid = min(extracted, int(admission.max_cost("llm", client_key)))
+    admission.charge("llm", client_key, cost=prepaid)
+    spent = 0
+
+    results = []
+    try:
+        for document in documents:
+            entry = {"filename": document["filename"], "format": document["format"]}
+            if "error" in document:
+                entry["error"] = document["error"]
+                results.append(entry)
+                continue
+            covered = spent < prepaid
+            try:
+                entry["resume_id"], entry["data"] = await run_in_threadpool(
+                    _process, document, user, db, client_key, BULK, 0 if covered else 1
+                )
+                _backfill_feed(background_tasks, entry["resume_id"])
+                spent += covered
+            except AdmissionRejected as e:
+                entry["error"] = e.detail
+                entry["retry_after"] = e.retry_after
+            results.append(entry)
+    finally:
+        admission._refund_tokens("llm", client_key, prepaid - spent)
+
+    processed = sum(1 for r in results if "data" in r)
+    return {"message": f"Processed {processed}/{len(results)} resumes", "results": results}
+
+@router.get("/profiles", response_model=List[ResumeProfileResponse])
+def list_profiles(db: Session = Depends(get_db), user: User = Depends(get_current_user)):
+    return resume_agent.store.list(db, user.id)
+
+@router.get("/profiles/{resume_id}", response_model=ResumeProfileResponse)
+def get_profile(resume_id: int, db: Session = Depends(get_db), user: User = Depends(get_current_user)):
+    return get_resume_profile(resume_id, user, db)
+
+@router.delete("/profiles/{resume_id}")
+def delete_profile(resume_id: int, db: Session = Depends(get_db), user: User = Depends(get_current_user)):
+    profile = get_resume_profile(resume_id, user, db)
+    resume_agent.store.delete(db, profile)
+    return {"message": f"Resume {resume_id} deleted"}
@@ -0,0 +1,346 @@
+import math
+import time
+import heapq
+import itertools
+import threading
+from contextlib import contextmanager
+from fastapi import Depends, HTTPException, Request, status
+from app.core.config import settings
+from app.core.utils import get_current_user_optional
+
+# Lower runs first: a user waiting on a response beats batch and agent work
+INTERACTIVE = 0
+BULK = 10
+
+
+class AdmissionRejected(HTTPException):
+    def __init__(self, resource: str, reason: str, retry_after: float):
+        retry_after = max(1, math.ceil(retry_after))
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"Too many {resource} requests ({reason}), retry in {retry_after}s",
+            headers={"Retry-After": str(retry_after)},
+        )
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    Refills at `rate` tokens per second up to `burst`. Not thread safe on
+    its own; the controller serializes access.
+    """
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self, cost: float = 1.0):
+        """
+        Takes `cost` tokens and returns 0, or returns the seconds until
+        enough tokens will be available. A cost above burst never fits;
+        callers reject it before asking.
+        """
+        self._refill()
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return 0.0
+        return (cost - self.tokens) / self.rate if self.rate > 0 else float("inf")
+
+    def refund(self, cost: float = 1.0):
+        self.tokens = min(self.burst, self.tokens + cost)
+
+    def is_full(self):
+        self._refill()
+        return self.tokens >= self.burst
+
+
+class WaitLimit:
+    """
+    Caps waiters across every queue. Waiting blocks a threadpool worker, so
+    an unbounded total could starve requests that need no admission at all.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.waiting = 0
+        self._lock = threading.Lock()
+
+    def try_enter(self):
+        with self._lock:
+            if self.waiting >= self.limit:
+                return False
+            self.waiting += 1
+            return True
+
+    def leave(self):
+        with self._lock:
+            self.waiting -= 1
+
+
+class _Waiter:
+    __slots__ = ("priority", "event", "granted", "shed")
+
+    def __init__(self, priority: int):
+        self.priority = priority
+        self.event = threading.Event()
+        self.granted = False
+        self.shed = False
+
+
+class ResourceQueue:
+    """
+    Concurrency slots for one resource class with a bounded priority queue
+    in front. When the queue is full an incoming request displaces the
+    lowest-priority waiter if it outranks it, otherwise it is rejected.
+    The queue also counts as full once `wait_limit` (shared between queues)
+    is reached.
+    """
+
+    def __init__(self, name: str, slots: int, max_queue: int, max_wait: float, wait_limit: WaitLimit = None):
+        self.name = name
+        self.slots = slots
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.wait_limit = wait_limit or WaitLimit(max_queue)
+        self.in_use = 0
+        self._waiters = []  # heap of (priority, seq, waiter)
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+        self.admitted = 0
+        self.waited = 0
+        self.rejected = {"rate_limited": 0, "queue_full": 0, "timeout": 0, "shed": 0}
+        self.avg_wait_s = 0.0
+        self.avg_service_s = 1.0
+
+    def retry_after(self):
+        # Time for everyone ahead to be served, assuming recent service times
+        return (len(self._waiters) + 1) * self.avg_service_s / max(1, self.slots)
+
+    def acquire(self, priority: int = INTERACTIVE):
+        start = time.monotonic()
+        with self._lock:
+            if self.in_use < self.slots and not self._waiters:
+                self.in_use += 1
+                self.admitted += 1
+                return start
+
+            if len(self._waiters) >= self.max_queue or not self.wait_limit.try_enter():
+                # A displaced waiter hands its place under the wait limit to us
+                worst = max(self._waiters, key=lambda entry: (entry[0], entry[1]), default=None)
+                if worst is None or worst[0] <= priority:
+                    self.rejected["queue_full"] += 1
+                    raise AdmissionRejected(self.name, "queue full", self.retry_after())
+                self._waiters.remove(worst)
+                heapq.heapify(self._waiters)
+                worst[2].shed = True
+                worst[2].event.set()
+
+            waiter = _Waiter(priority)
+            heapq.heappush(self._waiters, (priority, next(self._seq), waiter))
+            self.waited += 1
+
+        waiter.event.wait(self.max_wait)
+
+        with self._lock:
+            if waiter.granted:
+                waited = time.monotonic() - start
+                self.avg_wait_s = 0.9 * self.avg_wait_s + 0.1 * waited
+                self.admitted += 1
+                return time.monotonic()
+            if not waiter.shed:
+                self._waiters = [entry for entry in self._waiters if entry[2] is not waiter]
+                heapq.heapify(self._waiters)
+                self.wait_limit.leave()
+            reason = "shed" if waiter.shed else "timeout"
+            self.rejected[reason] += 1
+            raise AdmissionRejected(self.name, "displaced by interactive work" if waiter.shed else "queue wait timed out", self.retry_after())
+
+    def release(self, acquired_at: float):
+        with self._lock:
+            self.avg_service_s = 0.9 * self.avg_service_s + 0.1 * (time.monotonic() - acquired_at)
+            if self._waiters:
+                # Hand the slot straight to the next waiter; in_use is unchanged
+                _, _, waiter = heapq.heappop(self._waiters)
+                self.wait_limit.leave()
+                waiter.granted = True
+                waiter.event.set()
+            else:
+                self.in_use -= 1
+
+    def snapshot(self):
+        with self._lock:
+            by_priority = {}
+            for priority, _, _ in self._waiters:
+                label = "interactive" if priority <= INTERACTIVE else "bulk"
+                by_priority[label] = by_priority.get(label, 0) + 1
+            return {
+                "slots": self.slots,
+                "in_use": self.in_use,
+                "queued": len(self._waiters),
+                "queued_by_priority": by_priority,
+                "max_queue": self.max_queue,
+                "admitted": self.admitted,
+                "waited": self.waited,
+                "rejected": dict(self.rejected),
+                "avg_wait_ms": round(self.avg_wait_s * 1000, 1),
+                "avg_service_ms": round(self.avg_service_s * 1000, 1),
+            }
+
+
+class AdmissionController:
+    """
+    Gatekeeper for expensive work (LLM calls, browser scrapes, embeddings).
+    A request must pass its user's token bucket and the global bucket for
+    the resource class, then wait for a slot in that class's priority queue.
+    """
+
+    def __init__(self):
+        self.enabled = settings.ADMISSION_ENABLED
+        self.wait_limit = WaitLimit(settings.ADMISSION_MAX_WAITING)
+        self.queues = {
+            name: ResourceQueue(
+                name, slots, settings.ADMISSION_QUEUE_SIZE, settings.ADMISSION_MAX_WAIT_SECONDS, self.wait_limit
+            )
+            for name, slots in (
+                ("llm", settings.ADMISSION_LLM_CONCURRENCY),
+                ("browser", settings.ADMISSION_BROWSER_CONCURRENCY),
+                ("embedding", settings.ADMISSION_EMBEDDING_CONCURRENCY),
+            )
+        }
+        self._global = {
+            name: TokenBucket(settings.ADMISSION_GLOBAL_RATE_PER_MINUTE / 60, settings.ADMISSION_GLOBAL_BURST)
+            for name in self.queues
+        }
+        self._users = {}
+        self._lock = threading.Lock()
+
+    def _user_bucket(self, user_key: str, resource: str):
+        if len(self._users) > 10000:
+            # Buckets that have refilled carry no state worth keeping
+            self._users = {k: b for k, b in self._users.items() if not b.is_full()}
+        key = (user_key, resource)
+        if key not in self._users:
+            self._users[key] = TokenBucket(settings.ADMISSION_USER_RATE_PER_MINUTE / 60, settings.ADMISSION_USER_BURST)
+        return self._users[key]
+
+    def max_cost(self, resource: str, user_key: str = None):
+        """
+        Largest cost a single charge can have; bigger batches are charged in chunks.
+        """
+        with self._lock:
+            burst = self._global[resource].burst
+            if user_key:
+                burst = min(burst, self._user_bucket(user_key, resource).burst)
+            return burst
+
+    def charge(self, resource: str, user_key: str = None, cost: float = 1.0):
+        """
+        Rate check on its own, e.g. to charge a batch up front before
+        admitting its items with cost=0. Raises AdmissionRejected, also when
+        cost is more than the buckets can ever hold (see max_cost).
+        """
+        if not self.enabled or cost <= 0:
+            return
+        queue = self.queues[resource]
+        with self._lock:
+            user_bucket = self._user_bucket(user_key, resource) if user_key else None
+            for bucket in filter(None, (user_bucket, self._global[resource])):
+                if cost > bucket.burst:
+                    queue.rejected["rate_limited"] += 1
+                    # Waiting never makes this fit; suggest a full refill before a smaller retry
+                    full_refill = bucket.burst / bucket.rate if bucket.rate > 0 else 60
+                    raise AdmissionRejected(resource, f"cost {cost:g} is over the limit of {bucket.burst:g}", full_refill)
+            wait = user_bucket.take(cost) if user_bucket else 0.0
+            if wait:
+                queue.rejected["rate_limited"] += 1
+                raise AdmissionRejected(resource, "per-user rate limit", wait)
+            wait = self._global[resource].take(cost)
+            if wait:
+                if user_bucket:
+                    user_bucket.refund(cost)
+                queue.rejected["rate_limited"] += 1
+                raise AdmissionRejected(resource, "global rate limit", wait)
+
+    def _refund_tokens(self, resource: str, user_key: str, cost: float):
+        if cost <= 0:
+            return
+        with self._lock:
+            if user_key:
+                self._user_bucket(user_key, resource).refund(cost)
+            self._global[resource].refund(cost)
+
+    @contextmanager
+    def admit(self, resource: str, user_key: str = None, priority: int = INTERACTIVE, cost: float = 1.0, blocking: bool = False):
+        """
+        Holds a slot of `resource` for the duration of the block.
+        Raises AdmissionRejected (a 429 with Retry-After) when the caller is
+        over its rate or the queue is full. blocking=True is for background
+        work: it sleeps through rejections instead of raising.
+        """
+        if not self.enabled:
+            yield
+            return
+
+        queue = self.queues[resource]
+        while True:
+            try:
+                self.charge(resource, user_key, cost)
+                try:
+                    acquired_at = queue.acquire(priority)
+                except AdmissionRejected:
+                    # Nothing ran, so the request shouldn't count against the rate
+                    self._refund_tokens(resource, user_key, cost)
+                    raise
+                break
+            except AdmissionRejected as e:
+                if not blocking:
+                    raise
+                time.sleep(e.retry_after)
+
+        try:
+            yield
+        finally:
+            queue.release(acquired_at)
+
+    def metrics(self):
+        with self._lock:
+            tracked_users = len({user_key for user_key, _ in self._users})
+        return {
+            "enabled": self.enabled,
+            "tracked_clients": tracked_users,
+            "waiting": self.wait_limit.waiting,
+            "max_waiting": self.wait_limit.limit,
+            "resources": {name: queue.snapshot() for name, queue in self.queues.items()},
+        }
+
+
+_controller = None
+_controller_lock = threading.Lock()
+
+def get_admission_controller():
+    """
+    Process-wide controller, so limits hold across every router and agent.
+    """
+    global _controller
+    with _controller_lock:
+        if _controller is None:
+            _controller = AdmissionController()
+        return _controller
+
+def get_client_key(request: Request, user=Depends(get_current_user_optional)):
+    """
+    Identity that per-user limits are tracked under: the signed-in user, or
+    the client address for anonymous requests.
+    """
+    if user is not None:
+        return f"user:{user.id}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
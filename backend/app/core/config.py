@@ -13,12 +13,81 @@ class Settings:
 
     # 🧠 AI & Vectors
     WEAVIATE_URL: str = os.getenv("WEAVIATE_URL", "http://localhost:8080")
+    # Vector index tuning: "hnsw" or "flat" (flat suits small tenants)
+    WEAVIATE_INDEX_TYPE: str = os.getenv("WEAVIATE_INDEX_TYPE", "hnsw")
+    WEAVIATE_HNSW_EF: int = int(os.getenv("WEAVIATE_HNSW_EF", -1))
+    WEAVIATE_HNSW_EF_CONSTRUCTION: int = int(os.getenv("WEAVIATE_HNSW_EF_CONSTRUCTION", 128))
+    WEAVIATE_HNSW_MAX_CONNECTIONS: int = int(os.getenv("WEAVIATE_HNSW_MAX_CONNECTIONS", 32))
+    # Vector compression: "none", "pq", "bq" or "sq"
+    WEAVIATE_QUANTIZER: str = os.getenv("WEAVIATE_QUANTIZER", "none")
+    WEAVIATE_RESCORE_LIMIT: int = int(os.getenv("WEAVIATE_RESCORE_LIMIT", 200))
+    WEAVIATE_PQ_SEGMENTS: int = int(os.getenv("WEAVIATE_PQ_SEGMENTS", 0))
     MISTRAL_API_KEY: str = os.getenv("MISTRAL_API_KEY")
+    # Point at a local stub server for tests (None = Mistral's public API)
+    MISTRAL_SERVER_URL: str = os.getenv("MISTRAL_SERVER_URL")
+
+    # 🚦 LLM Gateway: per-task routing, comma-separated fallback chain
+    LLM_EXTRACTION_MODELS: str = os.getenv("LLM_EXTRACTION_MODELS", "open-mistral-7b,open-mixtral-8x7b")
+    LLM_COVER_LETTER_MODELS: str = os.getenv("LLM_COVER_LETTER_MODELS", "open-mixtral-8x7b,open-mistral-7b")
+    LLM_CHAT_MODELS: str = os.getenv("LLM_CHAT_MODELS", "open-mixtral-8x7b,open-mistral-7b")
+    LLM_SUMMARY_MODELS: str = os.getenv("LLM_SUMMARY_MODELS", "open-mistral-7b,open-mixtral-8x7b")
+    LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", 8))
+    LLM_TIMEOUT_SECONDS: float = float(os.getenv("LLM_TIMEOUT_SECONDS", 60))
+    LLM_MAX_RETRIES: int = int(os.getenv("LLM_MAX_RETRIES", 3))
+    LLM_BACKOFF_BASE_SECONDS: float = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", 0.5))
+    LLM_BACKOFF_MAX_SECONDS: float = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", 8))
+    # Send a duplicate request if the first is slower than this (0 = use observed p95)
+    LLM_HEDGE_AFTER_SECONDS: float = float(os.getenv("LLM_HEDGE_AFTER_SECONDS", 0))
+    LLM_BREAKER_FAILURES: int = int(os.getenv("LLM_BREAKER_FAILURES", 5))
+    LLM_BREAKER_COOLDOWN_SECONDS: float = float(os.getenv("LLM_BREAKER_COOLDOWN_SECONDS", 30))
+
+    # Overrides the per-model prompt token budget (0 = use model defaults)
+    LLM_INPUT_TOKEN_BUDGET: int = int(os.getenv("LLM_INPUT_TOKEN_BUDGET", 0))
+
+    # 🚥 Admission control for expensive work (LLM, browser, embedding)
+    ADMISSION_ENABLED: bool = os.getenv("ADMISSION_ENABLED", "true").lower() == "true"
+    ADMISSION_LLM_CONCURRENCY: int = int(os.getenv("ADMISSION_LLM_CONCURRENCY", 6))
+    ADMISSION_BROWSER_CONCURRENCY: int = int(os.getenv("ADMISSION_BROWSER_CONCURRENCY", 2))
+    ADMISSION_EMBEDDING_CONCURRENCY: int = int(os.getenv("ADMISSION_EMBEDDING_CONCURRENCY", 4))
+    # Waiting requests per resource class before new ones get a 429
+    ADMISSION_QUEUE_SIZE: int = int(os.getenv("ADMISSION_QUEUE_SIZE", 16))
+    # Waiting requests across all classes. Each one blocks a worker thread, so this
+    # plus the concurrency limits must stay well below the threadpool (anyio: 40)
+    ADMISSION_MAX_WAITING: int = int(os.getenv("ADMISSION_MAX_WAITING", 16))
+    ADMISSION_MAX_WAIT_SECONDS: float = float(os.getenv("ADMISSION_MAX_WAIT_SECONDS", 20))
+    ADMISSION_USER_RATE_PER_MINUTE: float = float(os.getenv("ADMISSION_USER_RATE_PER_MINUTE", 30))
+    ADMISSION_USER_BURST: float = float(os.getenv("ADMISSION_USER_BURST", 10))
+    ADMISSION_GLOBAL_RATE_PER_MINUTE: float = float(os.getenv("ADMISSION_GLOBAL_RATE_PER_MINUTE", 600))
+    ADMISSION_GLOBAL_BURST: float = float(os.getenv("ADMISSION_GLOBAL_BURST", 100))
+
+    # ♻️ Job corpus lifecycle: postings unseen for JOB_TTL_DAYS are deleted (0 = keep forever)
+    JOB_TTL_DAYS: int = int(os.getenv("JOB_TTL_DAYS", 30))
+    JOB_SWEEP_INTERVAL_SECONDS: int = int(os.getenv("JOB_SWEEP_INTERVAL_SECONDS", 3600))
+    JOB_SWEEP_BATCH_SIZE: int = int(os.getenv("JOB_SWEEP_BATCH_SIZE", 500))
+    # Rebuild the index once this share of the corpus has been deleted (0 = manual only)
+    JOB_COMPACT_DELETED_FRACTION: float = float(os.getenv("JOB_COMPACT_DELETED_FRACTION", 0))
+
+    # 💬 Interview-training chat: every turn's prompt stays within this many tokens
+    CHAT_CONTEXT_TOKEN_BUDGET: int = int(os.getenv("CHAT_CONTEXT_TOKEN_BUDGET", 2500))
+    # Recent turns sent verbatim; older ones are folded into the session summary
+    CHAT_WINDOW_TOKENS: int = int(os.getenv("CHAT_WINDOW_TOKENS", 1500))
+    CHAT_WINDOW_MESSAGES: int = int(os.getenv("CHAT_WINDOW_MESSAGES", 12))
+    CHAT_SUMMARY_TOKENS: int = int(os.getenv("CHAT_SUMMARY_TOKENS", 300))
+
+    # 📬 Precomputed match feed
+    MATCH_FEED_TOP_K: int = int(os.getenv("MATCH_FEED_TOP_K", 100))
+    MATCH_FEED_MIN_SCORE: float = float(os.getenv("MATCH_FEED_MIN_SCORE", 0.3))
+
+    # 🧬 Near-duplicate job detection (MinHash/LSH)
+    DEDUP_ENABLED: bool = os.getenv("DEDUP_ENABLED", "true").lower() == "true"
+    DEDUP_THRESHOLD: float = float(os.getenv("DEDUP_THRESHOLD", 0.8))
 
     # 🔐 Security
     SECRET_KEY: str = os.getenv("SECRET_KEY", "super_secret_key_change_me_in_prod")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Comma-separated accounts allowed to run maintenance endpoints
+    ADMIN_EMAILS: str = os.getenv("ADMIN_EMAILS", "")
 
     # 🤖 MCP Agent URLs
     BROWSER_MCP_URL: str = os.getenv("BROWSER_MCP_URL", "http://localhost:3001/sse")
@@ -26,4 +95,29 @@ class Settings:
     GMAIL_MCP_URL: str = os.getenv("GMAIL_MCP_URL", "http://localhost:3003/sse")
     CALENDAR_MCP_URL: str = os.getenv("CALENDAR_MCP_URL", "http://localhost:3004/sse")
 
+    # 🗄️ Browser MCP page cache (search results and opened pages)
+    SCRAPE_CACHE_ENABLED: bool = os.getenv("SCRAPE_CACHE_ENABLED", "true").lower() == "true"
+    SCRAPE_CACHE_DIR: str = os.getenv("SCRAPE_CACHE_DIR", "/tmp/job_agent_page_cache")
+    SCRAPE_CACHE_MAX_MB: int = int(os.getenv("SCRAPE_CACHE_MAX_MB", 256))
+    SCRAPE_CACHE_SEARCH_TTL_SECONDS: int = int(os.getenv("SCRAPE_CACHE_SEARCH_TTL_SECONDS", 3600))
+    SCRAPE_CACHE_PAGE_TTL_SECONDS: int = int(os.getenv("SCRAPE_CACHE_PAGE_TTL_SECONDS", 86400))
+    # How long past its TTL an entry is still served while it is refreshed
+    SCRAPE_CACHE_STALE_SECONDS: int = int(os.getenv("SCRAPE_CACHE_STALE_SECONDS", 86400))
+
+    # 📬 Gmail / Calendar sync cache
+    ASSISTANT_SYNC_INTERVAL_SECONDS: int = int(os.getenv("ASSISTANT_SYNC_INTERVAL_SECONDS", 300))
+    GMAIL_SYNC_QUERY: str = os.getenv("GMAIL_SYNC_QUERY", "in:inbox")
+    GMAIL_SYNC_DAYS: int = int(os.getenv("GMAIL_SYNC_DAYS", 90))
+    GMAIL_SYNC_BATCH: int = int(os.getenv("GMAIL_SYNC_BATCH", 100))
+    CALENDAR_SYNC_DAYS: int = int(os.getenv("CALENDAR_SYNC_DAYS", 60))
+
+    # 📄 Document Ingestion
+    INGEST_SPOOL_DIR: str = os.getenv("INGEST_SPOOL_DIR", "/tmp/job_agent_uploads")
+    INGEST_CHUNK_SIZE: int = int(os.getenv("INGEST_CHUNK_SIZE", 1024 * 1024))
+    INGEST_MAX_FILE_BYTES: int = int(os.getenv("INGEST_MAX_FILE_BYTES", 10 * 1024 * 1024))
+    INGEST_MAX_BATCH_FILES: int = int(os.getenv("INGEST_MAX_BATCH_FILES", 200))
+    INGEST_MAX_WORKERS: int = int(os.getenv("INGEST_MAX_WORKERS", 2))
+    INGEST_TIMEOUT_SECONDS: float = float(os.getenv("INGEST_TIMEOUT_SECONDS", 30))
+    INGEST_MAX_TEXT_CHARS: int = int(os.getenv("INGEST_MAX_TEXT_CHARS", 200_000))
+
 settings = Settings()
\ No newline at end of file
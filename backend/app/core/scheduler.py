@@ -0,0 +1,42 @@
+import asyncio
+from fastapi.concurrency import run_in_threadpool
+
+
+class PeriodicTask:
+    """
+    Runs a blocking function every `interval` seconds on the app's event
+    loop (in a worker thread), e.g. background sync and cleanup jobs.
+    """
+
+    def __init__(self, name: str, func, interval: float, run_immediately: bool = True):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.run_immediately = run_immediately
+        self._task = None
+
+    async def _loop(self):
+        if not self.run_immediately:
+            await asyncio.sleep(self.interval)
+        while True:
+            try:
+                await run_in_threadpool(self.func)
+            except Exception as e:
+                print(f"❌ Background task '{self.name}' failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self.interval <= 0 or self._task is not None:
+            return
+        print(f"⏱️ Scheduling '{self.name}' every {self.interval}s")
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
@@ -4,10 +4,12 @@ from jose import jwt, JWTError
 from sqlalchemy.orm import Session
 from app.core.config import settings
 from app.db.session import get_db
-from app.db.models import User
+from app.db.models import User, ResumeProfile
 
 # This tells FastAPI that the route to get a token is "/api/v1/auth/login"
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
+# Same scheme, but anonymous requests get None instead of a 401
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login", auto_error=False)
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme), 
@@ -41,4 +43,44 @@ async def get_current_user(
     if user is None:
         raise credentials_exception
         
-    return user
\ No newline at end of file
+    return user
+
+async def get_current_user_optional(
+    token: str = Depends(optional_oauth2_scheme),
+    db: Session = Depends(get_db)
+):
+    """
+    Like get_current_user, but returns None for anonymous requests so routes
+    can offer extra behaviour (e.g. saving a resume) to signed-in users.
+    """
+    if not token:
+        return None
+    return await get_current_user(token, db)
+
+async def get_admin_user(user: User = Depends(get_current_user)) -> User:
+    """
+    Like get_current_user, but only for accounts listed in ADMIN_EMAILS.
+    """
+    admins = {email.strip().lower() for email in settings.ADMIN_EMAILS.split(",") if email.strip()}
+    if (user.email or "").lower() not in admins:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return user
+
+def get_resume_profile(resume_id: int, user: User, db: Session) -> ResumeProfile:
+    """
+    Loads a stored resume owned by the user, or raises 401/404.
+    """
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Sign in to use a stored resume",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    profile = (
+        db.query(ResumeProfile)
+        .filter(ResumeProfile.id == resume_id, ResumeProfile.user_id == user.id)
+        .first()
+    )
+    if profile is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Resume {resume_id} not found")
+    return profile
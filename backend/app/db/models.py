@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, JSON, Float, UniqueConstraint, LargeBinary
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.session import Base
@@ -12,6 +12,8 @@ class User(Base):
     
     # A user has many chat sessions
     chats = relationship("ChatSession", back_populates="owner")
+    # A user has many stored resume profiles
+    resumes = relationship("ResumeProfile", back_populates="owner")
 
 class ChatSession(Base):
     __tablename__ = "chat_sessions"
@@ -20,17 +22,96 @@ class ChatSession(Base):
     user_id = Column(Integer, ForeignKey("users.id"))
     title = Column(String, default="New Chat")
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Rolling summary of the turns that no longer fit in the recent window
+    summary = Column(Text)
+    # Id of the last message folded into the summary
+    summarized_through = Column(Integer, default=0)
 
     owner = relationship("User", back_populates="chats")
-    messages = relationship("ChatMessage", back_populates="session")
+    messages = relationship("ChatMessage", back_populates="session", order_by="ChatMessage.id")
 
 class ChatMessage(Base):
     __tablename__ = "chat_messages"
 
     id = Column(Integer, primary_key=True, index=True)
-    session_id = Column(Integer, ForeignKey("chat_sessions.id"))
+    session_id = Column(Integer, ForeignKey("chat_sessions.id"), index=True)
     role = Column(String)  # "user" or "assistant"
     content = Column(Text)
+    # Counted once on insert so building a prompt never re-tokenizes history
+    token_count = Column(Integer)
     timestamp = Column(DateTime, default=datetime.utcnow)
 
-    session = relationship("ChatSession", back_populates="messages")
\ No newline at end of file
+    session = relationship("ChatSession", back_populates="messages")
+
+class ResumeProfile(Base):
+    __tablename__ = "resume_profiles"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
+    filename = Column(String)
+    raw_text = Column(Text)
+    skills = Column(JSON, default=list)
+    experience = Column(Text)
+    education = Column(JSON, default=list)
+    # Cached so matching never re-runs the embedding model for this resume
+    embedding = Column(JSON)
+    # Object id of the same vector in the Weaviate "Resume" collection
+    vector_id = Column(String)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    owner = relationship("User", back_populates="resumes")
+
+
+class MatchFeedItem(Base):
+    __tablename__ = "match_feed"
+    __table_args__ = (UniqueConstraint("user_id", "job_id", name="uq_match_feed_user_job"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
+    resume_id = Column(Integer, ForeignKey("resume_profiles.id", ondelete="CASCADE"))
+    # Weaviate object id of the matched job
+    job_id = Column(String, index=True)
+    title = Column(String)
+    company = Column(String)
+    score = Column(Float, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class JobFingerprint(Base):
+    __tablename__ = "job_fingerprints"
+
+    # Weaviate object id of the canonical posting
+    job_id = Column(String, primary_key=True)
+    # MinHash signature (uint32 array) used by the duplicate index
+    signature = Column(LargeBinary)
+    # How many near-identical postings were collapsed into this one
+    duplicate_count = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class SyncedEmail(Base):
+    __tablename__ = "synced_emails"
+
+    id = Column(Integer, primary_key=True, index=True)
+    message_id = Column(String, unique=True, index=True)
+    sender = Column(String, index=True)
+    subject = Column(String, index=True)
+    received_at = Column(DateTime, index=True)
+    synced_at = Column(DateTime, default=datetime.utcnow)
+
+class SyncedEvent(Base):
+    __tablename__ = "synced_events"
+
+    id = Column(Integer, primary_key=True, index=True)
+    # The Calendar MCP doesn't return event ids, so we key on start + summary
+    event_key = Column(String, unique=True, index=True)
+    summary = Column(String)
+    start = Column(DateTime, index=True)
+    synced_at = Column(DateTime, default=datetime.utcnow)
+
+class SyncState(Base):
+    __tablename__ = "sync_state"
+
+    # e.g. "gmail", "calendar"
+    source = Column(String, primary_key=True)
+    last_synced_at = Column(DateTime)
@@ -34,7 +34,38 @@ class ChatSessionResponse(BaseModel):
     id: int
     title: str
     created_at: datetime
+    summary: Optional[str] = None
     messages: List[ChatMessageBase] = []
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# --- Resume Schemas ---
+class ResumeProfileResponse(BaseModel):
+    id: int
+    filename: Optional[str] = None
+    skills: list = []
+    experience: Optional[str] = None
+    education: list = []
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+# --- Match Feed Schemas ---
+class MatchFeedItemResponse(BaseModel):
+    id: int
+    resume_id: int
+    job_id: str
+    title: str
+    company: str
+    score: float
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class MatchFeedResponse(BaseModel):
+    matches: List[MatchFeedItemResponse]
+    next_cursor: Optional[int] = None
@@ -1,8 +1,10 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 # Import the new module
-from app.api.v1 import resume, jobs, matcher, coverletter, tracking, assistant 
+from app.api.v1 import resume, jobs, matcher, coverletter, tracking, assistant, metrics, interview
 from app.db.session import engine, Base
+from app.core.config import settings
+from app.core.scheduler import PeriodicTask
 # Create tables automatically
 Base.metadata.create_all(bind=engine)
 
@@ -23,6 +25,29 @@ app.include_router(coverletter.router, prefix="/api/v1/coverletter", tags=["Cove
 app.include_router(tracking.router, prefix="/api/v1/tracking", tags=["Tracking"])
 # Register the new Assistant routes
 app.include_router(assistant.router, prefix="/api/v1/assistant", tags=["Assistant"]) 
+app.include_router(interview.router, prefix="/api/v1/interview", tags=["Interview Training"])
+app.include_router(metrics.router, prefix="/api/v1/metrics", tags=["Metrics"])
+
+# Keeps the local Gmail/Calendar cache current
+assistant_sync_task = PeriodicTask(
+    "assistant-sync", assistant.agent.sync.sync_all, settings.ASSISTANT_SYNC_INTERVAL_SECONDS
+)
+
+# Deletes job postings no crawl has seen within the TTL
+job_sweep_task = PeriodicTask(
+    "job-sweeper", jobs.lifecycle.sweep, settings.JOB_SWEEP_INTERVAL_SECONDS
+)
+
+@app.on_event("startup")
+async def start_background_tasks():
+    assistant_sync_task.start()
+    job_sweep_task.start()
+
+@app.on_event("shutdown")
+async def shutdown_background_work():
+    await assistant_sync_task.stop()
+    await job_sweep_task.stop()
+    resume.ingestor.shutdown()
 
 @app.get("/")
 def root():
@@ -0,0 +1,226 @@
+import re
+import hashlib
+import threading
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import or_
+from app.agents.mcp_client import MCPClient
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.db.models import SyncedEmail, SyncedEvent, SyncState
+
+EMAIL_LINE = re.compile(r"^- \[ID: (?P<id>[^\]]+)\] FROM: (?P<sender>.*?) \| SUBJECT: (?P<subject>.*?)(?: \| DATE: (?P<date>\S+))?$")
+EVENT_LINE = re.compile(r"^- (?P<start>\S+): (?P<summary>.*)$")
+# Re-read a little before the last sync so late-delivered mail isn't missed
+SYNC_OVERLAP = timedelta(hours=1)
+
+
+def _parse_datetime(value: str):
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _start_of_day(value: datetime):
+    return value.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+class AssistantSync:
+    """
+    Local cache of Gmail messages and Calendar events.
+
+    The MCP tools expose no history ids or sync tokens, so sync is
+    incremental by time window: each run only asks Gmail for mail newer
+    than the last sync, and re-reads the calendar window. Reads are served
+    from Postgres, so they are fast and not limited to the last few messages.
+    """
+
+    def __init__(self, mcp_client: MCPClient = None):
+        self.mcp_client = mcp_client or MCPClient()
+        self._lock = threading.Lock()
+
+    # --- Sync state ---
+    def _get_state(self, db, source: str):
+        state = db.query(SyncState).filter(SyncState.source == source).first()
+        return state.last_synced_at if state else None
+
+    def _set_state(self, db, source: str, synced_at: datetime):
+        state = db.query(SyncState).filter(SyncState.source == source).first()
+        if state is None:
+            db.add(SyncState(source=source, last_synced_at=synced_at))
+        else:
+            state.last_synced_at = synced_at
+
+    def has_synced(self, source: str):
+        db = SessionLocal()
+        try:
+            return self._get_state(db, source) is not None
+        finally:
+            db.close()
+
+    # --- Gmail ---
+    def _list_messages(self, query: str):
+        response = self.mcp_client.call(
+            tool_name="list_messages",
+            arguments={"query": query, "max_results": settings.GMAIL_SYNC_BATCH}
+        )
+        messages = []
+        for line in MCPClient.extract_text(response).splitlines():
+            match = EMAIL_LINE.match(line.strip())
+            if match:
+                messages.append(match.groupdict())
+        return messages
+
+    def _fetch_window(self, start: int, end: int, depth: int = 0):
+        """
+        Lists messages between two epoch timestamps. The tool has no paging,
+        so a full page means the window is split in half and both halves
+        are fetched.
+        """
+        query = f"{settings.GMAIL_SYNC_QUERY} after:{start} before:{end}".strip()
+        messages = self._list_messages(query)
+        if len(messages) < settings.GMAIL_SYNC_BATCH or end - start <= 60 or depth >= 12:
+            if len(messages) >= settings.GMAIL_SYNC_BATCH:
+                print(f"⚠️ Gmail window {start}-{end} still full; some messages may be skipped.")
+            return messages
+        middle = (start + end) // 2
+        return self._fetch_window(start, middle, depth + 1) + self._fetch_window(middle, end, depth + 1)
+
+    def sync_emails(self):
+        db = SessionLocal()
+        try:
+            now = datetime.utcnow()
+            last = self._get_state(db, "gmail")
+            since = last - SYNC_OVERLAP if last else now - timedelta(days=settings.GMAIL_SYNC_DAYS)
+
+            start = int(since.replace(tzinfo=timezone.utc).timestamp())
+            end = int(now.replace(tzinfo=timezone.utc).timestamp()) + 1
+            messages = self._fetch_window(start, end)
+
+            ids = [m["id"] for m in messages]
+            known = {
+                message_id for (message_id,) in
+                db.query(SyncedEmail.message_id).filter(SyncedEmail.message_id.in_(ids))
+            } if ids else set()
+
+            added = 0
+            for message in messages:
+                if message["id"] in known:
+                    continue
+                known.add(message["id"])
+                db.add(SyncedEmail(
+                    message_id=message["id"],
+                    sender=message["sender"],
+                    subject=message["subject"],
+                    received_at=_parse_datetime(message.get("date")) or now,
+                ))
+                added += 1
+
+            self._set_state(db, "gmail", now)
+            db.commit()
+            print(f"📧 Gmail sync: {added} new of {len(messages)} listed.")
+            return added
+        finally:
+            db.close()
+
+    def search_emails(self, query: str = "", limit: int = 50):
+        """
+        Searches cached mail. Understands the common Gmail operators
+        'subject:' and 'from:'; other words match subject or sender.
+        """
+        db = SessionLocal()
+        try:
+            q = db.query(SyncedEmail)
+            for operator, value in re.findall(r"(?:(\w+):)?(\"[^\"]+\"|\([^)]+\)|\S+)", query or ""):
+                value = value.strip('"')
+                terms = [t for t in re.split(r"\s+OR\s+", value.strip("()")) if t]
+                if operator == "subject":
+                    q = q.filter(or_(*[SyncedEmail.subject.ilike(f"%{t}%") for t in terms]))
+                elif operator == "from":
+                    q = q.filter(or_(*[SyncedEmail.sender.ilike(f"%{t}%") for t in terms]))
+                elif not operator:
+                    q = q.filter(or_(
+                        *[SyncedEmail.subject.ilike(f"%{t}%") for t in terms],
+                        *[SyncedEmail.sender.ilike(f"%{t}%") for t in terms],
+                    ))
+                # Other operators (newer_than:, in:, ...) are covered by the sync window
+
+            emails = q.order_by(SyncedEmail.received_at.desc()).limit(limit).all()
+            return [
+                {"id": e.message_id, "from": e.sender, "subject": e.subject, "received_at": e.received_at}
+                for e in emails
+            ]
+        finally:
+            db.close()
+
+    # --- Calendar ---
+    def sync_events(self):
+        db = SessionLocal()
+        try:
+            now = datetime.utcnow()
+            response = self.mcp_client.call(
+                tool_name="list_upcoming_events",
+                arguments={"days": settings.CALENDAR_SYNC_DAYS}
+            )
+            events = {}
+            for line in MCPClient.extract_text(response).splitlines():
+                match = EVENT_LINE.match(line.strip())
+                start = _parse_datetime(match.group("start")) if match else None
+                if start:
+                    key = hashlib.sha1(f"{match.group('start')}|{match.group('summary')}".encode()).hexdigest()
+                    events[key] = SyncedEvent(event_key=key, summary=match.group("summary"), start=start)
+
+            # The window is re-read in full, so replace it (events may have been deleted).
+            # Ongoing and all-day events started before now, so it reaches back to
+            # midnight or the earliest listed event
+            window_start = min([_start_of_day(now), *(event.start for event in events.values())])
+            db.query(SyncedEvent).filter(or_(
+                SyncedEvent.start >= window_start,
+                SyncedEvent.event_key.in_(list(events)),
+            )).delete(synchronize_session=False)
+            db.add_all(events.values())
+            self._set_state(db, "calendar", now)
+            db.commit()
+            print(f"📅 Calendar sync: {len(events)} upcoming events cached.")
+            return len(events)
+        finally:
+            db.close()
+
+    def upcoming_events(self, days: int = 7):
+        """
+        Events from the start of today, so ongoing and all-day events are
+        included; sync drops today's events once the calendar stops listing them.
+        """
+        db = SessionLocal()
+        try:
+            now = datetime.utcnow()
+            events = (
+                db.query(SyncedEvent)
+                .filter(SyncedEvent.start >= _start_of_day(now), SyncedEvent.start <= now + timedelta(days=days))
+                .order_by(SyncedEvent.start)
+                .all()
+            )
+            return [{"start": e.start, "summary": e.summary} for e in events]
+        finally:
+            db.close()
+
+    def sync_all(self):
+        """
+        Entry point for the background scheduler. Runs are serialized so a
+        slow sync never overlaps the next one.
+        """
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            for name, sync in (("Gmail", self.sync_emails), ("Calendar", self.sync_events)):
+                try:
+                    sync()
+                except Exception as e:
+                    print(f"❌ {name} sync failed: {e}")
+        finally:
+            self._lock.release()
@@ -0,0 +1,162 @@
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.models import ChatSession, ChatMessage
+from app.services.prompt_builder import count_tokens, truncate_to_tokens, input_budget
+
+SUMMARY_TEMPLATE = """
+Update the running summary of a mock interview session.
+Keep the questions asked, the candidate's key answers, strengths, weaknesses and feedback given.
+Reply with the updated summary only, in at most {max_words} words.
+CURRENT SUMMARY: {summary}
+NEW TURNS:
+{turns}
+"""
+
+# Role markers and separators the API adds around each message
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+class ChatContextManager:
+    """
+    Keeps chat prompts a fixed size however long a session runs. Recent
+    turns are sent verbatim; older ones are folded into a rolling summary
+    stored on the session, so each turn costs the same.
+    """
+
+    def __init__(self, hf_client):
+        self.hf_client = hf_client
+        self.budget = settings.CHAT_CONTEXT_TOKEN_BUDGET
+        self.window_tokens = settings.CHAT_WINDOW_TOKENS
+        self.window_messages = settings.CHAT_WINDOW_MESSAGES
+        self.summary_tokens = settings.CHAT_SUMMARY_TOKENS
+
+    def add_message(self, db: Session, session: ChatSession, role: str, content: str):
+        message = ChatMessage(session_id=session.id, role=role, content=content, token_count=count_tokens(content))
+        db.add(message)
+        db.commit()
+        db.refresh(message)
+        return message
+
+    def _unsummarized(self, db: Session, session: ChatSession, limit: int):
+        # Newest first; the limit keeps reads bounded even if folding falls behind
+        return (
+            db.query(ChatMessage)
+            .filter(ChatMessage.session_id == session.id, ChatMessage.id > (session.summarized_through or 0))
+            .order_by(ChatMessage.id.desc())
+            .limit(limit)
+            .all()
+        )
+
+    @staticmethod
+    def _cost(message: ChatMessage):
+        tokens = message.token_count if message.token_count is not None else count_tokens(message.content)
+        return tokens + MESSAGE_OVERHEAD_TOKENS
+
+    def build(self, db: Session, session: ChatSession, system_prompt: str, model: str):
+        """
+        Messages for the next completion: system prompt and session summary,
+        then as many recent turns as fit in the budget. The newest message
+        (the user's) is always included, truncated if it has to be.
+        """
+        budget = min(self.budget, input_budget(model))
+        system = system_prompt.strip()
+        if session.summary:
+            system += f"\n\nSUMMARY OF THE SESSION SO FAR:\n{session.summary}"
+        used = count_tokens(system) + MESSAGE_OVERHEAD_TOKENS
+
+        turns = []
+        for message in self._unsummarized(db, session, self.window_messages * 2):
+            cost = self._cost(message)
+            if used + cost > budget:
+                if not turns:
+                    content = truncate_to_tokens(message.content, max(0, budget - used - MESSAGE_OVERHEAD_TOKENS))
+                    turns.append({"role": message.role, "content": content})
+                break
+            turns.append({"role": message.role, "content": message.content})
+            used += cost
+
+        turns.reverse()
+        # The conversation sent to the model should open with a user turn
+        while len(turns) > 1 and turns[0]["role"] != "user":
+            turns.pop(0)
+        return [{"role": "system", "content": system}] + turns
+
+    def _oldest_unsummarized(self, db: Session, session: ChatSession, before_id: int, limit: int):
+        return (
+            db.query(ChatMessage)
+            .filter(
+                ChatMessage.session_id == session.id,
+                ChatMessage.id > (session.summarized_through or 0),
+                ChatMessage.id < before_id,
+            )
+            .order_by(ChatMessage.id)
+            .limit(limit)
+            .all()
+        )
+
+    def _summarize(self, session: ChatSession, messages: list, model: str, turns_budget: int):
+        turns = truncate_to_tokens("\n".join(f"{m.role.upper()}: {m.content}" for m in messages), turns_budget)
+        prompt = SUMMARY_TEMPLATE.format(
+            max_words=int(self.summary_tokens * 0.75),
+            summary=session.summary or "(none yet)",
+            turns=turns,
+        )
+        try:
+            summary = self.hf_client.chat_completion([{"role": "user", "content": prompt}], model=model, task="summarize")
+        except Exception as e:
+            summary = f"Error: {e}"
+        if summary.startswith("Error:"):
+            print(f"⚠️ Could not summarize chat session {session.id}: {summary[len('Error:'):].strip()}")
+            return None
+        return truncate_to_tokens(summary.strip(), self.summary_tokens)
+
+    def fold(self, db: Session, session: ChatSession):
+        """
+        Once the unsummarized turns outgrow the window, merges all but the
+        newest of them into the session summary, leaving half a window
+        verbatim so this runs every few turns rather than on each one.
+        A long backlog is folded oldest first over several calls to the model.
+        If a call fails, the backlog stays past summarized_through and the
+        next turn's fold picks it up again. Returns True if the summary was updated.
+        """
+        # One more than the window is enough to tell whether everything fits
+        recent = self._unsummarized(db, session, self.window_messages + 1)
+        if sum(self._cost(m) for m in recent) <= self.window_tokens and len(recent) <= self.window_messages:
+            return False
+
+        keep, used = 0, 0
+        for message in recent:
+            used += self._cost(message)
+            if used > self.window_tokens // 2 or keep >= self.window_messages // 2:
+                break
+            keep += 1
+        # Everything older than the oldest kept message gets folded
+        boundary = recent[keep - 1].id if keep else recent[0].id + 1
+
+        model = self.hf_client.gateway.route("summarize")
+        turns_budget = input_budget(model) - self.summary_tokens - count_tokens(SUMMARY_TEMPLATE) - 50
+        folded = 0
+        while True:
+            to_fold, used = [], 0
+            for message in self._oldest_unsummarized(db, session, boundary, self.window_messages * 4):
+                cost = self._cost(message)
+                if to_fold and used + cost > turns_budget:
+                    break
+                to_fold.append(message)
+                used += cost
+            if not to_fold:
+                break
+
+            summary = self._summarize(session, to_fold, model, turns_budget)
+            if summary is None:
+                # Older turns drop out of the prompt until this succeeds, so retry on the next turn
+                print(f"⚠️ Chat session {session.id} has unsummarized turns before message {boundary}, retrying next turn.")
+                break
+            session.summary = summary
+            session.summarized_through = to_fold[-1].id
+            db.commit()
+            folded += len(to_fold)
+
+        if folded:
+            print(f"🗜️ Folded {folded} messages into the summary of chat session {session.id}.")
+        return folded > 0
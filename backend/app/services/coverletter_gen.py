@@ -5,11 +5,6 @@ class CoverLetterGenerator:
         self.hf_client = HuggingFaceClient()
 
     def generate(self, resume_text: str, job_description: str):
-        prompt = f"""
-        Generate a professional, concise, and tailored cover letter based on the following resume:
-        {resume_text}
-
-        And for this job description:
-        {job_description}
-        """
-        return self.hf_client.generate_cover_letter(prompt)
+        # The client assembles the prompt itself, trimming the resume to the
+        # sections most relevant to this job so it fits the token budget
+        return self.hf_client.generate_cover_letter(resume_text, job_description)
@@ -0,0 +1,352 @@
+import re
+import hashlib
+import threading
+from collections import Counter
+import numpy as np
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.db.models import JobFingerprint
+
+# 64 permutations in 16 bands of 4 rows: postings with Jaccard >= 0.8 land in
+# a shared bucket with >99.9% probability; candidates are then checked exactly
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 5
+
+_SEEDS = np.random.default_rng(20240501).integers(1, 2 ** 63, NUM_PERM, dtype=np.uint64)
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+
+
+def _mix(x: np.ndarray):
+    # splitmix64 finalizer; uint64 arithmetic wraps, which is what we want
+    x = x ^ (x >> np.uint64(30))
+    x = x * _MIX_1
+    x = x ^ (x >> np.uint64(27))
+    x = x * _MIX_2
+    return x ^ (x >> np.uint64(31))
+
+
+def normalize(text: str):
+    return re.sub(r"\s+", " ", re.sub(r"[^\w\s]", " ", (text or "").lower())).strip()
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE):
+    words = normalize(text).split()
+    if len(words) < size:
+        # Too short for word shingles, fall back to character shingles
+        joined = " ".join(words)
+        return {joined[i:i + size] for i in range(max(1, len(joined) - size + 1))}
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def minhash(text: str):
+    """
+    MinHash signature of the text's shingles as NUM_PERM uint32 values.
+    """
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "little") for s in shingles(text)),
+        dtype=np.uint64,
+    )
+    with np.errstate(over="ignore"):
+        permuted = _mix(hashes[:, None] ^ _SEEDS[None, :])
+    return (permuted.min(axis=0) >> np.uint64(32)).astype(np.uint32)
+
+
+def band_keys(signatures: np.ndarray):
+    """
+    One 64-bit bucket key per band (shape (..., BANDS) for (..., NUM_PERM)
+    input). The band index is mixed in so equal rows in different bands
+    never collide.
+    """
+    rows = signatures.reshape(signatures.shape[:-1] + (BANDS, ROWS)).astype(np.uint64)
+    with np.errstate(over="ignore"):
+        keys = np.broadcast_to(_mix(np.arange(BANDS, dtype=np.uint64) + np.uint64(1)), rows.shape[:-1])
+        for j in range(ROWS):
+            keys = _mix(keys ^ rows[..., j])
+    return keys
+
+
+def similarity(a: np.ndarray, b: np.ndarray):
+    """
+    Estimated Jaccard similarity between two signatures.
+    """
+    return float(np.mean(a == b))
+
+
+class LSHIndex:
+    """
+    Bucket index over MinHash band keys.
+
+    Bulk entries live in one sorted uint64 array (binary search per band),
+    recent inserts in a small dict that is merged in periodically. This keeps
+    memory around 12 bytes per band per posting, so hundreds of thousands of
+    postings fit comfortably and lookups stay well under a millisecond.
+    Removed postings are tombstoned and dropped when the index is compacted.
+    """
+
+    MERGE_EVERY = 10000
+
+    def __init__(self):
+        self.job_ids = []
+        self.signatures = np.empty((1024, NUM_PERM), dtype=np.uint32)
+        self._alive = np.ones(1024, dtype=bool)
+        self._doc_of = {}
+        self._removed = 0
+        self._keys = np.empty(0, dtype=np.uint64)
+        self._docs = np.empty(0, dtype=np.int32)
+        self._pending = {}
+        self._pending_count = 0
+
+    def __len__(self):
+        return len(self.job_ids) - self._removed
+
+    def _reserve(self, count: int):
+        needed = len(self.job_ids) + count
+        if needed > len(self.signatures):
+            size = max(needed, len(self.signatures) * 2)
+            grown = np.empty((size, NUM_PERM), dtype=np.uint32)
+            grown[: len(self.job_ids)] = self.signatures[: len(self.job_ids)]
+            self.signatures = grown
+            self._alive = np.concatenate([self._alive, np.ones(size - len(self._alive), dtype=bool)])
+
+    def add(self, job_id: str, signature: np.ndarray):
+        self._reserve(1)
+        doc = len(self.job_ids)
+        self.signatures[doc] = signature
+        self.job_ids.append(job_id)
+        self._doc_of[job_id] = doc
+
+        for key in band_keys(signature).tolist():
+            self._pending.setdefault(key, []).append(doc)
+        self._pending_count += BANDS
+        # Merging re-sorts everything, so let the buffer grow with the index
+        if self._pending_count >= max(self.MERGE_EVERY, len(self._keys) // 8):
+            self._merge()
+
+    def add_many(self, job_ids: list, signatures: np.ndarray):
+        """
+        Bulk load: one vectorized key computation and a single sort.
+        """
+        if not job_ids:
+            return
+        self._reserve(len(job_ids))
+        start = len(self.job_ids)
+        self.signatures[start:start + len(job_ids)] = signatures
+        self.job_ids.extend(job_ids)
+        self._doc_of.update((job_id, start + i) for i, job_id in enumerate(job_ids))
+
+        docs = np.repeat(np.arange(start, start + len(job_ids), dtype=np.int32), BANDS)
+        self._merge(band_keys(signatures).ravel(), docs)
+
+    def _merge(self, extra_keys: np.ndarray = None, extra_docs: np.ndarray = None):
+        keys = [key for key, docs in self._pending.items() for _ in docs]
+        docs = [doc for doc_list in self._pending.values() for doc in doc_list]
+        parts_keys = [self._keys, np.array(keys, dtype=np.uint64)]
+        parts_docs = [self._docs, np.array(docs, dtype=np.int32)]
+        if extra_keys is not None:
+            parts_keys.append(extra_keys)
+            parts_docs.append(extra_docs)
+        keys, docs = np.concatenate(parts_keys), np.concatenate(parts_docs)
+        order = np.argsort(keys, kind="stable")
+        self._keys, self._docs = keys[order], docs[order]
+        self._pending = {}
+        self._pending_count = 0
+
+    def remove(self, job_ids: list):
+        for job_id in job_ids:
+            doc = self._doc_of.pop(job_id, None)
+            if doc is not None:
+                self._alive[doc] = False
+                self._removed += 1
+        # Rebuild once tombstones make up a quarter of the index
+        if self._removed and self._removed * 4 >= len(self.job_ids):
+            self.compact()
+
+    def compact(self):
+        live = np.flatnonzero(self._alive[: len(self.job_ids)])
+        job_ids = [self.job_ids[doc] for doc in live.tolist()]
+        signatures = self.signatures[live].copy()
+        self.__init__()
+        self.add_many(job_ids, signatures)
+
+    def candidates(self, signature: np.ndarray):
+        keys = band_keys(signature)
+        found = set()
+        left = np.searchsorted(self._keys, keys, side="left")
+        right = np.searchsorted(self._keys, keys, side="right")
+        for lo, hi in zip(left.tolist(), right.tolist()):
+            found.update(self._docs[lo:hi].tolist())
+        for key in keys.tolist():
+            found.update(self._pending.get(key, ()))
+        return found
+
+    def query(self, signature: np.ndarray, threshold: float):
+        """
+        Returns (job_id, similarity) of the closest indexed posting at or
+        above threshold, or None.
+        """
+        docs = [doc for doc in self.candidates(signature) if self._alive[doc]]
+        if not docs:
+            return None
+        scores = np.mean(self.signatures[docs] == signature, axis=1)
+        best = int(np.argmax(scores))
+        if scores[best] < threshold:
+            return None
+        return self.job_ids[docs[best]], float(scores[best])
+
+
+class JobDeduplicator:
+    """
+    Collapses near-duplicate postings (the same role scraped from several
+    boards) into one canonical job. Signatures are persisted in Postgres and
+    loaded into the in-memory LSH index on first use.
+    """
+
+    def __init__(self):
+        self.enabled = settings.DEDUP_ENABLED
+        self.threshold = settings.DEDUP_THRESHOLD
+        self.index = LSHIndex()
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def fingerprint_text(title: str, company: str, description: str):
+        return f"{title} {company} {description}"
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        db = SessionLocal()
+        try:
+            rows = db.query(JobFingerprint.job_id, JobFingerprint.signature).yield_per(5000)
+            job_ids, signatures = [], []
+            for job_id, signature in rows:
+                job_ids.append(job_id)
+                signatures.append(np.frombuffer(signature, dtype=np.uint32))
+            if signatures:
+                self.index.add_many(job_ids, np.stack(signatures))
+            self._loaded = True
+            print(f"🧬 Loaded {len(self.index)} job fingerprints into the duplicate index.")
+        finally:
+            db.close()
+
+    def find_duplicate(self, title: str, company: str, description: str):
+        """
+        Returns (canonical_job_id, signature) if an equivalent posting is
+        already stored, else (None, signature). Pass the signature to register().
+        """
+        signature = minhash(self.fingerprint_text(title, company, description))
+        return self.match(signature), signature
+
+    def match(self, signature: np.ndarray):
+        """
+        Canonical job id for a precomputed signature, or None.
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            self._ensure_loaded()
+            match = self.index.query(signature, self.threshold)
+        return match[0] if match else None
+
+    def register(self, job_id: str, signature: np.ndarray):
+        with self._lock:
+            self._ensure_loaded()
+            self.index.add(job_id, signature)
+        db = SessionLocal()
+        try:
+            db.add(JobFingerprint(job_id=job_id, signature=signature.tobytes()))
+            db.commit()
+        finally:
+            db.close()
+
+    def register_many(self, job_ids: list, signatures: np.ndarray):
+        """
+        Bulk variant of register() for offline loads: one index merge and
+        one insert for the whole batch.
+        """
+        db = SessionLocal()
+        try:
+            # Ids re-stored after an interrupted load are already registered
+            known = {
+                job_id for (job_id,) in
+                db.query(JobFingerprint.job_id).filter(JobFingerprint.job_id.in_(job_ids))
+            } if job_ids else set()
+            keep = [i for i, job_id in enumerate(job_ids) if job_id not in known]
+            if not keep:
+                return
+            job_ids, signatures = [job_ids[i] for i in keep], signatures[keep]
+
+            with self._lock:
+                self._ensure_loaded()
+                self.index.add_many(job_ids, signatures)
+            db.bulk_insert_mappings(JobFingerprint, [
+                {"job_id": job_id, "signature": signature.tobytes(), "duplicate_count": 0}
+                for job_id, signature in zip(job_ids, signatures)
+            ])
+            db.commit()
+        finally:
+            db.close()
+
+    def forget(self, job_ids: list):
+        """
+        Drops deleted postings so new copies of them are stored again
+        instead of being collapsed into a job that no longer exists.
+        """
+        if not job_ids:
+            return
+        with self._lock:
+            if self._loaded:
+                self.index.remove(job_ids)
+        db = SessionLocal()
+        try:
+            db.query(JobFingerprint).filter(JobFingerprint.job_id.in_(job_ids)).delete(synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+    def record_duplicates(self, canonical_job_ids: list):
+        """
+        Counts collapsed copies; an id listed n times gains n.
+        """
+        db = SessionLocal()
+        try:
+            for job_id, copies in Counter(canonical_job_ids).items():
+                db.query(JobFingerprint).filter(JobFingerprint.job_id == job_id).update(
+                    {JobFingerprint.duplicate_count: JobFingerprint.duplicate_count + copies}
+                )
+            db.commit()
+        finally:
+            db.close()
+
+
+def collapse_duplicates(items: list, text_of, threshold: float = None):
+    """
+    Query-time helper: drops items that near-duplicate a higher-ranked item.
+    items must already be in rank order.
+    """
+    threshold = threshold or settings.DEDUP_THRESHOLD
+    kept, signatures = [], []
+    for item in items:
+        signature = minhash(text_of(item))
+        if any(similarity(signature, seen) >= threshold for seen in signatures):
+            continue
+        kept.append(item)
+        signatures.append(signature)
+    return kept
+
+
+_deduplicator = None
+_deduplicator_lock = threading.Lock()
+
+def get_job_deduplicator():
+    """
+    Process-wide deduplicator so every ingestion path shares one index.
+    """
+    global _deduplicator
+    with _deduplicator_lock:
+        if _deduplicator is None:
+            _deduplicator = JobDeduplicator()
+        return _deduplicator
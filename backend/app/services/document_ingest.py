@@ -0,0 +1,178 @@
+import os
+import asyncio
+import zipfile
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from app.core.config import settings
+
+
+class DocumentTooLargeError(ValueError):
+    pass
+
+
+def detect_format(path: str, filename: str = ""):
+    """
+    Sniffs the file's magic bytes instead of trusting the client's content type.
+    Returns 'pdf', 'docx' or 'text'.
+    """
+    with open(path, "rb") as f:
+        head = f.read(8)
+
+    if head.startswith(b"%PDF"):
+        return "pdf"
+    if head.startswith(b"PK\x03\x04"):
+        try:
+            with zipfile.ZipFile(path) as archive:
+                if "word/document.xml" in archive.namelist():
+                    return "docx"
+        except zipfile.BadZipFile:
+            pass
+        raise ValueError(f"Unsupported archive format: {filename or path}")
+    return "text"
+
+
+def extract_text(path: str, fmt: str, max_chars: int):
+    """
+    Runs inside a worker process. Stops reading once max_chars is reached so a
+    300-page PDF costs no more than the first few pages we actually use.
+    """
+    chunks = []
+    total = 0
+
+    if fmt == "pdf":
+        from pypdf import PdfReader
+        reader = PdfReader(path)
+        for page in reader.pages:
+            chunk = page.extract_text() or ""
+            chunks.append(chunk)
+            total += len(chunk)
+            if total >= max_chars:
+                break
+    elif fmt == "docx":
+        import docx
+        document = docx.Document(path)
+        for paragraph in document.paragraphs:
+            chunks.append(paragraph.text)
+            total += len(paragraph.text) + 1
+            if total >= max_chars:
+                break
+    else:
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            chunks.append(f.read(max_chars))
+
+    return "\n".join(chunks)[:max_chars]
+
+
+class DocumentIngestor:
+    def __init__(self):
+        self.spool_dir = settings.INGEST_SPOOL_DIR
+        self.chunk_size = settings.INGEST_CHUNK_SIZE
+        self.max_file_bytes = settings.INGEST_MAX_FILE_BYTES
+        self.max_workers = settings.INGEST_MAX_WORKERS
+        self.timeout = settings.INGEST_TIMEOUT_SECONDS
+        self.max_text_chars = settings.INGEST_MAX_TEXT_CHARS
+
+        os.makedirs(self.spool_dir, exist_ok=True)
+        self._pool = None
+        # Never queue more extractions than there are workers to run them
+        self._slots = asyncio.Semaphore(self.max_workers)
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._pool
+
+    def _reset_pool(self):
+        """
+        A timed-out extraction keeps running inside its worker, so kill the
+        workers outright and start a fresh pool on the next call.
+        """
+        pool, self._pool = self._pool, None
+        if pool is None:
+            return
+        for process in list(getattr(pool, "_processes", {}).values()):
+            process.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    async def spool_upload(self, upload):
+        """
+        Streams an UploadFile to disk in fixed-size chunks.
+        Raises DocumentTooLargeError as soon as the size limit is crossed.
+        """
+        fd, path = tempfile.mkstemp(dir=self.spool_dir, suffix=".upload")
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as out:
+                while True:
+                    chunk = await upload.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > self.max_file_bytes:
+                        raise DocumentTooLargeError(
+                            f"{upload.filename} exceeds the {self.max_file_bytes} byte limit"
+                        )
+                    out.write(chunk)
+        except Exception:
+            os.remove(path)
+            raise
+        return path, size
+
+    async def _extract(self, path: str, fmt: str):
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._get_pool(), extract_text, path, fmt, self.max_text_chars)
+        try:
+            return await asyncio.wait_for(future, timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self._reset_pool()
+            raise TimeoutError(f"Text extraction timed out after {self.timeout}s")
+
+    async def ingest(self, upload):
+        """
+        Spools, detects and extracts a single upload.
+        Returns a dict with 'filename', 'format', 'size' and either 'text' or
+        'error'/'error_type'.
+        """
+        result = {"filename": upload.filename, "format": None, "size": 0}
+        path = None
+        try:
+            path, result["size"] = await self.spool_upload(upload)
+            result["format"] = detect_format(path, upload.filename)
+
+            async with self._slots:
+                try:
+                    result["text"] = await self._extract(path, result["format"])
+                except BrokenProcessPool:
+                    # A neighbour's timeout killed the pool under us, retry once
+                    result["text"] = await self._extract(path, result["format"])
+
+            if not result["text"].strip():
+                raise ValueError("No extractable text found (scanned or empty document?)")
+
+        except Exception as e:
+            print(f"❌ Error ingesting '{upload.filename}': {e}")
+            result["error"] = str(e)
+            result["error_type"] = type(e).__name__
+        finally:
+            if path and os.path.exists(path):
+                os.remove(path)
+            await upload.close()
+
+        return result
+
+    async def ingest_many(self, uploads: list):
+        """
+        Ingests a batch of uploads. Extraction concurrency is bounded by the pool
+        size, so a 200-file drop queues up instead of forking 200 workers.
+        """
+        if len(uploads) > settings.INGEST_MAX_BATCH_FILES:
+            raise ValueError(
+                f"Batch of {len(uploads)} files exceeds the limit of {settings.INGEST_MAX_BATCH_FILES}"
+            )
+        return await asyncio.gather(*(self.ingest(upload) for upload in uploads))
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
@@ -1,75 +1,131 @@
-import os
 import json
-from transformers import pipeline
-from mistralai import Mistral
+import numpy as np
+import torch
+from transformers import AutoTokenizer, AutoModel
+from app.services.prompt_builder import PromptBuilder
+from app.services.llm_gateway import get_llm_gateway
+
+COVER_LETTER_TEMPLATE = """
+You are an expert career coach. Write a tailored, professional, concise cover letter.
+RESUME (most relevant sections): {resume_text}
+JOB DESCRIPTION: {job_description}
+Output ONLY the cover letter body.
+"""
+
+EXTRACTION_TEMPLATE = """
+Extract key skills, experience (in years), and education.
+Return strictly valid JSON with keys: 'skills' (list), 'experience' (str), 'education' (list).
+RESUME TEXT: {resume_text}
+"""
+
+# What extraction needs most when a resume has to be trimmed
+EXTRACTION_QUERY = "Skills, technologies, work experience with dates and years, education and degrees"
+
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+EMBEDDING_BATCH_SIZE = 64
+
+
+def load_embedding_model():
+    """
+    Returns (tokenizer, encoder) for embed_batch.
+    """
+    encoder = AutoModel.from_pretrained(EMBEDDING_MODEL)
+    encoder.eval()
+    return AutoTokenizer.from_pretrained(EMBEDDING_MODEL), encoder
+
+
+def embed_batch(model, texts: list, batch_size: int = EMBEDDING_BATCH_SIZE):
+    """
+    Mean-pooled embeddings, weighted by the attention mask so padding added
+    to shorter texts in a batch doesn't dilute their vectors. Long texts
+    are truncated to the model's maximum length.
+    """
+    tokenizer, encoder = model
+    embeddings = []
+    for start in range(0, len(texts), batch_size):
+        inputs = tokenizer(texts[start:start + batch_size], padding=True, truncation=True, return_tensors="pt")
+        with torch.no_grad():
+            hidden = encoder(**inputs).last_hidden_state
+        mask = inputs["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+        pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+        embeddings.extend(pooled.numpy().astype(np.float32).tolist())
+    return embeddings
 
 class HuggingFaceClient:
     def __init__(self):
         # 1. Load Local Embedding Model (Fast & Free)
         print("🚀 Loading Local Embedding Model...")
-        self.embedding_model = pipeline(
-            "feature-extraction",
-            model="sentence-transformers/all-MiniLM-L6-v2"
-        )
+        self.embedding_model = load_embedding_model()
 
-        # 2. Setup Mistral for Intelligence
-        self.api_key = os.getenv("MISTRAL_API_KEY")
-        self.client = Mistral(api_key=self.api_key) if self.api_key else None
+        # 2. Setup Mistral for Intelligence (shared gateway: routing, retries, limits)
+        self.gateway = get_llm_gateway()
+        self.client = self.gateway.client
 
         if not self.client:
             print("⚠️ WARNING: MISTRAL_API_KEY not found. Intelligence features will fail.")
 
+        # 3. Keeps prompts inside each model's token budget
+        self.prompt_builder = PromptBuilder(self.get_embeddings)
+
     def get_embedding(self, text: str):
         if not self.embedding_model:
             return []
-        # Calculate mean pooling (average of all token vectors)
-        emb = self.embedding_model(text)
-        # emb[0] is a list of vectors for each word. We sum them and divide by count.
-        vectors = emb[0]
-        return [sum(col) / len(col) for col in zip(*vectors)]
+        # Same pooling as batches, so single and bulk vectors are comparable
+        return embed_batch(self.embedding_model, [text])[0]
 
-    def generate_cover_letter(self, resume_text: str, job_description: str):
+    def get_embeddings(self, texts: list):
+        if not self.embedding_model or not texts:
+            return []
+        return embed_batch(self.embedding_model, texts)
+
+    def generate_cover_letter(self, resume_text: str, job_description: str, model: str = None):
         if not self.client: return "Error: Mistral API key missing."
+        model = self.gateway.route("cover_letter", model)
 
-        prompt = f"""
-        You are an expert career coach. Write a tailored, professional cover letter.
-        RESUME: {resume_text}
-        JOB DESCRIPTION: {job_description}
-        Output ONLY the cover letter body.
-        """
-        
-        # Using open-mixtral-8x7b for best creative writing balance
+        # Only the resume sections closest to the job make it into the prompt
+        prompt = self.prompt_builder.build(
+            COVER_LETTER_TEMPLATE,
+            model,
+            query=job_description,
+            fixed={"job_description": job_description},
+            ranked={"resume_text": resume_text},
+        )
+
+        # Routed to the larger model by default for best creative writing balance
         return self.chat_completion(
             messages=[{"role": "user", "content": prompt}],
-            model="open-mixtral-8x7b"
+            model=model,
+            task="cover_letter"
         )
 
-    def extract_skills(self, text: str):
+    def extract_skills(self, text: str, model: str = None):
         if not self.client: return {"error": "API key missing"}
+        # JSON extraction is routed to a smaller, faster model by default
+        model = self.gateway.route("extract_skills", model)
 
-        prompt = f"""
-        Extract key skills, experience (in years), and education.
-        Return strictly valid JSON with keys: 'skills' (list), 'experience' (str), 'education' (list).
-        RESUME TEXT: {text[:4000]}
-        """
+        prompt = self.prompt_builder.build(
+            EXTRACTION_TEMPLATE,
+            model,
+            query=EXTRACTION_QUERY,
+            ranked={"resume_text": text},
+        )
 
-        response = self.client.chat.complete(
-            model="open-mixtral-8x7b",
-            messages=[{"role": "user", "content": prompt}],
+        response = self.gateway.complete(
+            "extract_skills",
+            [{"role": "user", "content": prompt}],
+            model=model,
             response_format={"type": "json_object"}
         )
         return json.loads(response.choices[0].message.content)
 
-    def chat_completion(self, messages: list, model: str = "open-mixtral-8x7b"):
+    def chat_completion(self, messages: list, model: str = None, task: str = "chat"):
         """
         Generic chat method for Interview Training & Q&A.
         Accepts a list of messages: [{"role": "system", "content": "..."}, {"role": "user", "content": "..."}]
         """
         if not self.client: return "Error: Mistral API key missing."
-        
-        response = self.client.chat.complete(
-            model=model,
-            messages=messages,
-            temperature=0.7
-        )
-        return response.choices[0].message.content
\ No newline at end of file
+
+        response = self.gateway.complete(task, messages, model=model, temperature=0.7)
+        return response.choices[0].message.content
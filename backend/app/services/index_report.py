@@ -0,0 +1,123 @@
+import time
+import numpy as np
+
+# Bytes kept in memory per vector dimension for each compression mode
+BYTES_PER_DIMENSION = {"none": 4, "sq": 1, "bq": 1 / 8}
+
+
+def estimate_memory_bytes(object_count: int, dimensions: int, options: dict):
+    """
+    Rough in-memory footprint of the vector index: compressed vectors plus
+    HNSW graph links (layer 0 holds 2 * maxConnections 8-byte ids per node).
+    When compression is on, the full vectors only live on disk for rescoring.
+    """
+    quantizer = (options.get("quantizer") or "none").lower()
+    if quantizer == "pq":
+        segments = options.get("pq_segments") or max(1, dimensions // 4)
+        vector_bytes = object_count * segments
+    else:
+        vector_bytes = object_count * dimensions * BYTES_PER_DIMENSION[quantizer]
+
+    graph_bytes = 0
+    if options.get("index_type", "hnsw") == "hnsw":
+        graph_bytes = object_count * options.get("max_connections", 32) * 2 * 8
+
+    return int(vector_bytes + graph_bytes)
+
+
+def exact_top_k(query_vectors: np.ndarray, corpus_vectors: np.ndarray, top_k: int):
+    """
+    Brute-force cosine neighbours, used as ground truth for recall.
+    """
+    corpus = corpus_vectors / np.linalg.norm(corpus_vectors, axis=1, keepdims=True)
+    queries = query_vectors / np.linalg.norm(query_vectors, axis=1, keepdims=True)
+    scores = queries @ corpus.T
+    k = min(top_k, corpus.shape[0])
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    return [set(row.tolist()) for row in top]
+
+
+class IndexReport:
+    """
+    Compares candidate index settings on a sample of the live Job collection.
+    Each candidate is built in a scratch collection, so production data is
+    never touched.
+    """
+
+    def __init__(self, weaviate_client, sample_size: int = 5000, query_count: int = 100, top_k: int = 10):
+        self.weaviate_client = weaviate_client
+        self.sample_size = sample_size
+        self.query_count = query_count
+        self.top_k = top_k
+
+    def _load_sample(self):
+        collection = self.weaviate_client.client.collections.get(self.weaviate_client.class_name)
+        objects = []
+        for obj in collection.iterator(include_vector=True):
+            objects.append(obj)
+            if len(objects) >= self.sample_size:
+                break
+        return objects
+
+    def _evaluate(self, name: str, objects: list, vectors: np.ndarray, query_ids: np.ndarray, truth: list, options: dict):
+        client = self.weaviate_client
+        if name in client.client.collections.list_all():
+            client.client.collections.delete(name)
+        client._create_collection(name, options)
+
+        try:
+            collection = client.client.collections.get(name)
+            start = time.perf_counter()
+            with collection.batch.fixed_size(batch_size=200) as batch:
+                for obj, vector in zip(objects, vectors):
+                    batch.add_object(properties=obj.properties, vector=vector.tolist(), uuid=obj.uuid)
+            build_seconds = time.perf_counter() - start
+
+            position = {obj.uuid: i for i, obj in enumerate(objects)}
+            latencies = []
+            hits = 0
+            for query_index, expected in zip(query_ids, truth):
+                start = time.perf_counter()
+                result = collection.query.near_vector(
+                    near_vector=vectors[query_index].tolist(), limit=self.top_k, return_properties=[]
+                )
+                latencies.append((time.perf_counter() - start) * 1000)
+                found = {position[o.uuid] for o in result.objects if o.uuid in position}
+                hits += len(found & expected)
+
+            return {
+                "options": options,
+                "recall_at_k": round(hits / (len(truth) * self.top_k), 4),
+                "latency_ms_p50": round(float(np.percentile(latencies, 50)), 2),
+                "latency_ms_p95": round(float(np.percentile(latencies, 95)), 2),
+                "build_seconds": round(build_seconds, 2),
+                "estimated_memory_mb": round(
+                    estimate_memory_bytes(len(objects), vectors.shape[1], options) / 1024 ** 2, 2
+                ),
+            }
+        finally:
+            client.client.collections.delete(name)
+
+    def run(self, candidates: list):
+        """
+        candidates: list of partial index option dicts, e.g.
+        [{"quantizer": "none"}, {"quantizer": "pq"}, {"index_type": "flat", "quantizer": "bq"}]
+        Returns one row per candidate with recall@k, latency percentiles and memory.
+        """
+        objects = self._load_sample()
+        if len(objects) <= self.top_k:
+            raise ValueError(f"Need more than {self.top_k} jobs in Weaviate to build a report")
+
+        vectors = np.array([obj.vector["default"] for obj in objects], dtype=np.float32)
+        rng = np.random.default_rng(42)
+        query_ids = rng.choice(len(objects), size=min(self.query_count, len(objects)), replace=False)
+        truth = exact_top_k(vectors[query_ids], vectors, self.top_k)
+
+        report = []
+        for i, candidate in enumerate(candidates):
+            options = {**self.weaviate_client.index_options, **candidate}
+            print(f"📊 Benchmarking index settings {options}...")
+            report.append(
+                self._evaluate(f"{self.weaviate_client.class_name}_Bench{i}", objects, vectors, query_ids, truth, options)
+            )
+        return report
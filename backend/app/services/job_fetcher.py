@@ -77,4 +77,23 @@ class JobFetcher:
         return jobs
 
     def fetch_jobs_from_scraping(self, url: str):
-        pass
\ No newline at end of file
+        """
+        Opens a single job posting via the Browser MCP and returns it as a
+        job dict. Pages are served from the page cache when seen recently.
+        """
+        try:
+            response = self.mcp_client.call(tool_name="open_url", arguments={"url": url})
+            text = MCPClient.extract_text(response)
+            if isinstance(response, dict) and response.get("isError"):
+                raise RuntimeError(text)
+        except Exception as e:
+            print(f"❌ Error opening job page via MCP: {e}")
+            return []
+
+        lines = [line.strip() for line in text.splitlines() if line.strip()]
+        return [{
+            "title": lines[0][:200] if lines else url,
+            "company": "Job Board Listing",
+            "description": text,
+            "link": url
+        }]
@@ -0,0 +1,156 @@
+import time
+import threading
+from datetime import datetime, timedelta, timezone
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.db.models import JobFingerprint, MatchFeedItem
+from app.services.weaviate_client import WeaviateClient, get_weaviate_client
+from app.services.dedup import get_job_deduplicator
+from app.services.match_feed import MatchFeed
+from app.services.index_report import estimate_memory_bytes
+
+
+class JobLifecycle:
+    """
+    Keeps the Job corpus bounded. Postings no crawl has seen for
+    JOB_TTL_DAYS are deleted in batches together with their fingerprints
+    and feed entries. Weaviate cleans HNSW tombstones in the background;
+    compact() rebuilds the index outright when deletions have piled up.
+    """
+
+    def __init__(self, weaviate_client: WeaviateClient = None, match_feed: MatchFeed = None):
+        self.weaviate_client = weaviate_client or get_weaviate_client()
+        self.match_feed = match_feed or MatchFeed()
+        self.deduplicator = get_job_deduplicator()
+        self.ttl_days = settings.JOB_TTL_DAYS
+        self.batch_size = settings.JOB_SWEEP_BATCH_SIZE
+        self.compact_fraction = settings.JOB_COMPACT_DELETED_FRACTION
+
+        self.last_sweep = None
+        self.deleted_since_compaction = 0
+        self._lock = threading.Lock()
+
+    def cutoff(self):
+        return datetime.now(timezone.utc) - timedelta(days=self.ttl_days)
+
+    def record_duplicates(self, canonical_job_ids: list):
+        """
+        Handles postings collapsed into stored ones, for every ingestion
+        path: counts the copies and pushes back the canonical posting's
+        expiry, since a copy on another board means the role is still open.
+        """
+        if not canonical_job_ids:
+            return
+        self.deduplicator.record_duplicates(canonical_job_ids)
+        self.weaviate_client.touch_jobs(sorted(set(canonical_job_ids)))
+
+    def _delete_batch(self, job_ids: list):
+        deleted = self.weaviate_client.delete_jobs(job_ids)
+        self.deduplicator.forget(job_ids)
+        db = SessionLocal()
+        try:
+            self.match_feed.remove_jobs(db, job_ids)
+        finally:
+            db.close()
+        return deleted
+
+    def sweep(self):
+        """
+        Entry point for the background scheduler. Returns a summary, or None
+        if expiry is disabled or a sweep is already running.
+        """
+        if self.ttl_days <= 0 or not self._lock.acquire(blocking=False):
+            return None
+        try:
+            start = time.perf_counter()
+            backfilled = 0
+            if self.weaviate_client.count_missing_timestamps():
+                backfilled = self.weaviate_client.backfill_timestamps()
+                print(f"🕰️ Backfilled timestamps on {backfilled} older job postings.")
+
+            cutoff = self.cutoff()
+            deleted = 0
+            while True:
+                job_ids = self.weaviate_client.expired_job_ids(cutoff, self.batch_size)
+                if not job_ids:
+                    break
+                removed = self._delete_batch(job_ids)
+                deleted += removed
+                # Nothing deleted means the same batch would come back forever
+                if removed == 0 or len(job_ids) < self.batch_size:
+                    break
+
+            self.deleted_since_compaction += deleted
+            self.last_sweep = {
+                "finished_at": datetime.now(timezone.utc),
+                "cutoff": cutoff,
+                "deleted": deleted,
+                "backfilled": backfilled,
+                "seconds": round(time.perf_counter() - start, 2),
+            }
+            print(f"🧹 Job sweep: deleted {deleted} postings not seen since {cutoff:%Y-%m-%d}.")
+        finally:
+            self._lock.release()
+
+        if self.compact_fraction > 0 and deleted:
+            remaining = self.weaviate_client.count()
+            if self.deleted_since_compaction >= self.compact_fraction * max(1, remaining + self.deleted_since_compaction):
+                self.compact()
+        return self.last_sweep
+
+    def compact(self, batch_size: int = 200):
+        """
+        Re-indexes the collection into a fresh HNSW graph with the current
+        index settings, then drops fingerprints and feed entries of jobs
+        that were indexed before the rebuild but did not make it into the
+        new collection.
+        """
+        with self._lock:
+            before = self.weaviate_client.job_ids()
+            result = self.weaviate_client.migrate_index(batch_size=batch_size, force_rebuild=True)
+            self.deleted_since_compaction = 0
+            result["pruned"] = self._prune_orphans(before - self.weaviate_client.job_ids())
+            return result
+
+    def _prune_orphans(self, lost: set):
+        """
+        Forgets fingerprints and feed entries of the `lost` job ids. Only
+        ids seen before the rebuild are passed in, so rows of jobs added
+        while it ran (or never indexed at all) are left alone.
+        """
+        orphans = sorted(lost)
+        for i in range(0, len(orphans), self.batch_size):
+            batch = orphans[i:i + self.batch_size]
+            self.deduplicator.forget(batch)
+            db = SessionLocal()
+            try:
+                self.match_feed.remove_jobs(db, batch)
+            finally:
+                db.close()
+        if orphans:
+            print(f"🧹 Pruned {len(orphans)} fingerprints and feed entries of jobs missing after compaction.")
+        return len(orphans)
+
+    def stats(self):
+        stats = self.weaviate_client.corpus_stats(self.cutoff() if self.ttl_days > 0 else None)
+
+        # Vector length from any one posting, for the memory estimate
+        sample = self.weaviate_client.client.collections.get(self.weaviate_client.class_name).query.fetch_objects(
+            limit=1, include_vector=True, return_properties=[]
+        ).objects
+        dimensions = len(sample[0].vector["default"]) if sample else 0
+        stats["estimated_index_bytes"] = estimate_memory_bytes(stats["jobs"], dimensions, stats["index_options"])
+
+        db = SessionLocal()
+        try:
+            stats["fingerprints"] = db.query(JobFingerprint).count()
+            stats["feed_items"] = db.query(MatchFeedItem).count()
+        finally:
+            db.close()
+
+        stats.update({
+            "ttl_days": self.ttl_days,
+            "deleted_since_compaction": self.deleted_since_compaction,
+            "last_sweep": self.last_sweep,
+        })
+        return stats
@@ -0,0 +1,332 @@
+import os
+import time
+import random
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import httpx
+from mistralai import Mistral
+from app.core.config import settings
+from app.services.prompt_builder import count_tokens
+
+# Worth retrying: timeouts, rate limits and transient server errors
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+class LLMUnavailableError(RuntimeError):
+    pass
+
+
+class LLMSaturatedError(LLMUnavailableError):
+    """
+    Every gateway slot stayed busy: local load, not a sign the model is unhealthy.
+    """
+
+
+def _models(value: str):
+    return [m.strip() for m in value.split(",") if m.strip()]
+
+
+def _is_retryable(error: Exception):
+    if isinstance(error, httpx.TransportError):
+        return True
+    return getattr(error, "status_code", None) in RETRYABLE_STATUS
+
+
+def _retry_after(error: Exception):
+    response = getattr(error, "raw_response", None)
+    try:
+        return float(response.headers.get("retry-after"))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    """
+    Opens after `failures` consecutive errors, then lets a single trial call
+    through once `cooldown` seconds have passed.
+    """
+
+    def __init__(self, failures: int, cooldown: float):
+        self.failure_threshold = failures
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def is_open(self):
+        with self._lock:
+            return self.state == "open" and time.monotonic() - self.opened_at < self.cooldown
+
+    def allow(self):
+        with self._lock:
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = "half_open"
+                self._trial_in_flight = False
+            if self.state == "closed":
+                return True
+            if self.state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def release(self):
+        """
+        Gives back a trial taken by allow() when no call was made.
+        """
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                self.state = "open"
+                self.opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+
+class ModelStats:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.hedges = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.latencies_ms = deque(maxlen=500)
+        self._lock = threading.Lock()
+
+    def add(self, counter: str):
+        # Hedged calls update the same model's counters from several threads
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def record(self, latency_ms: float, prompt_tokens: int, completion_tokens: int):
+        with self._lock:
+            self.calls += 1
+            self.latencies_ms.append(latency_ms)
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+
+    def percentile(self, p: float):
+        with self._lock:
+            ordered = sorted(self.latencies_ms)
+        if not ordered:
+            return None
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+    def snapshot(self):
+        with self._lock:
+            counters = {
+                "calls": self.calls,
+                "errors": self.errors,
+                "retries": self.retries,
+                "hedges": self.hedges,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+            }
+        return {
+            **counters,
+            "latency_ms_p50": self.percentile(50),
+            "latency_ms_p95": self.percentile(95),
+            "latency_ms_p99": self.percentile(99),
+        }
+
+
+class LLMGateway:
+    """
+    Every Mistral call goes through here: per-task model routing with
+    fallbacks, a global concurrency cap, retries with jittered backoff,
+    hedged requests against slow tails, circuit breaking and metrics.
+    """
+
+    def __init__(self, client: Mistral = None):
+        api_key = os.getenv("MISTRAL_API_KEY")
+        if client is None and api_key:
+            client = Mistral(api_key=api_key, server_url=settings.MISTRAL_SERVER_URL)
+        self.client = client
+
+        self.routes = {
+            "extract_skills": _models(settings.LLM_EXTRACTION_MODELS),
+            "cover_letter": _models(settings.LLM_COVER_LETTER_MODELS),
+            "chat": _models(settings.LLM_CHAT_MODELS),
+            "summarize": _models(settings.LLM_SUMMARY_MODELS),
+        }
+        self.timeout = settings.LLM_TIMEOUT_SECONDS
+        self.max_retries = settings.LLM_MAX_RETRIES
+        self.backoff_base = settings.LLM_BACKOFF_BASE_SECONDS
+        self.backoff_max = settings.LLM_BACKOFF_MAX_SECONDS
+        self.hedge_after = settings.LLM_HEDGE_AFTER_SECONDS
+
+        # Counts in-flight calls (hedges included) across every caller
+        self._slots = threading.BoundedSemaphore(settings.LLM_MAX_CONCURRENCY)
+        self._executor = ThreadPoolExecutor(max_workers=settings.LLM_MAX_CONCURRENCY)
+        self._breakers = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def _breaker(self, model: str):
+        with self._lock:
+            if model not in self._breakers:
+                self._breakers[model] = CircuitBreaker(
+                    settings.LLM_BREAKER_FAILURES, settings.LLM_BREAKER_COOLDOWN_SECONDS
+                )
+            return self._breakers[model]
+
+    def _model_stats(self, model: str):
+        with self._lock:
+            return self._stats.setdefault(model, ModelStats())
+
+    def _chain(self, task: str, model: str = None):
+        chain = list(self.routes.get(task, self.routes["chat"]))
+        if model:
+            chain = [model] + [m for m in chain if m != model]
+        return chain
+
+    def route(self, task: str, model: str = None):
+        """
+        The model a call for this task would use right now (first one whose
+        circuit is not open). Used to pick the matching prompt budget.
+        """
+        chain = self._chain(task, model)
+        return next((m for m in chain if not self._breaker(m).is_open()), chain[0])
+
+    def _timed_call(self, task: str, model: str, messages: list, kwargs: dict):
+        stats = self._model_stats(model)
+        start = time.perf_counter()
+        try:
+            response = self.client.chat.complete(
+                model=model,
+                messages=messages,
+                timeout_ms=int(self.timeout * 1000),
+                **kwargs
+            )
+        except Exception:
+            stats.add("errors")
+            raise
+        latency_ms = (time.perf_counter() - start) * 1000
+
+        usage = getattr(response, "usage", None)
+        prompt_tokens = getattr(usage, "prompt_tokens", None) or sum(count_tokens(m["content"]) for m in messages)
+        completion_tokens = getattr(usage, "completion_tokens", None) or count_tokens(response.choices[0].message.content)
+        stats.record(latency_ms, prompt_tokens, completion_tokens)
+        print(f"🧮 LLM {task} [{model}] in={prompt_tokens} out={completion_tokens} tokens, {latency_ms:.0f}ms")
+        return response
+
+    def _submit(self, task: str, model: str, messages: list, kwargs: dict):
+        # The slot is held until the request really finishes, even if a hedge won
+        future = self._executor.submit(self._timed_call, task, model, messages, kwargs)
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def _hedge_delay(self, model: str):
+        if self.hedge_after > 0:
+            return self.hedge_after
+        stats = self._model_stats(model)
+        if len(stats.latencies_ms) < 20:
+            return None  # Not enough data to know what "slow" means yet
+        return stats.percentile(95) / 1000
+
+    def _hedged_call(self, task: str, model: str, messages: list, kwargs: dict):
+        if not self._slots.acquire(timeout=self.timeout):
+            raise LLMSaturatedError("Timed out waiting for a free LLM slot")
+        first = self._submit(task, model, messages, kwargs)
+
+        done, _ = wait([first], timeout=self._hedge_delay(model))
+        # Only hedge when it doesn't push us over the concurrency cap
+        if done or not self._slots.acquire(blocking=False):
+            return first.result()
+
+        self._model_stats(model).add("hedges")
+        pending = {first, self._submit(task, model, messages, kwargs)}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def _call_with_retries(self, task: str, model: str, messages: list, kwargs: dict):
+        for attempt in range(self.max_retries + 1):
+            try:
+                return self._hedged_call(task, model, messages, kwargs)
+            except Exception as e:
+                if attempt == self.max_retries or not _is_retryable(e):
+                    raise
+                # Full jitter keeps a burst of 429s from retrying in lockstep
+                delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+                delay = max(delay, min(self.backoff_max, _retry_after(e) or 0))
+                self._model_stats(model).add("retries")
+                print(f"🔁 LLM {task} [{model}] attempt {attempt + 1} failed ({e}), retrying in {delay:.2f}s")
+                time.sleep(delay)
+
+    def complete(self, task: str, messages: list, model: str = None, **kwargs):
+        """
+        Runs a chat completion for a task ("extract_skills", "cover_letter",
+        "chat", "summarize"), falling back along the task's model chain when
+        a model fails or its circuit is open.
+        """
+        if not self.client:
+            raise LLMUnavailableError("Mistral API key missing")
+
+        last_error = None
+        for candidate in self._chain(task, model):
+            breaker = self._breaker(candidate)
+            if not breaker.allow():
+                continue
+            try:
+                response = self._call_with_retries(task, candidate, messages, kwargs)
+                breaker.record_success()
+                return response
+            except LLMSaturatedError:
+                # Our own slots are busy; other models share them, and this one is fine
+                breaker.release()
+                raise
+            except Exception as e:
+                if not _is_retryable(e) and not isinstance(e, LLMUnavailableError):
+                    # A bad request fails the same way on every model
+                    breaker.record_success()
+                    raise
+                breaker.record_failure()
+                last_error = e
+                print(f"⚠️ LLM {task} [{candidate}] failed: {e}")
+        raise LLMUnavailableError(f"No model available for '{task}': {last_error}")
+
+    def metrics(self):
+        with self._lock:
+            models = dict(self._stats)
+            breakers = dict(self._breakers)
+        return {
+            "max_concurrency": settings.LLM_MAX_CONCURRENCY,
+            "routes": self.routes,
+            "models": {
+                name: {**stats.snapshot(), "circuit": breakers[name].state if name in breakers else "closed"}
+                for name, stats in models.items()
+            },
+        }
+
+
+_gateway = None
+_gateway_lock = threading.Lock()
+
+def get_llm_gateway():
+    """
+    Process-wide gateway, so the concurrency cap and circuit state are shared
+    by every HuggingFaceClient instance.
+    """
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = LLMGateway()
+        return _gateway
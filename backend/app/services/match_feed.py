@@ -0,0 +1,218 @@
+import threading
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.db.models import ResumeProfile, MatchFeedItem
+
+
+def _normalize(matrix: np.ndarray):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class MatchFeed:
+    """
+    Reverse matching: every newly ingested job is scored against all stored
+    resume vectors in one matrix product, and each user keeps a bounded
+    top-K of their best matches in Postgres. Reading the feed is then a plain
+    indexed query, with no vector search on the request path.
+    """
+
+    def __init__(self):
+        self.top_k = settings.MATCH_FEED_TOP_K
+        self.min_score = settings.MATCH_FEED_MIN_SCORE
+
+        # Normalized resume vectors, rebuilt only when resumes are added or removed
+        self._lock = threading.Lock()
+        self._version = None
+        self._matrix = None
+        self._resume_ids = None
+        self._user_ids = None
+
+    def _resume_matrix(self, db: Session):
+        version = tuple(db.query(func.count(ResumeProfile.id), func.max(ResumeProfile.id)).one())
+        with self._lock:
+            if version != self._version:
+                rows = (
+                    db.query(ResumeProfile.id, ResumeProfile.user_id, ResumeProfile.embedding)
+                    .filter(ResumeProfile.embedding.isnot(None))
+                    .order_by(ResumeProfile.user_id)
+                    .all()
+                )
+                if rows:
+                    self._matrix = _normalize(np.array([r.embedding for r in rows], dtype=np.float32))
+                    self._resume_ids = np.array([r.id for r in rows])
+                    self._user_ids = np.array([r.user_id for r in rows])
+                else:
+                    self._matrix = self._resume_ids = self._user_ids = None
+                self._version = version
+            return self._matrix, self._resume_ids, self._user_ids
+
+    def _best_per_user(self, scores: np.ndarray, user_ids: np.ndarray):
+        """
+        Collapses (resumes x jobs) scores to (users x jobs), keeping each user's
+        best-scoring resume. Rows are already grouped by user.
+        """
+        users, starts = np.unique(user_ids, return_index=True)
+        best = np.maximum.reduceat(scores, starts, axis=0)
+        ends = np.append(starts[1:], len(user_ids))
+        best_row = np.empty(best.shape, dtype=np.int64)
+        for i, (start, end) in enumerate(zip(starts, ends)):
+            best_row[i] = start + np.argmax(scores[start:end], axis=0)
+        return users, best, best_row
+
+    def score_jobs(self, db: Session, jobs: list):
+        """
+        jobs: [{"id", "title", "company", "embedding"}, ...]
+        Updates every affected user's top-K and returns the number of new feed items.
+        """
+        jobs = [job for job in jobs if job.get("id") and job.get("embedding")]
+        matrix, resume_ids, user_ids = self._resume_matrix(db)
+        if matrix is None or not jobs:
+            return 0
+
+        job_matrix = _normalize(np.array([job["embedding"] for job in jobs], dtype=np.float32))
+        scores = matrix @ job_matrix.T
+        users, best, best_row = self._best_per_user(scores, user_ids)
+
+        added = 0
+        for user_index, user_id in enumerate(users.tolist()):
+            candidates = np.flatnonzero(best[user_index] >= self.min_score)
+            if candidates.size == 0:
+                continue
+            # Only the new jobs that could still make this user's top-K
+            candidates = candidates[np.argsort(-best[user_index][candidates], kind="stable")][: self.top_k]
+            added += self._merge_user(db, user_id, [
+                (jobs[j], float(best[user_index][j]), int(resume_ids[best_row[user_index][j]]))
+                for j in candidates.tolist()
+            ])
+
+        db.commit()
+        return added
+
+    def _merge_user(self, db: Session, user_id: int, candidates: list):
+        count, floor = (
+            db.query(func.count(MatchFeedItem.id), func.min(MatchFeedItem.score))
+            .filter(MatchFeedItem.user_id == user_id)
+            .one()
+        )
+        if count >= self.top_k:
+            candidates = [c for c in candidates if c[1] > floor]
+            if not candidates:
+                return 0
+
+        existing = {
+            job_id for (job_id,) in db.query(MatchFeedItem.job_id).filter(
+                MatchFeedItem.user_id == user_id,
+                MatchFeedItem.job_id.in_([job["id"] for job, _, _ in candidates])
+            )
+        }
+        new_items = [
+            MatchFeedItem(
+                user_id=user_id,
+                resume_id=resume_id,
+                job_id=job["id"],
+                title=job.get("title", ""),
+                company=job.get("company", ""),
+                score=score,
+            )
+            for job, score, resume_id in candidates
+            if job["id"] not in existing
+        ]
+        db.add_all(new_items)
+        db.flush()
+
+        # Trim back to the K best; on ties the older match stays
+        overflow = (
+            db.query(MatchFeedItem.id)
+            .filter(MatchFeedItem.user_id == user_id)
+            .order_by(MatchFeedItem.score.desc(), MatchFeedItem.id.asc())
+            .offset(self.top_k)
+            .all()
+        )
+        if overflow:
+            db.query(MatchFeedItem).filter(
+                MatchFeedItem.id.in_([row.id for row in overflow])
+            ).delete(synchronize_session=False)
+        return len(new_items)
+
+    def ingest_jobs(self, jobs: list):
+        """
+        Entry point for ingestion paths; opens its own session so it can run
+        as a background task after the request has returned.
+        """
+        db = SessionLocal()
+        try:
+            added = self.score_jobs(db, jobs)
+            if added:
+                print(f"📬 Added {added} matches to user feeds from {len(jobs)} new jobs.")
+            return added
+        except Exception as e:
+            db.rollback()
+            print(f"❌ Error updating match feeds: {e}")
+            return 0
+        finally:
+            db.close()
+
+    def add_resume_matches(self, db: Session, user_id: int, resume_id: int, matches: list):
+        """
+        matches: [{"id", "title", "company", "score"}, ...] for one resume.
+        Merges them into the user's top-K and returns the number of new feed items.
+        """
+        matches = sorted(
+            (match for match in matches if match["score"] >= self.min_score),
+            key=lambda match: -match["score"]
+        )[: self.top_k]
+        if not matches:
+            return 0
+        added = self._merge_user(db, user_id, [(match, match["score"], resume_id) for match in matches])
+        db.commit()
+        return added
+
+    def backfill_resume(self, resume_id: int, weaviate_client):
+        """
+        Fills the feed for a newly stored resume from jobs already in the
+        index, which score_jobs only sees as new jobs arrive. Opens its own
+        session so it can run as a background task.
+        """
+        db = SessionLocal()
+        try:
+            profile = db.query(ResumeProfile).filter(ResumeProfile.id == resume_id).first()
+            if profile is None or not profile.embedding:
+                return 0
+            matches = weaviate_client.nearest_jobs(profile.embedding, self.top_k)
+            added = self.add_resume_matches(db, profile.user_id, profile.id, matches)
+            if added:
+                print(f"📬 Added {added} existing jobs to user {profile.user_id}'s feed for resume {resume_id}.")
+            return added
+        except Exception as e:
+            db.rollback()
+            print(f"❌ Error backfilling match feed for resume {resume_id}: {e}")
+            return 0
+        finally:
+            db.close()
+
+    def remove_jobs(self, db: Session, job_ids: list):
+        """
+        Drops expired or deleted jobs from every user's feed.
+        """
+        if not job_ids:
+            return 0
+        removed = db.query(MatchFeedItem).filter(MatchFeedItem.job_id.in_(job_ids)).delete(synchronize_session=False)
+        db.commit()
+        return removed
+
+    def get_feed(self, db: Session, user_id: int, cursor: int = None, limit: int = 20):
+        """
+        Newest matches first. Pass the returned next_cursor to get the next page.
+        """
+        query = db.query(MatchFeedItem).filter(MatchFeedItem.user_id == user_id)
+        if cursor is not None:
+            query = query.filter(MatchFeedItem.id < cursor)
+        items = query.order_by(MatchFeedItem.id.desc()).limit(limit + 1).all()
+
+        next_cursor = items[limit - 1].id if len(items) > limit else None
+        return items[:limit], next_cursor
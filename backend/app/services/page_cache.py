@@ -0,0 +1,215 @@
+import os
+import re
+import json
+import time
+import zlib
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from app.core.config import settings
+
+# Query parameters that only track where a click came from. Not ref/refid:
+# some job boards use them to identify the posting itself
+TRACKING_PARAMS = re.compile(
+    r"^(utm_\w+|gclid|dclid|fbclid|msclkid|yclid|igshid|mc_cid|mc_eid|_hsenc|_hsmi|mkt_tok|trk|trackingid|_ga)$",
+    re.IGNORECASE,
+)
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_query(query: str):
+    return re.sub(r"\s+", " ", (query or "").strip().lower())
+
+
+def normalize_url(url: str):
+    """
+    Canonical form of a URL for cache keys: lowercase scheme and host, no
+    default port, fragment or tracking parameters, sorted query string.
+    """
+    parts = urlsplit((url or "").strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    path = parts.path.rstrip("/") or "/"
+    params = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not TRACKING_PARAMS.match(k))
+    return urlunsplit((scheme, host, path, urlencode(params), ""))
+
+
+class PageCache:
+    """
+    On-disk cache for scraped pages and search results.
+
+    Entries are zlib-compressed JSON files keyed by a hash of the normalized
+    request. Total size is bounded; the least recently used entries are
+    evicted first. Entries past their TTL are still served for `stale_for`
+    seconds while a background refresh fetches a fresh copy.
+    """
+
+    def __init__(self, directory: str = None, max_bytes: int = None, stale_for: float = None):
+        self.directory = directory or settings.SCRAPE_CACHE_DIR
+        self.max_bytes = max_bytes if max_bytes is not None else settings.SCRAPE_CACHE_MAX_MB * 1024 * 1024
+        self.stale_for = stale_for if stale_for is not None else settings.SCRAPE_CACHE_STALE_SECONDS
+
+        self._entries = OrderedDict()  # key -> size on disk, least recently used first
+        self._total_bytes = 0
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix="page-cache")
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "evictions": 0, "errors": 0}
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._load_index()
+
+    # --- Storage ---
+    def _path(self, key: str):
+        return os.path.join(self.directory, key[:2], f"{key}.z")
+
+    def _load_index(self):
+        found = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".z"):
+                    stat = os.stat(os.path.join(root, name))
+                    found.append((stat.st_mtime, name[:-2], stat.st_size))
+        # mtime is bumped on every hit, so it doubles as the LRU order
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._total_bytes += size
+
+    def _read(self, key: str):
+        try:
+            with open(self._path(key), "rb") as f:
+                entry = json.loads(zlib.decompress(f.read()))
+            os.utime(self._path(key))
+            return entry
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, zlib.error) as e:
+            print(f"⚠️ Dropping unreadable cache entry {key}: {e}")
+            self._remove(key)
+            return None
+
+    def _write(self, key: str, value: str):
+        payload = zlib.compress(json.dumps({"stored_at": time.time(), "value": value}).encode(), 6)
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename, so readers never see a half-written file
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(payload)
+        os.replace(tmp, path)
+
+        with self._lock:
+            self._total_bytes += len(payload) - self._entries.pop(key, 0)
+            self._entries[key] = len(payload)
+            self._evict()
+
+    def _remove(self, key: str):
+        with self._lock:
+            self._total_bytes -= self._entries.pop(key, 0)
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def _evict(self):
+        # Called with the lock held; trims to 90% so eviction doesn't run on every write
+        if self._total_bytes <= self.max_bytes:
+            return
+        while self._entries and self._total_bytes > self.max_bytes * 0.9:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self.stats["evictions"] += 1
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    # --- Lookups ---
+    @staticmethod
+    def make_key(namespace: str, normalized: str):
+        return hashlib.sha256(f"{namespace}\n{normalized}".encode()).hexdigest()
+
+    def _fetch_and_store(self, key: str, fetch):
+        """
+        Runs fetch once per key even when many callers miss at the same time;
+        the others wait for the same result.
+        """
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+        if not owner:
+            return future.result()
+
+        try:
+            value = fetch()
+            self._write(key, value)
+            future.set_result(value)
+            return value
+        except Exception as e:
+            self.stats["errors"] += 1
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def _refresh(self, key: str, fetch):
+        try:
+            self._fetch_and_store(key, fetch)
+            self.stats["refreshes"] += 1
+        except Exception as e:
+            print(f"⚠️ Background refresh failed, keeping stale copy: {e}")
+
+    def get_or_fetch(self, namespace: str, normalized: str, fetch, ttl: float):
+        """
+        Returns the cached value for (namespace, normalized), calling
+        fetch() (which must return a str) on a miss. Stale entries are
+        returned immediately and refreshed in the background.
+        """
+        key = self.make_key(namespace, normalized)
+        with self._lock:
+            known = key in self._entries
+            if known:
+                self._entries.move_to_end(key)
+        entry = self._read(key) if known else None
+
+        if entry is not None:
+            age = time.time() - entry["stored_at"]
+            if age < ttl:
+                self.stats["hits"] += 1
+                return entry["value"]
+            if age < ttl + self.stale_for:
+                self.stats["stale_hits"] += 1
+                with self._lock:
+                    refreshing = key in self._inflight
+                if not refreshing:
+                    self._refresher.submit(self._refresh, key, fetch)
+                return entry["value"]
+
+        self.stats["misses"] += 1
+        return self._fetch_and_store(key, fetch)
+
+    def metrics(self):
+        with self._lock:
+            entries, total = len(self._entries), self._total_bytes
+        return {**self.stats, "entries": entries, "bytes": total, "max_bytes": self.max_bytes}
+
+
+_page_cache = None
+_page_cache_lock = threading.Lock()
+
+def get_page_cache():
+    """
+    Process-wide cache so every MCPClient shares one index and size budget.
+    """
+    global _page_cache
+    with _page_cache_lock:
+        if _page_cache is None:
+            _page_cache = PageCache()
+        return _page_cache
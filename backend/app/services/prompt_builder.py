@@ -0,0 +1,147 @@
+import re
+import math
+from app.core.config import settings
+
+try:
+    from mistral_common.tokens.tokenizers.mistral import MistralTokenizer
+    _tokenizer = MistralTokenizer.v1().instruct_tokenizer.tokenizer
+except Exception:
+    # mistral-common not installed: fall back to a ~4 chars/token estimate
+    _tokenizer = None
+
+# Max prompt tokens we are willing to pay for, per model
+MODEL_INPUT_BUDGETS = {
+    "open-mixtral-8x7b": 4000,
+    "open-mistral-7b": 3000,
+    "mistral-small-latest": 4000,
+    "mistral-large-latest": 6000,
+}
+
+# The embedding model only sees 512 positions; leave room for tokenizer differences
+EMBED_QUERY_TOKENS = 256
+
+SECTION_HEADINGS = re.compile(
+    r"^\s*(summary|profile|objective|experience|work experience|employment|education|skills|"
+    r"technical skills|projects|certifications|publications|awards|languages|interests)\s*:?\s*$",
+    re.IGNORECASE,
+)
+
+
+def count_tokens(text: str):
+    if not text:
+        return 0
+    if _tokenizer is not None:
+        return len(_tokenizer.encode(text, bos=False, eos=False))
+    return math.ceil(len(text) / 4)
+
+
+def truncate_to_tokens(text: str, max_tokens: int):
+    """
+    Cuts text to fit max_tokens, backing off to the last whole word.
+    """
+    if count_tokens(text) <= max_tokens:
+        return text
+    # Shrink proportionally, then tighten until it fits
+    cut = int(len(text) * max_tokens / count_tokens(text))
+    while cut > 0 and count_tokens(text[:cut]) > max_tokens:
+        cut = int(cut * 0.9)
+    head = text[:cut]
+    return head.rsplit(" ", 1)[0] if " " in head else head
+
+
+def input_budget(model: str):
+    return settings.LLM_INPUT_TOKEN_BUDGET or MODEL_INPUT_BUDGETS.get(model, 4000)
+
+
+def split_sections(text: str, max_section_tokens: int = 400):
+    """
+    Splits a resume on headings (or blank lines when there are none) into
+    sections small enough to be ranked independently.
+    """
+    sections, current = [], []
+    for line in text.splitlines():
+        is_heading = SECTION_HEADINGS.match(line) or (line.isupper() and 0 < len(line.split()) <= 4)
+        if is_heading and current:
+            sections.append("\n".join(current).strip())
+            current = []
+        current.append(line)
+    if current:
+        sections.append("\n".join(current).strip())
+
+    if len(sections) <= 1:
+        sections = [p.strip() for p in re.split(r"\n\s*\n", text)]
+
+    # Long sections (e.g. one giant experience block) are split further
+    result = []
+    for section in filter(None, sections):
+        while count_tokens(section) > max_section_tokens:
+            head = truncate_to_tokens(section, max_section_tokens) or section[: max_section_tokens * 4]
+            result.append(head)
+            section = section[len(head):].strip()
+        if section:
+            result.append(section)
+    return result
+
+
+def _cosine(a: list, b: list):
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+class PromptBuilder:
+    def __init__(self, embed):
+        # embed: callable [texts] -> [vectors], used to rank resume sections in one batch
+        self.embed = embed
+
+    def select_sections(self, text: str, query: str, max_tokens: int):
+        """
+        Keeps the resume sections most similar to the query that fit in
+        max_tokens. The first section (name, contact, summary) is always kept.
+        Sections are returned in their original order.
+        """
+        sections = split_sections(text)
+        if not sections:
+            return ""
+        if count_tokens(text) <= max_tokens:
+            return text
+
+        # One batched forward pass for the query and every candidate section.
+        # A long job description would overflow the embedding model, so it is cut first
+        query_vector, *section_vectors = self.embed(
+            [truncate_to_tokens(query, EMBED_QUERY_TOKENS)] + sections[1:]
+        )
+        scores = {i: _cosine(vector, query_vector) for i, vector in enumerate(section_vectors, start=1)}
+        ranked = sorted(scores, key=scores.get, reverse=True)
+
+        chosen = [0]
+        used = count_tokens(sections[0])
+        for i in ranked:
+            cost = count_tokens(sections[i])
+            if used + cost <= max_tokens:
+                chosen.append(i)
+                used += cost
+
+        selected = "\n\n".join(sections[i] for i in sorted(chosen))
+        return truncate_to_tokens(selected, max_tokens)
+
+    def build(self, template: str, model: str, query: str = "", fixed: dict = None, ranked: dict = None):
+        """
+        Fills template so the whole prompt stays within the model's budget.
+        fixed: fields truncated to their share of the budget (e.g. the job description).
+        ranked: fields trimmed by relevance to `query` with whatever budget is left.
+        """
+        fixed = fixed or {}
+        ranked = ranked or {}
+        budget = input_budget(model) - count_tokens(template.format(**{k: "" for k in {**fixed, **ranked}}))
+
+        values = {}
+        fixed_share = budget // 3 if ranked else budget
+        for name, text in fixed.items():
+            values[name] = truncate_to_tokens(text or "", fixed_share // max(1, len(fixed)))
+
+        remaining = budget - sum(count_tokens(v) for v in values.values())
+        for name, text in ranked.items():
+            values[name] = self.select_sections(text or "", query, remaining // len(ranked))
+
+        return template.format(**values)
@@ -0,0 +1,66 @@
+from sqlalchemy.orm import Session
+from app.db.models import ResumeProfile
+from app.services.weaviate_client import WeaviateClient, get_weaviate_client
+
+
+class ResumeStore:
+    def __init__(self, weaviate_client: WeaviateClient = None):
+        self.weaviate_client = weaviate_client or get_weaviate_client()
+
+    def save(self, db: Session, user_id: int, filename: str, text: str, parsed: dict, embedding: list):
+        """
+        Persists a parsed resume and its embedding once, so later matches can
+        reuse the vector instead of re-running the embedding model.
+        """
+        profile = ResumeProfile(
+            user_id=user_id,
+            filename=filename,
+            raw_text=text,
+            skills=parsed.get("skills", []),
+            experience=parsed.get("experience"),
+            education=parsed.get("education", []),
+            embedding=embedding,
+        )
+        db.add(profile)
+        db.flush()
+
+        try:
+            profile.vector_id = self.weaviate_client.add_resume(user_id, profile.id, embedding)
+        except Exception as e:
+            # Postgres keeps a copy of the vector, so matching still works
+            print(f"⚠️ Could not store resume vector in Weaviate: {e}")
+
+        db.commit()
+        db.refresh(profile)
+        return profile
+
+    def get(self, db: Session, user_id: int, resume_id: int):
+        return (
+            db.query(ResumeProfile)
+            .filter(ResumeProfile.id == resume_id, ResumeProfile.user_id == user_id)
+            .first()
+        )
+
+    def list(self, db: Session, user_id: int):
+        return (
+            db.query(ResumeProfile)
+            .filter(ResumeProfile.user_id == user_id)
+            .order_by(ResumeProfile.created_at.desc())
+            .all()
+        )
+
+    def get_embedding(self, profile: ResumeProfile):
+        if profile.embedding:
+            return profile.embedding
+        if profile.vector_id:
+            return self.weaviate_client.get_resume_vector(profile.user_id, profile.vector_id)
+        return None
+
+    def delete(self, db: Session, profile: ResumeProfile):
+        if profile.vector_id:
+            try:
+                self.weaviate_client.delete_resume(profile.user_id, profile.vector_id)
+            except Exception as e:
+                print(f"⚠️ Could not delete resume vector from Weaviate: {e}")
+        db.delete(profile)
+        db.commit()
@@ -1,11 +1,43 @@
+import re
+import time
+import threading
+from datetime import datetime, timezone
 import weaviate
-from app.core.config import WEAVIATE_URL
+from weaviate.classes.config import Configure, Reconfigure, Property, DataType
+from weaviate.classes.query import Filter, Metrics, MetadataQuery
+from weaviate.util import generate_uuid5
+from app.core.config import settings
+from app.services.dedup import collapse_duplicates
+
+WEAVIATE_URL = settings.WEAVIATE_URL
+# Posting lifecycle: when a job was first stored and when a crawl last saw it
+JOB_TIMESTAMPS = ("ingested_at", "last_seen_at")
+# How long writers that resolved the old alias target get to finish
+ALIAS_SWITCH_GRACE_SECONDS = 2
+
+
+def default_index_options():
+    """
+    Vector index settings from the environment. Pass a modified copy to
+    ensure_schema / migrate_index to try other settings.
+    """
+    return {
+        "index_type": settings.WEAVIATE_INDEX_TYPE,
+        "ef": settings.WEAVIATE_HNSW_EF,
+        "ef_construction": settings.WEAVIATE_HNSW_EF_CONSTRUCTION,
+        "max_connections": settings.WEAVIATE_HNSW_MAX_CONNECTIONS,
+        "quantizer": settings.WEAVIATE_QUANTIZER,
+        "rescore_limit": settings.WEAVIATE_RESCORE_LIMIT,
+        "pq_segments": settings.WEAVIATE_PQ_SEGMENTS,
+    }
 
 
 class WeaviateClient:
-    def __init__(self):
+    def __init__(self, index_options: dict = None):
         # Define the class name used in Weaviate
         self.class_name = "Job"  # You can rename this to "JobPosting" or anything consistent with your schema
+        self.resume_class_name = "Resume"
+        self.index_options = {**default_index_options(), **(index_options or {})}
 
         # Parse host and port
         host = WEAVIATE_URL.replace("http://", "").replace("https://", "")
@@ -28,44 +60,470 @@ class WeaviateClient:
         # Ensure schema exists
         self.ensure_schema()
 
-    def ensure_schema(self):
-        existing_classes = self.client.collections.list_all()  # already a list of strings
-        if self.class_name not in existing_classes:
-            self.client.collections.create(
-                name=self.class_name,
-                vectorizer_config=weaviate.classes.config.Configure.Vectorizer.none(),
-                properties=[
-                    weaviate.classes.config.Property(
-                        name="title",
-                        data_type=weaviate.classes.config.DataType.TEXT
-                    ),
-                    weaviate.classes.config.Property(
-                        name="company",
-                        data_type=weaviate.classes.config.DataType.TEXT
-                    ),
-                    weaviate.classes.config.Property(
-                        name="description",
-                        data_type=weaviate.classes.config.DataType.TEXT
-                    ),
-                ]
+    def _quantizer_config(self, options: dict):
+        quantizer = (options.get("quantizer") or "none").lower()
+        if quantizer == "none":
+            return None
+        if quantizer == "pq":
+            # PQ always rescores from the uncompressed vectors kept on disk
+            return Configure.VectorIndex.Quantizer.pq(segments=options.get("pq_segments") or None)
+        if quantizer == "bq":
+            return Configure.VectorIndex.Quantizer.bq(rescore_limit=options.get("rescore_limit"))
+        if quantizer == "sq":
+            return Configure.VectorIndex.Quantizer.sq(rescore_limit=options.get("rescore_limit"))
+        raise ValueError(f"Unknown quantizer: {quantizer}")
+
+    @staticmethod
+    def _validate_index_options(options: dict):
+        """
+        Rejects combinations Weaviate would refuse, for new and existing collections alike.
+        """
+        quantizer = (options.get("quantizer") or "none").lower()
+        if quantizer not in ("none", "pq", "bq", "sq"):
+            raise ValueError(f"Unknown quantizer: {quantizer}")
+        if options["index_type"] not in ("hnsw", "flat"):
+            raise ValueError(f"Unknown index type: {options['index_type']}")
+        if options["index_type"] == "flat" and quantizer not in ("none", "bq"):
+            raise ValueError("The flat index only supports binary quantization (bq)")
+
+    def build_vector_index_config(self, index_options: dict = None):
+        options = {**self.index_options, **(index_options or {})}
+        self._validate_index_options(options)
+        quantizer = self._quantizer_config(options)
+
+        if options["index_type"] == "flat":
+            return Configure.VectorIndex.flat(quantizer=quantizer)
+
+        if options["index_type"] == "hnsw":
+            return Configure.VectorIndex.hnsw(
+                ef=options["ef"],
+                ef_construction=options["ef_construction"],
+                max_connections=options["max_connections"],
+                quantizer=quantizer,
             )
 
+        raise ValueError(f"Unknown index type: {options['index_type']}")
+
+    def _create_collection(self, name: str, index_options: dict = None):
+        self.client.collections.create(
+            name=name,
+            vectorizer_config=weaviate.classes.config.Configure.Vectorizer.none(),
+            vector_index_config=self.build_vector_index_config(index_options),
+            properties=[
+                weaviate.classes.config.Property(
+                    name="title",
+                    data_type=weaviate.classes.config.DataType.TEXT
+                ),
+                weaviate.classes.config.Property(
+                    name="company",
+                    data_type=weaviate.classes.config.DataType.TEXT
+                ),
+                weaviate.classes.config.Property(
+                    name="description",
+                    data_type=weaviate.classes.config.DataType.TEXT
+                ),
+                *[Property(name=name, data_type=DataType.DATE) for name in JOB_TIMESTAMPS],
+            ]
+        )
+
+    def ensure_schema(self, index_options: dict = None):
+        existing_classes = self.client.collections.list_all()
+        if self.active_collection() is None:
+            # "Job" is an alias onto a versioned collection, so re-indexing can swap it atomically
+            target = f"{self.class_name}_v1"
+            if target not in existing_classes:
+                self._create_collection(target, index_options)
+            self.client.alias.create(alias_name=self.class_name, target_collection=target)
+        else:
+            self._ensure_job_timestamps()
+        if self.resume_class_name not in existing_classes:
+            self._create_resume_collection()
+
+    def active_collection(self):
+        """
+        Physical collection currently serving "Job": the alias target, or
+        "Job" itself for collections created before aliases were used.
+        None if neither exists.
+        """
+        alias = self.client.alias.get(alias_name=self.class_name)
+        if alias is not None:
+            return alias.collection
+        if self.class_name in self.client.collections.list_all():
+            return self.class_name
+        return None
+
+    def _next_version_name(self):
+        pattern = re.compile(rf"^{self.class_name}_v(\d+)$")
+        versions = [int(m.group(1)) for m in map(pattern.match, self.client.collections.list_all()) if m]
+        return f"{self.class_name}_v{max(versions, default=0) + 1}"
+
+    def _ensure_job_timestamps(self):
+        """
+        Adds the lifecycle properties to Job collections created before they
+        existed. Old objects get values from backfill_timestamps().
+        """
+        collection = self.client.collections.get(self.active_collection())
+        existing = {p.name for p in collection.config.get().properties}
+        for name in JOB_TIMESTAMPS:
+            if name not in existing:
+                collection.config.add_property(Property(name=name, data_type=DataType.DATE))
+
+    def _create_resume_collection(self):
+        # One tenant per user keeps each user's resumes in their own shard
+        self.client.collections.create(
+            name=self.resume_class_name,
+            vectorizer_config=weaviate.classes.config.Configure.Vectorizer.none(),
+            vector_index_config=Configure.VectorIndex.flat(),
+            multi_tenancy_config=Configure.multi_tenancy(enabled=True, auto_tenant_creation=True),
+            properties=[
+                weaviate.classes.config.Property(
+                    name="resume_id",
+                    data_type=weaviate.classes.config.DataType.INT
+                ),
+                weaviate.classes.config.Property(
+                    name="user_id",
+                    data_type=weaviate.classes.config.DataType.INT
+                ),
+            ]
+        )
+
+    def _needs_rebuild(self, options: dict):
+        """
+        Index type, efConstruction and maxConnections are fixed at creation time;
+        ef and enabling compression can be changed in place.
+        """
+        current = self.client.collections.get(self.active_collection()).config.get().vector_index_config
+        current_type = current.vector_index_type()
+        if current_type != options["index_type"]:
+            return True
+        if current_type == "hnsw" and (
+            current.ef_construction != options["ef_construction"]
+            or current.max_connections != options["max_connections"]
+        ):
+            return True
+
+        current_quantizer = type(current.quantizer).__name__.lower() if current.quantizer else "none"
+        wanted = (options.get("quantizer") or "none").lower()
+        # Compression can be switched on, but never off or to another kind
+        return current_quantizer != "none" and not current_quantizer.startswith(f"_{wanted}")
+
+    def _reconfigure_in_place(self, options: dict):
+        self._validate_index_options(options)
+        quantizer = (options.get("quantizer") or "none").lower()
+        quantizer_update = None
+        if quantizer == "pq":
+            quantizer_update = Reconfigure.VectorIndex.Quantizer.pq()
+        elif quantizer == "bq":
+            quantizer_update = Reconfigure.VectorIndex.Quantizer.bq(rescore_limit=options.get("rescore_limit"))
+        elif quantizer == "sq":
+            quantizer_update = Reconfigure.VectorIndex.Quantizer.sq(rescore_limit=options.get("rescore_limit"))
+
+        if options["index_type"] == "flat":
+            vector_index_config = Reconfigure.VectorIndex.flat(quantizer=quantizer_update)
+        else:
+            vector_index_config = Reconfigure.VectorIndex.hnsw(ef=options["ef"], quantizer=quantizer_update)
+
+        self.client.collections.get(self.active_collection()).config.update(vector_index_config=vector_index_config)
+
+    def copy_collection(self, source: str, target: str, batch_size: int = 200):
+        """
+        Streams every object (with its vector) from one collection into another.
+        Returns the number of objects copied.
+        """
+        source_collection = self.client.collections.get(source)
+        target_collection = self.client.collections.get(target)
+        copied = 0
+        with target_collection.batch.fixed_size(batch_size=batch_size) as batch:
+            for obj in source_collection.iterator(include_vector=True):
+                batch.add_object(
+                    properties=obj.properties,
+                    vector=obj.vector["default"],
+                    uuid=obj.uuid,
+                )
+                copied += 1
+        return copied
+
+    def _copy_changed_since(self, source: str, target: str, since: datetime, batch_size: int = 200):
+        """
+        Copies objects added or re-seen after `since`, i.e. writes that
+        landed on the old collection while it was being copied.
+        """
+        source_collection = self.client.collections.get(source)
+        target_collection = self.client.collections.get(target)
+        # The cursor can't be filtered and offset paging stops at QUERY_MAXIMUM_RESULTS,
+        # so scan timestamps only, then fetch the changed objects by id
+        changed = [
+            obj.uuid for obj in source_collection.iterator(return_properties=["last_seen_at"])
+            if obj.properties.get("last_seen_at") is None or obj.properties["last_seen_at"] >= since
+        ]
+        for start in range(0, len(changed), batch_size):
+            ids = changed[start:start + batch_size]
+            page = source_collection.query.fetch_objects(
+                filters=Filter.by_id().contains_any(ids), limit=len(ids), include_vector=True
+            ).objects
+            with target_collection.batch.fixed_size(batch_size=batch_size) as batch:
+                for obj in page:
+                    batch.add_object(properties=obj.properties, vector=obj.vector["default"], uuid=obj.uuid)
+        return len(changed)
+
+    def migrate_index(self, index_options: dict = None, batch_size: int = 200, force_rebuild: bool = False):
+        """
+        Applies new index settings to the Job collection.
+        Mutable settings are updated in place. Anything else builds a new
+        versioned collection, copies every object into it and then points
+        the "Job" alias at it, so searches keep working throughout.
+        Writes made during the copy are copied again after the switch.
+        """
+        options = {**self.index_options, **(index_options or {})}
+        source = self.active_collection()
+        if source is None:
+            self.index_options = options
+            self.ensure_schema(options)
+            return {"action": "created", "objects": 0, "collection": self.active_collection()}
+
+        if not force_rebuild and not self._needs_rebuild(options):
+            self._reconfigure_in_place(options)
+            self.index_options = options
+            return {"action": "updated", "objects": self.count(), "collection": source}
+
+        target = self._next_version_name()
+        print(f"🔁 Re-indexing '{source}' into '{target}'...")
+        self._create_collection(target, options)
+        copy_started = datetime.now(timezone.utc)
+        self.copy_collection(source, target, batch_size)
+
+        if source == self.class_name:
+            # Pre-alias layout: the alias can only take the name once the old
+            # collection is gone, so catch up first and keep the gap to one call
+            self._copy_changed_since(source, target, copy_started, batch_size)
+            self.client.collections.delete(source)
+            self.client.alias.create(alias_name=self.class_name, target_collection=target)
+        else:
+            self.client.alias.update(alias_name=self.class_name, new_target_collection=target)
+            # Writers that resolved the alias just before the switch may still land on
+            # the old collection, so catch up twice with a short grace period
+            self._copy_changed_since(source, target, copy_started, batch_size)
+            time.sleep(ALIAS_SWITCH_GRACE_SECONDS)
+            self._copy_changed_since(source, target, copy_started, batch_size)
+            self.client.collections.delete(source)
+
+        self.index_options = options
+        total = self.count()
+        print(f"✅ Re-indexed {total} objects into '{target}' (alias '{self.class_name}').")
+        return {"action": "rebuilt", "objects": total, "collection": target}
+
+    def _resume_tenant(self, user_id: int):
+        return self.client.collections.get(self.resume_class_name).with_tenant(f"user-{user_id}")
+
+    def add_resume(self, user_id: int, resume_id: int, embedding: list):
+        """
+        Stores a resume vector under the user's tenant. Returns the object id.
+        """
+        vector_id = generate_uuid5(f"resume-{resume_id}")
+        self._resume_tenant(user_id).data.insert(
+            {"resume_id": resume_id, "user_id": user_id},
+            vector=embedding,
+            uuid=vector_id
+        )
+        return str(vector_id)
+
+    def get_resume_vector(self, user_id: int, vector_id: str):
+        obj = self._resume_tenant(user_id).query.fetch_object_by_id(vector_id, include_vector=True)
+        return obj.vector["default"] if obj else None
+
+    def delete_resume(self, user_id: int, vector_id: str):
+        self._resume_tenant(user_id).data.delete_by_id(vector_id)
+
+    def nearest_jobs(self, embedding: list, limit: int):
+        """
+        Closest stored jobs to a vector, as feed candidates with a cosine
+        similarity score: [{"id", "title", "company", "score"}, ...]
+        """
+        results = self.client.collections.get(self.class_name).query.near_vector(
+            near_vector=embedding,
+            limit=limit,
+            return_properties=["title", "company"],
+            return_metadata=MetadataQuery(distance=True)
+        )
+        return [
+            {
+                "id": str(obj.uuid),
+                "title": obj.properties.get("title", ""),
+                "company": obj.properties.get("company", ""),
+                "score": 1.0 - obj.metadata.distance,
+            }
+            for obj in results.objects
+        ]
+
+    def count(self, name: str = None):
+        collection = self.client.collections.get(name or self.class_name)
+        return collection.aggregate.over_all(total_count=True).total_count
+
     def add_job(self, job_title: str, company: str, description: str, embedding: list):
         job_collection = self.client.collections.get(self.class_name)
-        job_collection.data.insert(
+        now = datetime.now(timezone.utc)
+        job_id = job_collection.data.insert(
             {
                 "title": job_title,
                 "company": company,
-                "description": description
+                "description": description,
+                "ingested_at": now,
+                "last_seen_at": now
             },
             vector=embedding
         )
+        return str(job_id)
+
+    def add_jobs(self, jobs: list, batch_size: int = 200):
+        """
+        Bulk insert for offline loads. Each job is a dict with title, company,
+        description, embedding and optionally uuid / ingested_at. Re-inserting
+        the same uuid overwrites, so an interrupted load can simply be re-run.
+        Returns (inserted ids, number of failed objects).
+        """
+        job_collection = self.client.collections.get(self.class_name)
+        now = datetime.now(timezone.utc)
+        ids = []
+        with job_collection.batch.fixed_size(batch_size=batch_size) as batch:
+            for job in jobs:
+                job_id = batch.add_object(
+                    properties={
+                        "title": job["title"],
+                        "company": job["company"],
+                        "description": job["description"],
+                        "ingested_at": job.get("ingested_at") or now,
+                        "last_seen_at": now,
+                    },
+                    vector=job["embedding"],
+                    uuid=job.get("uuid"),
+                )
+                ids.append(str(job_id))
+
+        failed = {str(obj.object_.uuid) for obj in job_collection.batch.failed_objects}
+        return [job_id for job_id in ids if job_id not in failed], len(failed)
 
-    def query_similar_jobs(self, embedding: list, top_k: int = 10):
+    # --- Posting lifecycle ---
+    def touch_jobs(self, job_ids: list):
+        """
+        Marks postings as seen again (e.g. a crawl found a duplicate of
+        them), which pushes back their expiry.
+        """
+        job_collection = self.client.collections.get(self.class_name)
+        now = datetime.now(timezone.utc)
+        for job_id in job_ids:
+            try:
+                job_collection.data.update(uuid=job_id, properties={"last_seen_at": now})
+            except Exception as e:
+                print(f"⚠️ Could not refresh job {job_id}: {e}")
+
+    def expired_job_ids(self, cutoff: datetime, limit: int = 500):
+        job_collection = self.client.collections.get(self.class_name)
+        results = job_collection.query.fetch_objects(
+            filters=Filter.by_property("last_seen_at").less_than(cutoff),
+            limit=limit,
+            return_properties=[]
+        )
+        return [str(obj.uuid) for obj in results.objects]
+
+    def job_ids(self):
+        """
+        Ids of every stored job posting.
+        """
+        job_collection = self.client.collections.get(self.class_name)
+        return {str(obj.uuid) for obj in job_collection.iterator(return_properties=[])}
+
+    def delete_jobs(self, job_ids: list):
+        """
+        Batch-deletes postings by id. Returns the number deleted.
+        """
+        if not job_ids:
+            return 0
+        job_collection = self.client.collections.get(self.class_name)
+        result = job_collection.data.delete_many(where=Filter.by_id().contains_any(job_ids))
+        return result.successful
+
+    def count_missing_timestamps(self):
+        # Objects stored before the lifecycle properties existed have no last_seen_at
+        dated = self.client.collections.get(self.class_name).aggregate.over_all(
+            total_count=True,
+            filters=Filter.by_property("last_seen_at").greater_than(datetime(1970, 1, 1, tzinfo=timezone.utc))
+        ).total_count
+        return self.count() - dated
+
+    def backfill_timestamps(self, batch_size: int = 200):
+        """
+        Gives undated (pre-lifecycle) postings a fresh timestamp, so they
+        get a full TTL rather than being swept at once. Returns the number updated.
+        """
+        job_collection = self.client.collections.get(self.class_name)
+        now = datetime.now(timezone.utc)
+        updated = 0
+        # Re-inserting with the same uuid replaces the object in place
+        with job_collection.batch.fixed_size(batch_size=batch_size) as batch:
+            for obj in job_collection.iterator(include_vector=True):
+                if obj.properties.get("last_seen_at") is not None:
+                    continue
+                batch.add_object(
+                    properties={**obj.properties, "ingested_at": now, "last_seen_at": now},
+                    vector=obj.vector["default"],
+                    uuid=obj.uuid,
+                )
+                updated += 1
+        return updated
+
+    def corpus_stats(self, cutoff: datetime = None):
+        job_collection = self.client.collections.get(self.class_name)
+        totals = job_collection.aggregate.over_all(
+            total_count=True,
+            return_metrics=[
+                Metrics("ingested_at").date_(minimum=True, maximum=True),
+                Metrics("last_seen_at").date_(minimum=True),
+            ]
+        )
+        stats = {
+            "jobs": totals.total_count,
+            "oldest_ingested_at": totals.properties["ingested_at"].minimum,
+            "newest_ingested_at": totals.properties["ingested_at"].maximum,
+            "least_recently_seen_at": totals.properties["last_seen_at"].minimum,
+            "index_options": self.index_options,
+        }
+        if cutoff is not None:
+            stats["expired_pending"] = job_collection.aggregate.over_all(
+                total_count=True,
+                filters=Filter.by_property("last_seen_at").less_than(cutoff)
+            ).total_count
+        return stats
+
+    def query_similar_jobs(self, embedding: list, top_k: int = 10, collapse: bool = False):
+        """
+        collapse=True over-fetches and drops near-duplicate postings so
+        copies of one role don't crowd real alternatives out of the top_k.
+        """
         job_collection = self.client.collections.get(self.class_name)
         results = job_collection.query.near_vector(
             near_vector=embedding,
-            limit=top_k,
+            limit=top_k * 2 if collapse else top_k,
             return_properties=["title", "company", "description"]
         )
-        return results.objects
+        if not collapse:
+            return results.objects
+        unique = collapse_duplicates(
+            results.objects,
+            lambda o: f"{o.properties['title']} {o.properties['company']} {o.properties['description']}"
+        )
+        return unique[:top_k]
+
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_weaviate_client():
+    """
+    Process-wide client, so routers, agents and stores share one
+    connection instead of each opening their own.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = WeaviateClient()
+        return _client
@@ -0,0 +1,122 @@
+import time
+import threading
+import pytest
+from app.core.admission import AdmissionController, AdmissionRejected, ResourceQueue, TokenBucket, WaitLimit, INTERACTIVE, BULK
+
+
+def test_token_bucket_reports_wait():
+    bucket = TokenBucket(rate=1.0, burst=2)
+    assert bucket.take() == 0
+    assert bucket.take() == 0
+    assert 0 < bucket.take() <= 1.0
+
+
+def test_user_rate_limit_returns_429_with_retry_after():
+    controller = AdmissionController()
+    controller.enabled = True
+    bucket_burst = int(controller._user_bucket("user:1", "llm").burst)
+
+    for _ in range(bucket_burst):
+        with controller.admit("llm", "user:1"):
+            pass
+    with pytest.raises(AdmissionRejected) as exc:
+        with controller.admit("llm", "user:1"):
+            pass
+    assert exc.value.status_code == 429
+    assert int(exc.value.headers["Retry-After"]) >= 1
+
+    # Other users have their own bucket
+    with controller.admit("llm", "user:2"):
+        pass
+
+
+def test_interactive_waiters_run_before_bulk():
+    queue = ResourceQueue("llm", slots=1, max_queue=10, max_wait=5)
+    held = queue.acquire()
+    order = []
+
+    def worker(name, priority):
+        acquired_at = queue.acquire(priority)
+        order.append(name)
+        queue.release(acquired_at)
+
+    threads = [threading.Thread(target=worker, args=("bulk", BULK))]
+    threads[0].start()
+    time.sleep(0.05)
+    threads.append(threading.Thread(target=worker, args=("interactive", INTERACTIVE)))
+    threads[1].start()
+    time.sleep(0.05)
+
+    queue.release(held)
+    for t in threads:
+        t.join()
+    assert order == ["interactive", "bulk"]
+
+
+def test_full_queue_sheds_bulk_for_interactive():
+    queue = ResourceQueue("llm", slots=1, max_queue=1, max_wait=5)
+    held = queue.acquire()
+    errors = []
+
+    def bulk():
+        try:
+            queue.acquire(BULK)
+        except AdmissionRejected as e:
+            errors.append(e.reason)
+
+    t = threading.Thread(target=bulk)
+    t.start()
+    time.sleep(0.05)
+
+    # A second bulk request is turned away, an interactive one displaces the waiter
+    with pytest.raises(AdmissionRejected):
+        queue.acquire(BULK)
+    interactive = threading.Thread(target=lambda: queue.release(queue.acquire(INTERACTIVE)))
+    interactive.start()
+    t.join()
+    queue.release(held)
+    interactive.join()
+
+    assert len(errors) == 1
+    snapshot = queue.snapshot()
+    assert snapshot["rejected"]["shed"] == 1
+    assert snapshot["rejected"]["queue_full"] == 1
+    assert snapshot["in_use"] == 0
+
+
+def test_cost_over_burst_is_rejected_not_clamped():
+    controller = AdmissionController()
+    controller.enabled = True
+    burst = controller.max_cost("llm", "user:3")
+
+    with pytest.raises(AdmissionRejected) as exc:
+        controller.charge("llm", "user:3", cost=burst * 20)
+    assert exc.value.status_code == 429
+    assert "over the limit" in exc.value.reason
+
+    # Nothing was taken, so a batch that fits still goes through
+    controller.charge("llm", "user:3", cost=burst)
+    with pytest.raises(AdmissionRejected):
+        controller.charge("llm", "user:3", cost=1)
+
+
+def test_wait_limit_is_shared_between_queues():
+    limit = WaitLimit(1)
+    llm = ResourceQueue("llm", slots=1, max_queue=10, max_wait=5, wait_limit=limit)
+    browser = ResourceQueue("browser", slots=1, max_queue=10, max_wait=5, wait_limit=limit)
+    held = [llm.acquire(), browser.acquire()]
+
+    waiter = threading.Thread(target=lambda: llm.release(llm.acquire(BULK)))
+    waiter.start()
+    time.sleep(0.05)
+
+    # One thread is already blocked, so the other queue turns callers away at once
+    with pytest.raises(AdmissionRejected):
+        browser.acquire()
+    assert limit.waiting == 1
+
+    llm.release(held[0])
+    waiter.join()
+    browser.release(held[1])
+    assert limit.waiting == 0
+    assert llm.snapshot()["in_use"] == 0 and browser.snapshot()["in_use"] == 0
@@ -0,0 +1,51 @@
+from datetime import datetime, timedelta
+from sqlalchemy.orm import sessionmaker
+from app.db.models import SyncedEvent
+from app.services import assistant_sync
+from app.services.assistant_sync import AssistantSync
+
+
+class CalendarTool:
+    """
+    Answers list_upcoming_events with whatever lines the test sets.
+    """
+    def __init__(self):
+        self.lines = []
+
+    def call(self, tool_name, arguments):
+        return "\n".join(f"- {start}: {summary}" for start, summary in self.lines)
+
+
+def _iso(value: datetime):
+    return value.replace(microsecond=0).isoformat()
+
+
+def test_sync_events_keeps_ongoing_and_all_day_events(db, monkeypatch):
+    monkeypatch.setattr(assistant_sync, "SessionLocal", sessionmaker(bind=db.get_bind()))
+    calendar = CalendarTool()
+    sync = AssistantSync(calendar)
+
+    now = datetime.utcnow()
+    today = now.strftime("%Y-%m-%d")
+    calendar.lines = [
+        # Started earlier today (clamped so the test also holds just after midnight)
+        (_iso(max(now - timedelta(minutes=30), now.replace(hour=0, minute=0, second=0))), "Interview with Acme (in progress)"),
+        (today, "Career fair (all day)"),
+        (_iso(now + timedelta(days=1)), "Recruiter call"),
+    ]
+
+    assert sync.sync_events() == 3
+    # Re-reading the same window must not collide with the cached rows
+    assert sync.sync_events() == 3
+    assert db.query(SyncedEvent).count() == 3
+    # Ongoing and all-day events are still served, earlier days are not
+    db.add(SyncedEvent(event_key="old", summary="Yesterday's call", start=now - timedelta(days=1, hours=1)))
+    db.commit()
+    assert sorted(e["summary"] for e in sync.upcoming_events()) == [
+        "Career fair (all day)", "Interview with Acme (in progress)", "Recruiter call",
+    ]
+
+    # Events dropped from the calendar disappear on the next sync
+    calendar.lines = calendar.lines[:1]
+    assert sync.sync_events() == 1
+    assert [e["summary"] for e in sync.upcoming_events()] == ["Interview with Acme (in progress)"]
@@ -0,0 +1,45 @@
+import torch
+from app.services.huggingface_client import embed_batch
+
+
+class WordTokenizer:
+    """
+    One id per word; pads with 0 like a real tokenizer.
+    """
+    def __call__(self, texts, padding=True, truncation=True, return_tensors="pt"):
+        ids = [[len(word) for word in text.split()] for text in texts]
+        width = max(len(row) for row in ids)
+        return {
+            "input_ids": torch.tensor([row + [0] * (width - len(row)) for row in ids]),
+            "attention_mask": torch.tensor([[1] * len(row) + [0] * (width - len(row)) for row in ids]),
+        }
+
+
+class LookupEncoder:
+    class Output:
+        def __init__(self, hidden):
+            self.last_hidden_state = hidden
+
+    def __call__(self, input_ids, attention_mask):
+        # Padding positions get a large vector that must not reach the mean
+        hidden = torch.stack([input_ids.float(), torch.ones_like(input_ids).float()], dim=-1)
+        hidden[attention_mask == 0] = 100.0
+        return self.Output(hidden)
+
+
+def test_embed_batch_ignores_padding():
+    model = (WordTokenizer(), LookupEncoder())
+
+    alone = embed_batch(model, ["ab abcd"])
+    padded = embed_batch(model, ["ab abcd", "a bb ccc dddd eeeee"])
+
+    assert alone[0] == [3.0, 1.0]
+    assert padded[0] == alone[0]
+    assert padded[1] == [3.0, 1.0]
+
+
+def test_embed_batch_splits_large_inputs():
+    model = (WordTokenizer(), LookupEncoder())
+    texts = [" ".join(["x" * (i % 5 + 1)] * (i % 7 + 1)) for i in range(10)]
+
+    assert embed_batch(model, texts, batch_size=3) == embed_batch(model, texts)
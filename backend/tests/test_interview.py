@@ -0,0 +1,182 @@
+import pytest
+from app.db.models import User, ChatSession, ChatMessage
+from app.services import chat_context, prompt_builder
+from app.services.chat_context import ChatContextManager, MESSAGE_OVERHEAD_TOKENS
+
+def test_interview_session_requires_login(client):
+    response = client.post("/api/v1/interview/sessions", json={"title": "Backend Engineer"})
+
+    assert response.status_code == 401
+
+
+def test_interview_message_requires_login(client):
+    response = client.post("/api/v1/interview/sessions/1/messages", json={"content": "Hello"})
+
+    assert response.status_code == 401
+
+
+def _words(text: str):
+    return len(text.split()) if text else 0
+
+
+class StubSummarizer:
+    """
+    Stands in for HuggingFaceClient: records each summary prompt and
+    answers with a short numbered summary.
+    """
+    def __init__(self):
+        self.prompts = []
+        self.gateway = self
+
+    def route(self, task, model=None):
+        return "open-mistral-7b"
+
+    def chat_completion(self, messages, model=None, task="chat"):
+        self.prompts.append(messages[0]["content"])
+        return f"summary {len(self.prompts)}"
+
+
+@pytest.fixture
+def context(monkeypatch):
+    # Whitespace tokens keep budgets easy to reason about
+    monkeypatch.setattr(chat_context, "count_tokens", _words)
+    monkeypatch.setattr(prompt_builder, "count_tokens", _words)
+    manager = ChatContextManager(StubSummarizer())
+    manager.budget = 100
+    manager.window_tokens = 60
+    manager.window_messages = 4
+    manager.summary_tokens = 20
+    return manager
+
+
+def _session(db, turns: int, words: int = 10, summary: str = None):
+    user = User(email=f"chat-{turns}-{words}@example.com")
+    db.add(user)
+    db.flush()
+    session = ChatSession(user_id=user.id, title="Backend Engineer", summary=summary)
+    db.add(session)
+    db.flush()
+    messages = [
+        ChatMessage(
+            session_id=session.id,
+            role="user" if i % 2 == 0 else "assistant",
+            content=" ".join([f"turn{i}"] * words),
+            token_count=words,
+        )
+        for i in range(turns)
+    ]
+    db.add_all(messages)
+    db.commit()
+    return session, messages
+
+
+def test_build_keeps_summary_and_newest_turns_within_budget(db, context):
+    session, messages = _session(db, turns=10, summary="Candidate knows Python.")
+
+    prompt = context.build(db, session, "You are an interviewer.", "open-mistral-7b")
+
+    assert prompt[0]["role"] == "system"
+    assert "Candidate knows Python." in prompt[0]["content"]
+    total = sum(_words(m["content"]) + MESSAGE_OVERHEAD_TOKENS for m in prompt)
+    assert total <= context.budget
+    # The newest turns, in order, opening with a user turn
+    turns = [m["content"] for m in prompt[1:]]
+    assert turns == [m.content for m in messages[-len(turns):]]
+    assert prompt[1]["role"] == "user"
+    assert turns[-1] == messages[-1].content
+
+
+def test_build_truncates_an_oversized_newest_message(db, context):
+    session, messages = _session(db, turns=1, words=500)
+
+    prompt = context.build(db, session, "You are an interviewer.", "open-mistral-7b")
+
+    assert len(prompt) == 2
+    assert 0 < _words(prompt[1]["content"]) < 100
+
+
+def test_fold_summarizes_older_turns_and_advances(db, context):
+    session, messages = _session(db, turns=6)
+
+    assert context.fold(db, session) is True
+    # Half a window stays verbatim
+    assert session.summarized_through == messages[-3].id
+    assert session.summary == "summary 1"
+    assert "turn0" in context.hf_client.prompts[0]
+    assert "turn4" not in context.hf_client.prompts[0]
+
+    # What is left fits, so nothing more to do
+    assert context.fold(db, session) is False
+
+
+def test_fold_leaves_short_sessions_alone(db, context):
+    session, _ = _session(db, turns=3)
+
+    assert context.fold(db, session) is False
+    assert not session.summarized_through
+    assert context.hf_client.prompts == []
+
+
+def test_fold_catches_up_on_a_long_backlog(db, context):
+    session, messages = _session(db, turns=120)
+
+    assert context.fold(db, session) is True
+    assert session.summarized_through == messages[-3].id
+    # Folded oldest first over several calls, each building on the last summary
+    prompts = context.hf_client.prompts
+    assert len(prompts) > 1
+    assert "turn0" in prompts[0]
+    assert all(f"summary {i}" in prompt for i, prompt in enumerate(prompts[1:], start=1))
+    assert any("turn117" in prompt for prompt in prompts)
+    assert context.fold(db, session) is False
+
+
+class FlakySummarizer(StubSummarizer):
+    """
+    Fails the first `failures` summary calls, like a provider outage.
+    """
+    def __init__(self, failures: int):
+        super().__init__()
+        self.failures = failures
+
+    def chat_completion(self, messages, model=None, task="chat"):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("provider unavailable")
+        return super().chat_completion(messages, model, task)
+
+
+def _add_turns(db, session, start: int, count: int, words: int = 10):
+    messages = [
+        ChatMessage(
+            session_id=session.id,
+            role="user" if i % 2 == 0 else "assistant",
+            content=" ".join([f"turn{i}"] * words),
+            token_count=words,
+        )
+        for i in range(start, start + count)
+    ]
+    db.add_all(messages)
+    db.commit()
+    return messages
+
+
+def test_failed_fold_is_retried_on_the_next_turn(db, context):
+    context.hf_client = FlakySummarizer(failures=2)
+    session, messages = _session(db, turns=6)
+
+    assert context.fold(db, session) is False
+    assert not session.summarized_through and not session.summary
+
+    # Still failing a turn later; the backlog keeps growing
+    messages += _add_turns(db, session, start=6, count=2)
+    assert context.fold(db, session) is False
+    assert not session.summarized_through
+
+    # Once the model is back the whole backlog is folded, oldest turn included
+    messages += _add_turns(db, session, start=8, count=2)
+    assert context.fold(db, session) is True
+    assert session.summarized_through == messages[-3].id
+    assert "turn0" in context.hf_client.prompts[0]
+    assert any("turn7" in prompt for prompt in context.hf_client.prompts)
+    assert context.fold(db, session) is False
@@ -1,3 +1,13 @@
+import asyncio
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.orm import sessionmaker
+from app.core.config import settings
+from app.core.utils import get_admin_user
+from app.db.models import User, JobFingerprint, MatchFeedItem
+from app.services import dedup, job_lifecycle
+from app.services.job_lifecycle import JobLifecycle
+
 def test_add_job(client):
     job_data = {
         "title": "Software Engineer Test",
@@ -7,7 +17,9 @@ def test_add_job(client):
     }
     response = client.post("/api/v1/jobs/add-job", json=job_data)
     assert response.status_code == 200
-    assert response.json()["status"] == "success"
+    # Re-running against the same store collapses into the first copy
+    assert response.json()["status"] in ("success", "duplicate")
+    assert "job_id" in response.json()
 
 def test_search_jobs(client):
     search_data = {
@@ -16,4 +28,109 @@ def test_search_jobs(client):
     }
     response = client.post("/api/v1/jobs/search-jobs", json=search_data)
     assert response.status_code == 200
-    assert "results" in response.json()
\ No newline at end of file
+    assert "results" in response.json()
+
+def test_search_jobs_collapse_duplicates(client):
+    search_data = {
+        "query_text": "python developer",
+        "top_k": 5,
+        "collapse_duplicates": True
+    }
+    response = client.post("/api/v1/jobs/search-jobs", json=search_data)
+    assert response.status_code == 200
+    assert len(response.json()["results"]) <= 5
+
+
+def test_maintenance_requires_login(client):
+    assert client.post("/api/v1/jobs/maintenance/sweep").status_code == 401
+    assert client.post("/api/v1/jobs/maintenance/compact").status_code == 401
+
+
+def test_maintenance_requires_admin(monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_EMAILS", "ops@example.com, Root@Example.com")
+
+    assert asyncio.run(get_admin_user(User(email="root@example.com"))).email == "root@example.com"
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(get_admin_user(User(email="someone@example.com")))
+    assert exc.value.status_code == 403
+
+
+class SurvivingJobs:
+    def __init__(self, job_ids):
+        self.ids = set(job_ids)
+
+    def job_ids(self):
+        return set(self.ids)
+
+
+class CompactedJobs(SurvivingJobs):
+    """
+    Index whose contents change from `before` to `after` during the rebuild.
+    """
+    def __init__(self, before, after):
+        super().__init__(before)
+        self.after = set(after)
+
+    def migrate_index(self, batch_size=200, force_rebuild=False):
+        self.ids = self.after
+        return {"copied": len(self.after)}
+
+
+def test_compaction_prunes_only_rows_of_jobs_lost_in_the_rebuild(db, monkeypatch):
+    local_session = sessionmaker(bind=db.get_bind())
+    monkeypatch.setattr(job_lifecycle, "SessionLocal", local_session)
+    monkeypatch.setattr(dedup, "SessionLocal", local_session)
+
+    user = User(email="prune@example.com")
+    db.add(user)
+    db.flush()
+    db.add_all([
+        JobFingerprint(job_id="kept", signature=b""),
+        JobFingerprint(job_id="gone", signature=b""),
+        # Added while the compaction ran, so absent from the ids read before it
+        JobFingerprint(job_id="new", signature=b""),
+        # Never made it into the index; not this compaction's business
+        JobFingerprint(job_id="unindexed", signature=b""),
+        MatchFeedItem(user_id=user.id, job_id="kept", score=0.9),
+        MatchFeedItem(user_id=user.id, job_id="feed-only", score=0.8),
+    ])
+    db.commit()
+
+    lifecycle = JobLifecycle(weaviate_client=CompactedJobs(before=["kept", "gone", "feed-only"], after=["kept"]))
+
+    assert lifecycle.compact()["pruned"] == 2
+    db.expire_all()
+    assert {row.job_id for row in db.query(JobFingerprint)} == {"kept", "new", "unindexed"}
+    assert [row.job_id for row in db.query(MatchFeedItem)] == ["kept"]
+
+
+class TouchedJobs(SurvivingJobs):
+    def __init__(self):
+        super().__init__([])
+        self.touched = []
+
+    def touch_jobs(self, job_ids):
+        self.touched.extend(job_ids)
+
+
+def test_record_duplicates_counts_copies_and_refreshes_canonical(db, monkeypatch):
+    monkeypatch.setattr(dedup, "SessionLocal", sessionmaker(bind=db.get_bind()))
+    db.add_all([JobFingerprint(job_id="a", signature=b""), JobFingerprint(job_id="b", signature=b"")])
+    db.commit()
+    store = TouchedJobs()
+
+    JobLifecycle(weaviate_client=store).record_duplicates(["a", "b", "a"])
+
+    db.expire_all()
+    assert {row.job_id: row.duplicate_count for row in db.query(JobFingerprint)} == {"a": 2, "b": 1}
+    assert store.touched == ["a", "b"]
+
+
+def test_index_options_reject_compression_flat_cannot_use():
+    from app.services.weaviate_client import WeaviateClient
+
+    WeaviateClient._validate_index_options({"index_type": "flat", "quantizer": "bq"})
+    WeaviateClient._validate_index_options({"index_type": "hnsw", "quantizer": "pq"})
+    for quantizer in ("pq", "sq"):
+        with pytest.raises(ValueError):
+            WeaviateClient._validate_index_options({"index_type": "flat", "quantizer": quantizer})
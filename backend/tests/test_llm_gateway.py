@@ -0,0 +1,126 @@
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from mistralai import Mistral
+from app.services.llm_gateway import LLMGateway, LLMUnavailableError, LLMSaturatedError
+
+
+class StubMistralHandler(BaseHTTPRequestHandler):
+    # Per-model scripted status codes, consumed one per request (then 200)
+    script = {}
+    calls = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        model = body["model"]
+        StubMistralHandler.calls.append(model)
+        queue = StubMistralHandler.script.get(model, [])
+        status = queue.pop(0) if queue else 200
+        if status == "slow":
+            time.sleep(1)
+            status = 200
+
+        if status != 200:
+            payload = {"message": "stub error"}
+        else:
+            payload = {
+                "id": "stub",
+                "object": "chat.completion",
+                "model": model,
+                "created": 0,
+                "usage": {"prompt_tokens": 11, "completion_tokens": 7, "total_tokens": 18},
+                "choices": [{
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": f"hello from {model}"},
+                }],
+            }
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@pytest.fixture
+def gateway():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubMistralHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    StubMistralHandler.script = {}
+    StubMistralHandler.calls = []
+
+    client = Mistral(api_key="test", server_url=f"http://127.0.0.1:{server.server_port}")
+    gw = LLMGateway(client=client)
+    gw.routes = {"chat": ["big-model", "small-model"], "extract_skills": ["small-model"]}
+    gw.backoff_base = 0.01
+    gw.backoff_max = 0.02
+    yield gw
+    server.shutdown()
+
+
+def test_gateway_retries_rate_limits(gateway):
+    StubMistralHandler.script = {"big-model": [429, 503]}
+
+    response = gateway.complete("chat", [{"role": "user", "content": "hi"}])
+
+    assert response.choices[0].message.content == "hello from big-model"
+    assert gateway.metrics()["models"]["big-model"]["retries"] == 2
+
+
+def test_gateway_falls_back_and_opens_circuit(gateway):
+    gateway.max_retries = 0
+    gateway._breaker("big-model").failure_threshold = 1
+    StubMistralHandler.script = {"big-model": [500]}
+
+    first = gateway.complete("chat", [{"role": "user", "content": "hi"}])
+    second = gateway.complete("chat", [{"role": "user", "content": "hi"}])
+
+    assert first.choices[0].message.content == "hello from small-model"
+    assert second.choices[0].message.content == "hello from small-model"
+    # The open circuit skips big-model entirely on the second call
+    assert StubMistralHandler.calls == ["big-model", "small-model", "small-model"]
+    assert gateway.metrics()["models"]["big-model"]["circuit"] == "open"
+
+
+def test_gateway_does_not_retry_bad_requests(gateway):
+    StubMistralHandler.script = {"small-model": [400]}
+
+    with pytest.raises(Exception) as error:
+        gateway.complete("extract_skills", [{"role": "user", "content": "hi"}])
+
+    assert not isinstance(error.value, LLMUnavailableError)
+    assert StubMistralHandler.calls == ["small-model"]
+
+
+def test_gateway_hedges_slow_requests(gateway):
+    gateway.hedge_after = 0.1
+    StubMistralHandler.script = {"big-model": ["slow"]}
+
+    start = time.perf_counter()
+    gateway.complete("chat", [{"role": "user", "content": "hi"}])
+
+    assert time.perf_counter() - start < 0.9
+    assert gateway.metrics()["models"]["big-model"]["hedges"] == 1
+
+
+def test_local_saturation_does_not_open_circuit(gateway):
+    gateway._breaker("big-model").failure_threshold = 1
+    gateway.timeout = 0.05
+    gateway._slots = threading.BoundedSemaphore(1)
+    gateway._slots.acquire()  # Every slot busy with other callers
+
+    with pytest.raises(LLMSaturatedError):
+        gateway.complete("chat", [{"role": "user", "content": "hi"}])
+
+    assert gateway.metrics()["models"].get("big-model", {}).get("circuit", "closed") == "closed"
+    assert StubMistralHandler.calls == []
+
+    gateway._slots.release()
+    response = gateway.complete("chat", [{"role": "user", "content": "hi"}])
+    assert response.choices[0].message.content == "hello from big-model"
@@ -1,3 +1,7 @@
+import numpy as np
+from app.db.models import User, ResumeProfile, MatchFeedItem
+from app.services.match_feed import MatchFeed
+
 def test_match_jobs(client):
     # Matches backend/app/api/v1/matcher.py
     payload = {
@@ -9,4 +13,135 @@ def test_match_jobs(client):
     assert response.status_code == 200
     data = response.json()
     assert "top_matches" in data
-    assert isinstance(data["top_matches"], list)
\ No newline at end of file
+    assert isinstance(data["top_matches"], list)
+
+def test_match_jobs_stored_resume_requires_login(client):
+    response = client.post("/api/v1/matcher/match", json={"resume_id": 1})
+
+    assert response.status_code == 401
+
+
+def test_match_feed_requires_login(client):
+    response = client.get("/api/v1/matcher/feed")
+
+    assert response.status_code == 401
+
+
+def _feed(top_k=3, min_score=0.0):
+    feed = MatchFeed()
+    feed.top_k, feed.min_score = top_k, min_score
+    return feed
+
+
+def _resume(db, email, *embeddings):
+    user = User(email=email)
+    db.add(user)
+    db.flush()
+    profiles = [ResumeProfile(user_id=user.id, filename="cv.txt", embedding=list(e)) for e in embeddings]
+    db.add_all(profiles)
+    db.commit()
+    return user, profiles
+
+
+def _job(job_id, *embedding):
+    return {"id": job_id, "title": job_id, "company": "Acme", "embedding": list(embedding)}
+
+
+def _feed_scores(db, user_id):
+    items = (
+        db.query(MatchFeedItem)
+        .filter(MatchFeedItem.user_id == user_id)
+        .order_by(MatchFeedItem.score.desc(), MatchFeedItem.id)
+        .all()
+    )
+    return [(item.job_id, round(item.score, 4)) for item in items]
+
+
+def test_best_per_user_keeps_each_users_best_resume():
+    scores = np.array([
+        [0.1, 0.9, 0.5],   # user 1, resume row 0
+        [0.7, 0.2, 0.5],   # user 1, resume row 1
+        [0.3, 0.3, 0.8],   # user 2, resume row 2
+    ], dtype=np.float32)
+
+    users, best, best_row = _feed()._best_per_user(scores, np.array([1, 1, 2]))
+
+    assert users.tolist() == [1, 2]
+    np.testing.assert_allclose(best, [[0.7, 0.9, 0.5], [0.3, 0.3, 0.8]])
+    # Ties pick the first resume of the user
+    assert best_row.tolist() == [[1, 0, 0], [2, 2, 2]]
+
+
+def test_score_jobs_orders_and_truncates_to_top_k(db):
+    user, (profile,) = _resume(db, "feed@example.com", [1.0, 0.0])
+    feed = _feed(top_k=2)
+
+    added = feed.score_jobs(db, [_job("far", 0.0, 1.0), _job("close", 1.0, 0.1), _job("mid", 1.0, 1.0)])
+
+    assert added == 2
+    assert _feed_scores(db, user.id) == [("close", 0.995), ("mid", 0.7071)]
+    assert {item.resume_id for item in db.query(MatchFeedItem)} == {profile.id}
+
+
+def test_score_jobs_merges_later_batches_into_bounded_top_k(db):
+    user, _ = _resume(db, "merge@example.com", [1.0, 0.0])
+    feed = _feed(top_k=2)
+    feed.score_jobs(db, [_job("a", 1.0, 1.0), _job("b", 1.0, 2.0)])
+
+    # A better job displaces the weakest, a worse one is ignored, a repeat is not duplicated
+    assert feed.score_jobs(db, [_job("c", 1.0, 0.0), _job("d", 0.0, 1.0), _job("a", 1.0, 1.0)]) == 1
+    assert _feed_scores(db, user.id) == [("c", 1.0), ("a", 0.7071)]
+
+
+def test_score_jobs_ties_keep_the_earlier_match(db):
+    user, _ = _resume(db, "ties@example.com", [1.0, 0.0])
+    feed = _feed(top_k=2)
+    feed.score_jobs(db, [_job("first", 1.0, 1.0), _job("second", 1.0, 1.0), _job("third", 1.0, 1.0)])
+    feed.score_jobs(db, [_job("late", 1.0, 1.0)])
+
+    assert [job_id for job_id, _ in _feed_scores(db, user.id)] == ["first", "second"]
+
+
+def test_score_jobs_respects_min_score_and_users(db):
+    python_dev, _ = _resume(db, "py@example.com", [1.0, 0.0])
+    designer, _ = _resume(db, "ux@example.com", [0.0, 1.0])
+    feed = _feed(top_k=5, min_score=0.5)
+
+    feed.score_jobs(db, [_job("backend", 1.0, 0.0), _job("design", 0.0, 1.0)])
+
+    assert _feed_scores(db, python_dev.id) == [("backend", 1.0)]
+    assert _feed_scores(db, designer.id) == [("design", 1.0)]
+
+
+def test_get_feed_pages_with_cursor(db):
+    user, _ = _resume(db, "pages@example.com", [1.0, 0.0])
+    feed = _feed(top_k=10)
+    feed.score_jobs(db, [_job(f"job-{i}", 1.0, i / 10) for i in range(5)])
+
+    pages, cursor = [], None
+    while True:
+        items, cursor = feed.get_feed(db, user.id, cursor, limit=2)
+        pages.append([item.job_id for item in items])
+        if cursor is None:
+            break
+
+    # Newest first, every item exactly once
+    newest_first = [item.job_id for item in db.query(MatchFeedItem).order_by(MatchFeedItem.id.desc())]
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert sum(pages, []) == newest_first
+
+
+def test_add_resume_matches_backfills_from_existing_jobs(db):
+    user, (profile,) = _resume(db, "backfill@example.com", [1.0, 0.0])
+    feed = _feed(top_k=2, min_score=0.3)
+    matches = [
+        {"id": "weak", "title": "Weak", "company": "Acme", "score": 0.1},
+        {"id": "good", "title": "Good", "company": "Acme", "score": 0.8},
+        {"id": "best", "title": "Best", "company": "Acme", "score": 0.9},
+        {"id": "okay", "title": "Okay", "company": "Acme", "score": 0.5},
+    ]
+
+    assert feed.add_resume_matches(db, user.id, profile.id, matches) == 2
+    assert _feed_scores(db, user.id) == [("best", 0.9), ("good", 0.8)]
+    # Re-running the backfill adds nothing
+    assert feed.add_resume_matches(db, user.id, profile.id, matches) == 0
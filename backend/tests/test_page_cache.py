@@ -0,0 +1,170 @@
+import json
+import os
+import threading
+import time
+import zlib
+import pytest
+from app.agents import mcp_client
+from app.agents.mcp_client import MCPClient
+from app.services.page_cache import PageCache, normalize_url
+
+
+class CountingFetch:
+    """
+    Fetch function that returns a new value per call and counts calls.
+    Set `gate` to make calls block until it is set.
+    """
+    def __init__(self, prefix="page"):
+        self.prefix = prefix
+        self.calls = 0
+        self.gate = None
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        if self.gate is not None:
+            self.gate.wait(5)
+        with self._lock:
+            self.calls += 1
+            return f"{self.prefix} {self.calls}"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    page_cache = PageCache(directory=str(tmp_path), max_bytes=10 * 1024 * 1024, stale_for=60)
+    yield page_cache
+    page_cache._refresher.shutdown(wait=True)
+
+
+def _wait_for_refresh(cache):
+    cache._refresher.shutdown(wait=True)
+
+
+def test_normalize_url_strips_only_noise():
+    assert normalize_url(
+        "HTTPS://Jobs.Example.com:443/postings/42/?utm_source=mail&b=2&gclid=x&a=1#apply"
+    ) == "https://jobs.example.com/postings/42?a=1&b=2"
+    assert normalize_url("http://example.com:8080") == "http://example.com:8080/"
+    # ref/refid identify the posting on some boards and must survive
+    assert normalize_url("https://board.example/view?refid=abc&ref=9&fbclid=y") == "https://board.example/view?ref=9&refid=abc"
+
+
+def test_hit_is_served_from_disk_compressed(cache, tmp_path):
+    fetch = CountingFetch()
+
+    assert cache.get_or_fetch("open_url", "https://a.example/", fetch, ttl=60) == "page 1"
+    assert cache.get_or_fetch("open_url", "https://a.example/", fetch, ttl=60) == "page 1"
+    assert fetch.calls == 1
+    assert cache.metrics()["hits"] == 1 and cache.metrics()["misses"] == 1
+
+    # Stored as zlib-compressed JSON, and readable by a fresh instance
+    key = cache.make_key("open_url", "https://a.example/")
+    with open(cache._path(key), "rb") as f:
+        assert json.loads(zlib.decompress(f.read()))["value"] == "page 1"
+    reopened = PageCache(directory=str(tmp_path), max_bytes=cache.max_bytes, stale_for=60)
+    assert reopened.get_or_fetch("open_url", "https://a.example/", fetch, ttl=60) == "page 1"
+    assert fetch.calls == 1
+    reopened._refresher.shutdown(wait=True)
+
+
+def test_stale_entry_is_served_while_refreshing(cache):
+    fetch = CountingFetch()
+    cache.get_or_fetch("search", "python", fetch, ttl=60)
+
+    # Past its TTL but inside the stale window: old value now, new one fetched behind it
+    assert cache.get_or_fetch("search", "python", fetch, ttl=0) == "page 1"
+    _wait_for_refresh(cache)
+    assert fetch.calls == 2
+    assert cache.metrics()["stale_hits"] == 1 and cache.metrics()["refreshes"] == 1
+    assert cache.get_or_fetch("search", "python", fetch, ttl=60) == "page 2"
+
+
+def test_entry_past_stale_window_is_fetched_again(tmp_path):
+    cache = PageCache(directory=str(tmp_path), max_bytes=1024 * 1024, stale_for=0)
+    fetch = CountingFetch()
+    cache.get_or_fetch("search", "python", fetch, ttl=60)
+
+    assert cache.get_or_fetch("search", "python", fetch, ttl=0) == "page 2"
+    assert fetch.calls == 2
+    cache._refresher.shutdown(wait=True)
+
+
+def test_concurrent_misses_fetch_once(cache):
+    fetch = CountingFetch()
+    fetch.gate = threading.Event()
+    results = []
+
+    def caller():
+        results.append(cache.get_or_fetch("open_url", "https://slow.example/", fetch, ttl=60))
+
+    threads = [threading.Thread(target=caller) for _ in range(5)]
+    for t in threads:
+        t.start()
+    time.sleep(0.1)
+    fetch.gate.set()
+    for t in threads:
+        t.join()
+
+    assert fetch.calls == 1
+    assert results == ["page 1"] * 5
+
+
+def test_failed_fetch_is_not_cached(cache):
+    calls = []
+
+    def failing():
+        calls.append(1)
+        raise RuntimeError("browser crashed")
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            cache.get_or_fetch("open_url", "https://down.example/", failing, ttl=60)
+    assert len(calls) == 2
+    assert cache.metrics()["entries"] == 0
+
+
+def test_least_recently_used_entries_are_evicted_past_the_byte_cap(tmp_path):
+    cache = PageCache(directory=str(tmp_path), max_bytes=1024 * 1024, stale_for=0)
+    # Random bytes barely compress, so every entry is about the same size on disk
+    pages = {name: os.urandom(600).hex() for name in ("a", "b", "c", "d")}
+    cache.get_or_fetch("open_url", "a", lambda: pages["a"], ttl=60)
+    entry_size = cache.metrics()["bytes"]
+    cache.max_bytes = int(entry_size * 3.5)
+    for name in ("b", "c"):
+        cache.get_or_fetch("open_url", name, lambda name=name: pages[name], ttl=60)
+    # Reading "a" makes "b" the least recently used
+    cache.get_or_fetch("open_url", "a", CountingFetch(), ttl=60)
+
+    cache.get_or_fetch("open_url", "d", lambda: pages["d"], ttl=60)
+
+    metrics = cache.metrics()
+    assert metrics["evictions"] == 1
+    assert metrics["entries"] == 3 and metrics["bytes"] <= cache.max_bytes * 0.9
+    assert not os.path.exists(cache._path(cache.make_key("open_url", "b")))
+    refetch = CountingFetch()
+    assert cache.get_or_fetch("open_url", "a", refetch, ttl=60) == pages["a"]
+    assert cache.get_or_fetch("open_url", "b", refetch, ttl=60) == "page 1"
+    cache._refresher.shutdown(wait=True)
+
+
+def test_cached_call_passes_errors_through_without_caching(cache, monkeypatch):
+    monkeypatch.setattr(mcp_client, "get_page_cache", lambda: cache)
+    client = MCPClient()
+    responses = [
+        {"content": [{"type": "text", "text": "blocked by captcha"}], "isError": True},
+        {"content": [{"type": "text", "text": "<html>Backend Engineer</html>"}]},
+    ]
+    calls = []
+
+    def call_server(url, tool_name, arguments):
+        calls.append(arguments["url"])
+        return responses[len(calls) - 1]
+
+    monkeypatch.setattr(client, "_call_server", call_server)
+
+    first = client._cached_call("open_url", {"url": "https://jobs.example/42?utm_source=x"})
+    assert first["isError"] is True
+    second = client._cached_call("open_url", {"url": "https://jobs.example/42"})
+    third = client._cached_call("open_url", {"url": "https://JOBS.example/42/#top"})
+
+    assert second == third == {"content": [{"type": "text", "text": "<html>Backend Engineer</html>"}]}
+    assert len(calls) == 2
@@ -0,0 +1,69 @@
+from app.services.prompt_builder import PromptBuilder, count_tokens
+
+# all-MiniLM-L6-v2 has 512 position embeddings
+MODEL_MAX_POSITIONS = 512
+
+
+class Embedder:
+    """
+    Bag-of-words stand-in that fails like the real model on over-long
+    input and counts how often it is called.
+    """
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, texts: list):
+        self.calls += 1
+        vectors = []
+        for text in texts:
+            words = text.lower().split()
+            if len(words) > MODEL_MAX_POSITIONS:
+                raise IndexError("index out of range in self")
+            vectors.append([words.count(word) for word in ("python", "spark", "kitchen")])
+        return vectors
+
+
+RESUME = "\n".join([
+    "JANE DOE",
+    "jane@example.com",
+    "",
+    "EXPERIENCE",
+    "Python backend engineer building FastAPI services. " * 20,
+    "",
+    "PROJECTS",
+    "Ran a restaurant kitchen and catering business. " * 20,
+    "",
+    "SKILLS",
+    "Python, Spark, SQL, Airflow",
+])
+
+
+def test_select_sections_with_job_description_over_model_limit():
+    job_description = "We are hiring a Python and Spark data engineer. " * 200
+    assert len(job_description.split()) > MODEL_MAX_POSITIONS
+
+    embed = Embedder()
+    selected = PromptBuilder(embed).select_sections(RESUME, job_description, max_tokens=300)
+
+    assert count_tokens(selected) <= 300
+    assert selected.startswith("JANE DOE")
+    assert "Python backend engineer" in selected
+    assert "restaurant kitchen" not in selected
+    # Query and sections are embedded in a single batch
+    assert embed.calls == 1
+
+
+def test_build_cover_letter_prompt_with_long_job_description():
+    job_description = "Python developer wanted. " * 2000
+    template = "RESUME: {resume_text}\nJOB DESCRIPTION: {job_description}"
+
+    prompt = PromptBuilder(Embedder()).build(
+        template,
+        "open-mistral-7b",
+        query=job_description,
+        fixed={"job_description": job_description},
+        ranked={"resume_text": RESUME},
+    )
+
+    assert count_tokens(prompt) <= 3000
+    assert "JANE DOE" in prompt
@@ -1,3 +1,9 @@
+import pytest
+from fastapi import HTTPException
+from app.core.utils import get_resume_profile
+from app.db.models import User
+from app.services.resume_store import ResumeStore
+
 def test_upload_resume(client):
     # Mock a text file
     files = {
@@ -9,4 +15,93 @@ def test_upload_resume(client):
     json_data = response.json()
     assert "message" in json_data
     assert json_data["message"] == "Resume processed"
-    assert "data" in json_data
\ No newline at end of file
+    assert "data" in json_data
+
+def test_upload_resume_batch(client):
+    files = [
+        ('files', ('first.txt', 'Python Developer with FastAPI experience', 'text/plain')),
+        ('files', ('second.txt', 'Data Engineer with Spark and SQL', 'text/plain')),
+    ]
+    response = client.post("/api/v1/resume/upload-batch", files=files)
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert len(results) == 2
+    assert all(r["format"] == "text" for r in results)
+
+
+def test_upload_resume_batch_charges_only_extracted_files(client, monkeypatch):
+    from app.api.v1 import resume
+    from app.core.admission import AdmissionController
+
+    controller = AdmissionController()
+    controller.enabled = True
+    monkeypatch.setattr(resume, "admission", controller)
+    monkeypatch.setattr(resume.resume_agent, "process_resume", lambda text: {"skills": ["python"]})
+    bucket = controller._user_bucket("client:batch", "llm")
+    client.app.dependency_overrides[resume.get_client_key] = lambda: "client:batch"
+
+    files = [
+        ('files', ('first.txt', 'Python Developer with FastAPI experience', 'text/plain')),
+        ('files', ('empty.txt', '   ', 'text/plain')),
+        ('files', ('second.txt', 'Data Engineer with Spark and SQL', 'text/plain')),
+    ]
+    try:
+        response = client.post("/api/v1/resume/upload-batch", files=files)
+    finally:
+        client.app.dependency_overrides.pop(resume.get_client_key, None)
+
+    assert response.status_code == 200
+    assert [("data" in r, "error" in r) for r in response.json()["results"]] == [(True, False), (False, True), (True, False)]
+    # The file that failed extraction never reached the LLM and costs nothing
+    assert bucket.burst - bucket.tokens == pytest.approx(2, abs=0.5)
+
+
+class TenantVectors:
+    """
+    In-memory stand-in for the Weaviate Resume collection, keyed by tenant.
+    """
+    def __init__(self):
+        self.tenants = {}
+
+    def add_resume(self, user_id, resume_id, embedding):
+        vector_id = f"resume-{resume_id}"
+        self.tenants.setdefault(f"user-{user_id}", {})[vector_id] = embedding
+        return vector_id
+
+    def get_resume_vector(self, user_id, vector_id):
+        return self.tenants.get(f"user-{user_id}", {}).get(vector_id)
+
+    def delete_resume(self, user_id, vector_id):
+        self.tenants.get(f"user-{user_id}", {}).pop(vector_id, None)
+
+
+def test_stored_resume_is_scoped_to_its_owner(db):
+    owner, other = User(email="owner@example.com"), User(email="other@example.com")
+    db.add_all([owner, other])
+    db.commit()
+
+    vectors = TenantVectors()
+    store = ResumeStore(vectors)
+    profile = store.save(db, owner.id, "cv.txt", "Python developer", {"skills": ["python"]}, [0.1, 0.2])
+
+    # The vector is written to the owner's tenant only
+    assert vectors.tenants == {f"user-{owner.id}": {profile.vector_id: [0.1, 0.2]}}
+
+    loaded = get_resume_profile(profile.id, owner, db)
+    assert loaded.id == profile.id
+    assert loaded.skills == ["python"]
+    assert store.get_embedding(loaded) == [0.1, 0.2]
+
+    with pytest.raises(HTTPException) as not_found:
+        get_resume_profile(profile.id, other, db)
+    assert not_found.value.status_code == 404
+
+    with pytest.raises(HTTPException) as anonymous:
+        get_resume_profile(profile.id, None, db)
+    assert anonymous.value.status_code == 401
+
+    store.delete(db, loaded)
+    assert vectors.tenants[f"user-{owner.id}"] == {}
+    with pytest.raises(HTTPException):
+        get_resume_profile(profile.id, owner, db)
@@ -123,7 +123,8 @@ server.setRequestHandler(CallToolRequestSchema, async (request) => {
         const details = await gmail.users.messages.get({ userId: "me", id: msg.id });
         const subject = details.data.payload.headers.find(h => h.name === "Subject")?.value || "(No Subject)";
         const from = details.data.payload.headers.find(h => h.name === "From")?.value || "Unknown";
-        summaries.push(`- [ID: ${msg.id}] FROM: ${from} | SUBJECT: ${subject}`);
+        const date = new Date(Number(details.data.internalDate)).toISOString();
+        summaries.push(`- [ID: ${msg.id}] FROM: ${from} | SUBJECT: ${subject} | DATE: ${date}`);
       }
       return { content: [{ type: "text", text: `Found emails:\n${summaries.join("\n")}` }] };
     }
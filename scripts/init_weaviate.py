@@ -0,0 +1,61 @@
+"""
+Creates the Weaviate schema (Job and Resume collections) and applies
+vector index settings. Safe to run repeatedly: missing collections and
+properties are created, mutable settings are updated in place, and the
+Job collection is only re-indexed when a setting requires it.
+
+    python scripts/init_weaviate.py
+    python scripts/init_weaviate.py --quantizer pq --ef 128
+    python scripts/init_weaviate.py --ef-construction 256 --rebuild
+
+Settings default to the WEAVIATE_* environment variables.
+"""
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Create and tune the Weaviate schema.")
+    parser.add_argument("--index-type", choices=["hnsw", "flat"])
+    parser.add_argument("--ef", type=int, help="Query-time candidate list size (-1 = dynamic)")
+    parser.add_argument("--ef-construction", type=int)
+    parser.add_argument("--max-connections", type=int)
+    parser.add_argument("--quantizer", choices=["none", "pq", "bq", "sq"])
+    parser.add_argument("--rescore-limit", type=int)
+    parser.add_argument("--pq-segments", type=int)
+    parser.add_argument("--rebuild", action="store_true", help="Re-index the Job collection even if not required")
+    parser.add_argument("--batch-size", type=int, default=200, help="Objects per batch when re-indexing")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    from app.services.weaviate_client import WeaviateClient
+
+    args = parse_args(argv)
+    overrides = {
+        key: value for key, value in {
+            "index_type": args.index_type,
+            "ef": args.ef,
+            "ef_construction": args.ef_construction,
+            "max_connections": args.max_connections,
+            "quantizer": args.quantizer,
+            "rescore_limit": args.rescore_limit,
+            "pq_segments": args.pq_segments,
+        }.items() if value is not None
+    }
+
+    # Connecting runs ensure_schema, which creates anything missing
+    client = WeaviateClient(index_options=overrides)
+    try:
+        result = client.migrate_index(overrides, batch_size=args.batch_size, force_rebuild=args.rebuild)
+        print(f"✅ '{client.class_name}' {result['action']} ({result['objects']} objects) with {client.index_options}")
+        print(f"✅ '{client.resume_class_name}' ready (multi-tenant, flat index)")
+    finally:
+        client.client.close()
+
+
+if __name__ == "__main__":
+    main()
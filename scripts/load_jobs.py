@@ -0,0 +1,293 @@
+"""
+Offline bulk loader for job postings.
+
+Streams a JSONL or CSV dump, embeds postings in batches across worker
+processes and batch-inserts them into Weaviate. Progress is checkpointed
+after every batch, so an interrupted run resumes where it stopped.
+
+    python scripts/load_jobs.py jobs.jsonl --workers 8 --batch-size 256
+
+Records need a title and description; company, id (or url) and posted_at
+are used when present. Near-duplicate postings are collapsed with the
+same MinHash index the API uses.
+"""
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+import numpy as np
+from weaviate.util import generate_uuid5
+
+# Accepted column / key names for each field, first match wins
+FIELD_ALIASES = {
+    "id": ("id", "job_id", "url", "link"),
+    "title": ("title", "job_title", "position"),
+    "company": ("company", "company_name", "employer"),
+    "description": ("description", "job_description", "text", "body"),
+    "posted_at": ("posted_at", "date_posted", "created_at", "date"),
+}
+
+csv.field_size_limit(2 ** 31 - 1)
+
+
+# --- Input ---
+def detect_format(path: str):
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def read_records(path: str, fmt: str):
+    """
+    Yields raw records one at a time. Unreadable JSONL lines yield None so
+    record positions (and checkpoints) stay stable.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            yield from csv.DictReader(f)
+            return
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                yield None
+
+
+def read_batches(records, batch_size: int, skip: int, limit: int = None):
+    batch, taken = [], 0
+    for position, record in enumerate(records):
+        if position < skip:
+            continue
+        if limit is not None and taken >= limit:
+            break
+        batch.append(record)
+        taken += 1
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _field(record: dict, name: str):
+    for key in FIELD_ALIASES[name]:
+        value = record.get(key)
+        if value not in (None, ""):
+            return str(value).strip()
+    return ""
+
+
+def _parse_date(value: str):
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def normalize_record(record):
+    if not isinstance(record, dict):
+        return None
+    title, description = _field(record, "title"), _field(record, "description")
+    if not title or not description:
+        return None
+    company = _field(record, "company") or "Unknown"
+    source_id = _field(record, "id")
+    return {
+        "title": title,
+        "company": company,
+        "description": description,
+        # Stable ids make re-running a batch overwrite instead of duplicate
+        "uuid": str(generate_uuid5(source_id or f"{title}|{company}|{description}")),
+        "ingested_at": _parse_date(_field(record, "posted_at")),
+    }
+
+
+# --- Worker processes ---
+_model = None
+
+def _init_worker(threads: int):
+    global _model
+    try:
+        import torch
+        # Each worker gets its share of the cores instead of all of them
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+    from app.services.huggingface_client import load_embedding_model
+    _model = load_embedding_model()
+
+
+def _prepare_batch(records: list):
+    """
+    Normalizes, embeds and fingerprints one batch.
+    Returns (records read, valid jobs).
+    """
+    from app.services.huggingface_client import embed_batch
+    from app.services.dedup import JobDeduplicator, minhash
+
+    jobs = [job for job in map(normalize_record, records) if job]
+    if jobs:
+        embeddings = embed_batch(_model, [job["description"] for job in jobs])
+        for job, embedding in zip(jobs, embeddings):
+            job["embedding"] = embedding
+            job["signature"] = minhash(JobDeduplicator.fingerprint_text(job["title"], job["company"], job["description"]))
+    return len(records), jobs
+
+
+# --- Progress ---
+class Checkpoint:
+    def __init__(self, path: str, input_path: str, restart: bool = False):
+        self.path = path
+        self.state = {
+            "input": os.path.abspath(input_path), "records": 0, "inserted": 0,
+            "duplicates": 0, "invalid": 0, "failed": 0,
+        }
+        if os.path.exists(path) and not restart:
+            with open(path) as f:
+                saved = json.load(f)
+            if saved.get("input") != self.state["input"]:
+                raise SystemExit(f"Checkpoint {path} belongs to {saved.get('input')}; use --restart or --checkpoint")
+            self.state.update(saved)
+
+    def save(self):
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.state, f)
+        os.replace(tmp, self.path)
+
+
+class Loader:
+    def __init__(self, args):
+        from app.services.weaviate_client import WeaviateClient
+        from app.services.dedup import get_job_deduplicator
+        from app.services.match_feed import MatchFeed
+        from app.services.job_lifecycle import JobLifecycle
+
+        self.args = args
+        self.weaviate_client = WeaviateClient()
+        self.deduplicator = get_job_deduplicator()
+        self.match_feed = MatchFeed() if args.update_feeds else None
+        self.lifecycle = JobLifecycle(self.weaviate_client, self.match_feed)
+        self.checkpoint = Checkpoint(args.checkpoint, args.input, args.restart)
+
+    def _split_duplicates(self, jobs: list):
+        """
+        Separates postings that duplicate stored jobs or earlier jobs in the
+        batch. Returns (fresh jobs, canonical id of each duplicate).
+        A job matching its own id was stored by an interrupted run.
+        """
+        fresh, signatures, canonical_ids = [], [], []
+        for job in jobs:
+            if not self.args.no_dedup:
+                canonical = self.deduplicator.match(job["signature"])
+                if canonical == job["uuid"]:
+                    continue
+                if canonical is None and signatures:
+                    scores = np.mean(np.stack(signatures) == job["signature"], axis=1)
+                    best = int(np.argmax(scores))
+                    canonical = fresh[best]["uuid"] if scores[best] >= self.deduplicator.threshold else None
+                if canonical is not None:
+                    canonical_ids.append(canonical)
+                    continue
+            fresh.append(job)
+            signatures.append(job["signature"])
+        return fresh, canonical_ids
+
+    def store(self, jobs: list):
+        fresh, canonical_ids = self._split_duplicates(jobs)
+        inserted, failed = self.weaviate_client.add_jobs(fresh, self.args.batch_size) if fresh else ([], 0)
+
+        stored = set(inserted)
+        kept = [job for job in fresh if job["uuid"] in stored]
+        if kept:
+            self.deduplicator.register_many(
+                [job["uuid"] for job in kept], np.stack([job["signature"] for job in kept])
+            )
+        # Same handling as the API: count the copies, keep the canonical postings alive.
+        # Copies of batch jobs that failed to insert have nothing to count against
+        batch_ids = {job["uuid"] for job in fresh}
+        self.lifecycle.record_duplicates([
+            canonical for canonical in canonical_ids if canonical not in batch_ids or canonical in stored
+        ])
+        if self.match_feed and kept:
+            self.match_feed.ingest_jobs([
+                {"id": job["uuid"], "title": job["title"], "company": job["company"], "embedding": job["embedding"]}
+                for job in kept
+            ])
+        return len(kept), len(canonical_ids), failed
+
+    def run(self):
+        args, state = self.args, self.checkpoint.state
+        if state["records"]:
+            print(f"⏩ Resuming after {state['records']} records ({state['inserted']} already inserted).")
+
+        records = read_records(args.input, args.format or detect_format(args.input))
+        batches = read_batches(records, args.batch_size, state["records"], args.limit)
+        threads = max(1, (os.cpu_count() or 1) // args.workers)
+        start, processed = time.perf_counter(), 0
+
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker, initargs=(threads,)) as pool:
+            # A bounded window of batches in flight, consumed in order so the checkpoint only moves forward
+            pending = deque()
+
+            def submit_next():
+                batch = next(batches, None)
+                if batch is not None:
+                    pending.append(pool.submit(_prepare_batch, batch))
+
+            for _ in range(args.workers * 2):
+                submit_next()
+
+            while pending:
+                read, jobs = pending.popleft().result()
+                submit_next()
+                inserted, duplicates, failed = self.store(jobs)
+
+                state["records"] += read
+                state["inserted"] += inserted
+                state["duplicates"] += duplicates
+                state["invalid"] += read - len(jobs)
+                state["failed"] += failed
+                self.checkpoint.save()
+
+                processed += read
+                elapsed = time.perf_counter() - start
+                print(
+                    f"📦 {state['records']} records | {state['inserted']} inserted, {state['duplicates']} duplicates, "
+                    f"{state['invalid']} invalid, {state['failed']} failed | {processed / elapsed:.0f} records/s"
+                )
+
+        elapsed = time.perf_counter() - start
+        print(f"✅ Loaded {processed} records in {elapsed:.1f}s ({processed / max(elapsed, 1e-9):.0f} records/s).")
+        return state
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk-load job postings into Weaviate.")
+    parser.add_argument("input", help="JSONL or CSV file of job postings")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="Defaults to the file extension")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2), help="Embedding processes")
+    parser.add_argument("--batch-size", type=int, default=256, help="Postings per embedding and insert batch")
+    parser.add_argument("--checkpoint", help="Progress file (default: <input>.checkpoint.json)")
+    parser.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint")
+    parser.add_argument("--limit", type=int, help="Stop after this many records")
+    parser.add_argument("--no-dedup", action="store_true", help="Store near-duplicates instead of skipping them")
+    parser.add_argument("--update-feeds", action="store_true", help="Also push new jobs into users' match feeds")
+    args = parser.parse_args(argv)
+    args.checkpoint = args.checkpoint or f"{args.input}.checkpoint.json"
+    return args
+
+
+if __name__ == "__main__":
+    Loader(parse_args()).run()
@@ -0,0 +1,66 @@
+"""
+Brings the Postgres schema up to date with app/db/models.py.
+
+Base.metadata.create_all (run by the API on startup) only creates missing
+tables. This also adds columns and indexes that newer models define but
+existing tables lack. Safe to run repeatedly.
+
+    python scripts/migrate_db.py            # apply
+    python scripts/migrate_db.py --dry-run  # print the statements only
+"""
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from sqlalchemy import inspect, text
+
+
+def pending_statements(engine, metadata):
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    statements = []
+    for table in metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue  # create_all handles whole tables
+
+        columns = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in columns:
+                column_type = column.type.compile(dialect=engine.dialect)
+                # Added as nullable; the models treat missing values as defaults
+                statements.append(f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_type}')
+
+        indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in indexes:
+                index_columns = ", ".join(f'"{column.name}"' for column in index.columns)
+                unique = "UNIQUE " if index.unique else ""
+                statements.append(f'CREATE {unique}INDEX "{index.name}" ON "{table.name}" ({index_columns})')
+    return statements
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Create missing tables, columns and indexes.")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args(argv)
+
+    from app.db.session import engine, Base
+    import app.db.models  # noqa: F401  (registers the tables on Base)
+
+    statements = pending_statements(engine, Base.metadata)
+    if args.dry_run:
+        print("\n".join(statements) or "Schema is up to date.")
+        return
+
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        for statement in statements:
+            print(f"🛠️ {statement}")
+            connection.execute(text(statement))
+    print(f"✅ Database schema up to date ({len(statements)} changes applied).")
+
+
+if __name__ == "__main__":
+    main()